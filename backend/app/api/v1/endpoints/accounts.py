@@ -1,10 +1,14 @@
 """Account endpoints."""
-from fastapi import APIRouter, Depends, HTTPException, status
+from functools import partial
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.schemas import (
     AccountCreate,
+    AccountDashboardOut,
     AccountOut,
     AccountUpdate,
     AccountLogin,
@@ -12,7 +16,9 @@ from app.schemas import (
     ActiveVolunteersResponse,
     Token,
 )
+from app.schemas.limits import DASHBOARD_COMPLETED_LIMIT_DEFAULT, DASHBOARD_COMPLETED_LIMIT_MAX
 from app.services.account_service import AccountService
+from app.core.cache import ACTIVE_VOLUNTEERS_KEY, public_cache
 from app.core.security import create_access_token, get_current_account
 from app.core.logger import log_volunteer_login
 from app.db.models import Account
@@ -87,6 +93,57 @@ def get_my_account(
     return current_account
 
 
+@router.get(
+    "/me/dashboard",
+    response_model=AccountDashboardOut,
+    summary="Volunteer dashboard",
+    description="Account, active report, recent completed reports and counters in one response",
+)
+def get_my_dashboard(
+    completed_limit: int = Query(
+        DASHBOARD_COMPLETED_LIMIT_DEFAULT,
+        ge=1,
+        le=DASHBOARD_COMPLETED_LIMIT_MAX,
+        description="Recent completed reports to include",
+    ),
+    current_account: Account = Depends(get_current_account),
+    db: Session = Depends(get_db),
+):
+    """Return the volunteer panel payload.
+
+    Replaces the /accounts/me, /reports/my-accepted-report, /reports/{id} and
+    /reports/my-completed-reports sequence with a single request.
+    """
+    return AccountService.get_dashboard(db, current_account, completed_limit=completed_limit)
+
+
+
+def _load_active_volunteers(bind: Engine | Connection) -> ActiveVolunteersResponse:
+    """Build the public active-volunteers payload in a dedicated session."""
+
+    with Session(bind=bind) as db:
+        volunteer_snapshots, manual_count, schedule_count = AccountService.get_active_volunteers(db)
+        public_payload: list[ActiveVolunteerOut] = []
+        for snapshot in volunteer_snapshots:
+            account = snapshot.account
+            public_payload.append(
+                ActiveVolunteerOut(
+                    email=account.email,
+                    full_name=account.full_name,
+                    phone=account.phone,
+                    city=account.city,
+                    availability=snapshot.availability,
+                    is_active=snapshot.manual_active,
+                    schedule_active_now=snapshot.schedule_active,
+                    is_active_now=snapshot.manual_active or snapshot.schedule_active,
+                )
+            )
+    return ActiveVolunteersResponse(
+        total_manual_active=manual_count,
+        total_scheduled_active=schedule_count,
+        volunteers=public_payload,
+    )
+
 
 @router.get(
     "/volunteers/active",
@@ -95,28 +152,14 @@ def get_my_account(
     description="List volunteers that are currently active manually or via their schedule"
 )
 def list_active_volunteers(db: Session = Depends(get_db)):
-    """Return non-sensitive data for currently active volunteers."""
-
-    volunteer_snapshots, manual_count, schedule_count = AccountService.get_active_volunteers(db)
-    public_payload: list[ActiveVolunteerOut] = []
-    for snapshot in volunteer_snapshots:
-        account = snapshot.account
-        public_payload.append(
-            ActiveVolunteerOut(
-                email=account.email,
-                full_name=account.full_name,
-                phone=account.phone,
-                city=account.city,
-                availability=snapshot.availability,
-                is_active=snapshot.manual_active,
-                schedule_active_now=snapshot.schedule_active,
-                is_active_now=snapshot.manual_active or snapshot.schedule_active,
-            )
-        )
-    return ActiveVolunteersResponse(
-        total_manual_active=manual_count,
-        total_scheduled_active=schedule_count,
-        volunteers=public_payload,
+    """Return non-sensitive data for currently active volunteers.
+
+    Served from the stale-while-revalidate public cache.
+    """
+
+    return public_cache.get_or_load(
+        ACTIVE_VOLUNTEERS_KEY,
+        partial(_load_active_volunteers, db.get_bind()),
     )
 
 
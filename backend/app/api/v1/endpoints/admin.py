@@ -0,0 +1,97 @@
+"""Administrator endpoints."""
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.security import get_current_admin
+from app.core.timeutil import as_utc
+from app.db.database import get_db
+from app.db.models import Account
+from app.schemas import AccountImportResultOut
+from app.schemas.limits import ACCOUNT_CITY_MAX, ACCOUNT_IMPORT_MAX_ROWS
+from app.services.export_service import MEDIA_TYPES, ExportFormat, ExportStatus, ReportExportService
+from app.services.import_service import AccountImportService, ImportFormat
+
+router = APIRouter()
+
+
+@router.get(
+    "/reports/export",
+    summary="Admin: export reports",
+    description="Stream every matching report (live and archived) as CSV or NDJSON",
+    response_class=StreamingResponse,
+)
+def export_reports(
+    format: ExportFormat = Query("csv", description="csv or ndjson"),
+    report_status: ExportStatus = Query("all", alias="status", description="all, open, accepted or completed"),
+    report_type_id: Optional[int] = Query(None, ge=1),
+    city: Optional[str] = Query(None, max_length=ACCOUNT_CITY_MAX, description="City prefix"),
+    date_from: Optional[datetime] = Query(None, description="Reported at or after (ISO 8601)"),
+    date_to: Optional[datetime] = Query(None, description="Reported at or before (ISO 8601)"),
+    current_admin: Account = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """Stream the export; memory use does not grow with the number of rows.
+
+    Rows are read in keyset pages, each in its own short session opened by
+    the response body, so the first bytes go out before the whole export is
+    read and writes are never blocked by a slow download.
+    """
+    # Compared in UTC, like the stored timestamps; no offset means UTC
+    date_from = as_utc(date_from) if date_from else None
+    date_to = as_utc(date_to) if date_to else None
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to",
+        )
+    rows = ReportExportService.iter_rows(
+        db.get_bind(),
+        status=report_status,
+        report_type_id=report_type_id,
+        city=city,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    encode = ReportExportService.stream_csv if format == "csv" else ReportExportService.stream_ndjson
+    filename = f"reports-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.{format}"
+    return StreamingResponse(
+        encode(rows),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/accounts/import",
+    response_model=AccountImportResultOut,
+    summary="Admin: bulk import volunteers",
+    description="Create volunteer accounts from a CSV or JSON request body",
+)
+async def import_accounts(
+    request: Request,
+    format: Optional[ImportFormat] = Query(None, description="csv or json; defaults to the Content-Type"),
+    current_admin: Account = Depends(get_current_admin),
+    db: Session = Depends(get_db),
+):
+    """Import volunteers; rows that fail validation or already exist are listed in `errors`.
+
+    The body is the file itself (`text/csv` or `application/json`).
+    """
+    if format is None:
+        format = "json" if "json" in request.headers.get("content-type", "") else "csv"
+    try:
+        content = (await request.body()).decode("utf-8")
+        records = AccountImportService.parse(content, format)
+    except (UnicodeDecodeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    if len(records) > ACCOUNT_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {ACCOUNT_IMPORT_MAX_ROWS} accounts per request; use scripts/import_volunteers.py",
+        )
+    return await run_in_threadpool(AccountImportService.import_accounts, db, records)
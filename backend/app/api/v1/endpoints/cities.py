@@ -0,0 +1,31 @@
+"""City endpoints."""
+from typing import List
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.schemas import CitySuggestionOut
+from app.schemas.limits import CITY_SUGGEST_LIMIT_MAX, CITY_SUGGEST_QUERY_MAX
+from app.services.city_service import CityService
+
+router = APIRouter()
+
+
+@router.get(
+    "/suggest",
+    response_model=List[CitySuggestionOut],
+    summary="City autocomplete",
+    description="Cities starting with the given prefix, ignoring case and Polish diacritics",
+)
+def suggest_cities(
+    q: str = Query(..., min_length=1, max_length=CITY_SUGGEST_QUERY_MAX, description="City prefix"),
+    limit: int = Query(10, ge=1, le=CITY_SUGGEST_LIMIT_MAX, description="Maksymalna liczba wyników"),
+    db: Session = Depends(get_db),
+):
+    """Return up to `limit` cities whose name starts with `q`, most used first.
+
+    Served from an in-memory dictionary of the cities used by reports and
+    accounts; "krak" matches "Kraków".
+    """
+    return CityService.suggest(db, q, limit=limit)
@@ -0,0 +1,23 @@
+"""Scheduled maintenance job endpoints."""
+from typing import List
+
+from fastapi import APIRouter, Depends
+from starlette.concurrency import run_in_threadpool
+
+from app.core.security import get_current_account
+from app.core.scheduler import scheduler
+from app.db.models import Account
+from app.schemas import ScheduledJobOut
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=List[ScheduledJobOut],
+    summary="Scheduled job metrics",
+    description="Schedules, next run times and latest run metrics of the periodic maintenance jobs",
+)
+async def list_scheduled_jobs(_: Account = Depends(get_current_account)):
+    """Return every registered job with its cluster-wide run history."""
+    return await run_in_threadpool(scheduler.stats)
@@ -0,0 +1,52 @@
+"""Volunteer leaderboard endpoints."""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.core.cities import normalize_city
+from app.core.security import get_current_account
+from app.db.database import get_db
+from app.db.models import Account
+from app.schemas import LeaderboardOut, LeaderboardRankOut
+from app.schemas.leaderboard import LeaderboardPeriod
+from app.schemas.limits import ACCOUNT_CITY_MAX, LEADERBOARD_LIMIT_DEFAULT, LEADERBOARD_LIMIT_MAX
+from app.services.leaderboard_service import LeaderboardService
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    response_model=LeaderboardOut,
+    summary="Public: volunteer leaderboard",
+    description="Top volunteers by GenPoints (period=all) or reports resolved this year (period=year)",
+)
+def get_leaderboard(
+    period: LeaderboardPeriod = Query("all", description="all = GenPoints, year = resolved this year"),
+    city: Optional[str] = Query(None, max_length=ACCOUNT_CITY_MAX, description="Ranking within one city"),
+    limit: int = Query(LEADERBOARD_LIMIT_DEFAULT, ge=1, le=LEADERBOARD_LIMIT_MAX),
+    db: Session = Depends(get_db),
+):
+    """Return the best volunteers; equal scores share a rank.
+
+    Served from a cached top list that is dropped whenever a volunteer
+    completes a report.
+    """
+    entries = LeaderboardService.get_top(db, period=period, city=city, limit=limit)
+    return LeaderboardOut(period=period, city=normalize_city(city), entries=entries)
+
+
+@router.get(
+    "/me",
+    response_model=LeaderboardRankOut,
+    summary="My leaderboard position",
+    description="Global and city rank of the authenticated volunteer",
+)
+def get_my_rank(
+    period: LeaderboardPeriod = Query("all"),
+    current_account: Account = Depends(get_current_account),
+    db: Session = Depends(get_db),
+):
+    """Return the current volunteer's rank without ranking everyone else."""
+    return LeaderboardService.get_rank(db, current_account, period=period)
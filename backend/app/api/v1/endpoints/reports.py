@@ -1,15 +1,43 @@
 """Zgłoszenie (Report) endpoints."""
-from datetime import date, datetime
-from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
+from typing import List, Literal, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.orm import Session
 
+from app.core.cache import AVG_RESPONSE_TIME_KEY, public_cache
 from app.core.security import get_current_account
 from app.core.logger import log_new_report, log_report_accepted, log_report_completed, log_report_cancelled
 from app.db.database import get_db
 from app.db.models import Account
-from app.schemas import ReportCreate, ReportOut
+from app.schemas import (
+    ChatHistoryPage,
+    NearbyReportOut,
+    RecommendedReportOut,
+    ReportBatchOut,
+    ReportCreate,
+    ReportOut,
+    LatencyPercentilesOut,
+    ReportSummaryOut,
+    TimeseriesOut,
+)
+from app.schemas.analytics import AnalyticsInterval, AnalyticsSplit, LatencyMetric
+from app.schemas.limits import (
+    ANALYTICS_RANGE_DEFAULT_DAYS,
+    ANALYTICS_RANGE_MAX_DAYS,
+    CHAT_HISTORY_PAGE_MAX,
+    GEO_NEARBY_RADIUS_DEFAULT_KM,
+    GEO_NEARBY_RADIUS_MAX_KM,
+    RECOMMENDATION_LIMIT_DEFAULT,
+    RECOMMENDATION_LIMIT_MAX,
+    REPORT_BATCH_MAX,
+    REPORT_CITY_MAX,
+)
+from app.services.analytics_service import ReportAnalyticsService
+from app.services.chat_service import ChatService
+from app.services.latency_service import LatencyMetricsService
 from app.services.report_service import ReportService
 
 router = APIRouter()
@@ -54,7 +82,7 @@ def create_report(
 
 @router.get(
     "/",
-    response_model=List[ReportOut],
+    response_model=Union[List[ReportOut], List[ReportSummaryOut]],
     summary="Get all reports",
     description="Get a list of reports with optional filters"
 )
@@ -66,6 +94,10 @@ def get_all_reports(
     search: Optional[str] = Query(None, min_length=2, description="Szukaj po adresie lub opisie"),
     date_from: Optional[date] = Query(None, description="Filter reports from date (YYYY-MM-DD)"),
     date_to: Optional[date] = Query(None, description="Filter reports to date (YYYY-MM-DD)"),
+    view: Literal["full", "summary"] = Query(
+        "full",
+        description="`summary` returns only the board columns with a truncated problem preview",
+    ),
     db: Session = Depends(get_db),
     _: Account = Depends(get_current_account),
 ):
@@ -78,8 +110,12 @@ def get_all_reports(
     - **city**: filter by city
     - **search**: search by address or problem description
     - **date_from**, **date_to**: filter by date range
+    - **view**: `full` (default) or `summary` for the lightweight list projection
     """
-    reports = ReportService.get_all_reports(
+    list_reports = (
+        ReportService.get_report_summaries if view == "summary" else ReportService.get_all_reports
+    )
+    reports = list_reports(
         db, 
         skip=skip, 
         limit=limit,
@@ -89,12 +125,14 @@ def get_all_reports(
         date_from=datetime.combine(date_from, datetime.min.time()) if date_from else None,
         date_to=datetime.combine(date_to, datetime.max.time()) if date_to else None,
     )
+    if view == "summary":
+        return [ReportSummaryOut.model_validate(row) for row in reports]
     return reports
 
 
 @router.get(
     "",
-    response_model=List[ReportOut],
+    response_model=Union[List[ReportOut], List[ReportSummaryOut]],
     include_in_schema=False,
 )
 def get_all_reports_no_slash(
@@ -105,6 +143,7 @@ def get_all_reports_no_slash(
     search: Optional[str] = Query(None, min_length=2, description="Szukaj po adresie lub opisie"),
     date_from: Optional[date] = Query(None, description="Filter reports from date (YYYY-MM-DD)"),
     date_to: Optional[date] = Query(None, description="Filter reports to date (YYYY-MM-DD)"),
+    view: Literal["full", "summary"] = Query("full"),
     db: Session = Depends(get_db),
     current_account: Account = Depends(get_current_account),
 ):
@@ -117,6 +156,7 @@ def get_all_reports_no_slash(
         search=search,
         date_from=date_from,
         date_to=date_to,
+        view=view,
         db=db,
         _=current_account,
     )
@@ -136,6 +176,135 @@ def get_reports_statistics(
     return stats
 
 
+@router.get(
+    "/analytics/timeseries",
+    response_model=TimeseriesOut,
+    summary="Report analytics time series",
+    description="Reports created, accepted and completed per day, week or month, with mean response times",
+)
+def get_reports_timeseries(
+    date_from: Optional[date] = Query(None, description=f"Default: {ANALYTICS_RANGE_DEFAULT_DAYS} days before date_to"),
+    date_to: Optional[date] = Query(None, description="Default: today (UTC)"),
+    interval: AnalyticsInterval = Query("day"),
+    report_type_id: Optional[int] = Query(None, ge=1),
+    city: Optional[str] = Query(None, max_length=REPORT_CITY_MAX, description="City prefix"),
+    split_by: Optional[AnalyticsSplit] = Query(None, description="One series per report type or city"),
+    db: Session = Depends(get_db),
+    _: Account = Depends(get_current_account),
+):
+    """Return lifecycle volumes from the daily rollup (UTC days).
+
+    Reads the pre-aggregated `statystyki_dzienne` table instead of the
+    reports themselves, so the cost depends on the range, not on history.
+    """
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=ANALYTICS_RANGE_DEFAULT_DAYS - 1)
+    if date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must not be after date_to")
+    if (date_to - date_from).days >= ANALYTICS_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range is limited to {ANALYTICS_RANGE_MAX_DAYS} days",
+        )
+    return ReportAnalyticsService.get_timeseries(
+        db,
+        date_from=date_from,
+        date_to=date_to,
+        interval=interval,
+        report_type_id=report_type_id,
+        city=city,
+        split_by=split_by,
+    )
+
+
+@router.get(
+    "/nearby",
+    response_model=List[NearbyReportOut],
+    summary="Nearest open reports",
+    description="Open reports with coordinates within a radius of a point, nearest first",
+)
+def get_nearby_reports(
+    lat: Optional[float] = Query(None, ge=-90, le=90, description="Latitude (defaults to your account location)"),
+    lon: Optional[float] = Query(None, ge=-180, le=180, description="Longitude (defaults to your account location)"),
+    radius: float = Query(
+        GEO_NEARBY_RADIUS_DEFAULT_KM,
+        gt=0,
+        le=GEO_NEARBY_RADIUS_MAX_KM,
+        description="Search radius in kilometres",
+    ),
+    limit: int = Query(50, ge=1, le=500, description="Maksymalna liczba wyników"),
+    report_type_id: Optional[int] = Query(None, description="Filter by report type id"),
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account),
+):
+    """Return open reports ordered by distance (`distance_km`).
+
+    - **lat**, **lon**: search origin; both default to the coordinates saved on your account
+    - **radius**: radius in kilometres
+    - **report_type_id**: filter by report type id
+
+    Reports submitted without coordinates never appear here.
+    """
+    if (lat is None) != (lon is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide both lat and lon, or neither to use your account location",
+        )
+    if lat is None:
+        lat, lon = current_account.latitude, current_account.longitude
+        if lat is None or lon is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide lat and lon or save a location on your account",
+            )
+
+    matches = ReportService.get_nearby_reports(
+        db,
+        latitude=lat,
+        longitude=lon,
+        radius_km=radius,
+        limit=limit,
+        report_type_id=report_type_id,
+    )
+    return [
+        NearbyReportOut(**ReportOut.model_validate(report).model_dump(), distance_km=round(distance, 3))
+        for report, distance in matches
+    ]
+
+
+@router.get(
+    "/recommended",
+    response_model=List[RecommendedReportOut],
+    summary="Recommended reports",
+    description="Open reports ranked for the authenticated volunteer",
+)
+def get_recommended_reports(
+    limit: int = Query(
+        RECOMMENDATION_LIMIT_DEFAULT,
+        ge=1,
+        le=RECOMMENDATION_LIMIT_MAX,
+        description="Maksymalna liczba wyników",
+    ),
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account),
+):
+    """Return a short list of open reports ranked for you.
+
+    Reports in your city come first; reports of types you have completed
+    before, reports waiting longer and older reporters rank higher. Each item
+    carries its `score` and the `reasons` that contributed to it.
+    """
+    ranked = ReportService.get_recommended_reports(db, current_account, limit=limit)
+    return [
+        RecommendedReportOut(
+            **ReportOut.model_validate(report).model_dump(),
+            score=recommendation.score,
+            reasons=recommendation.reasons,
+        )
+        for report, recommendation in ranked
+    ]
+
+
 @router.get(
     "/metrics/avg-response-time",
     summary="Average response time",
@@ -144,11 +313,54 @@ def get_reports_statistics(
 def get_average_response_time(
     db: Session = Depends(get_db),
 ):
-    """Return average response time in minutes (public endpoint)."""
-    avg_minutes = ReportService.get_average_response_minutes(db)
+    """Return average response time in minutes (public endpoint).
+
+    Served from the stale-while-revalidate public cache.
+    """
+    avg_minutes = public_cache.get_or_load(
+        AVG_RESPONSE_TIME_KEY,
+        partial(_load_average_response_minutes, db.get_bind()),
+    )
     return {"average_response_minutes": avg_minutes}
 
 
+def _load_average_response_minutes(bind: Engine | Connection) -> Optional[float]:
+    """Compute the average response time in a dedicated session."""
+    with Session(bind=bind) as db:
+        return ReportService.get_average_response_minutes(db)
+
+
+@router.get(
+    "/metrics/response-time-percentiles",
+    response_model=LatencyPercentilesOut,
+    summary="Response time percentiles",
+    description="Public p50/p90/p99 minutes to first acceptance or to completion, overall or for a range of days",
+)
+def get_response_time_percentiles(
+    metric: LatencyMetric = Query("accept", description="accept or complete"),
+    report_type_id: Optional[int] = Query(None, ge=1),
+    date_from: Optional[date] = Query(None, description="First UTC day of the event (acceptance / completion)"),
+    date_to: Optional[date] = Query(None, description="Last UTC day of the event"),
+    db: Session = Depends(get_db),
+):
+    """Return the latency distribution from the persisted quantile sketches.
+
+    Percentiles are within 1% of the exact values and are read from at most
+    one stored sketch per day, never from the report history.
+    """
+    if date_from and date_to:
+        if date_from > date_to:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must not be after date_to")
+        if (date_to - date_from).days >= ANALYTICS_RANGE_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Date range is limited to {ANALYTICS_RANGE_MAX_DAYS} days",
+            )
+    return LatencyMetricsService.get_percentiles(
+        db, metric=metric, report_type_id=report_type_id, date_from=date_from, date_to=date_to
+    )
+
+
 @router.get(
     "/my-accepted-report",
     summary="Get my accepted report",
@@ -179,6 +391,45 @@ def get_my_completed_reports(
     )
 
 
+@router.get(
+    "/batch",
+    response_model=ReportBatchOut,
+    summary="Get reports by IDs",
+    description=f"Fetch up to {REPORT_BATCH_MAX} reports in one request",
+)
+def get_reports_batch(
+    ids: str = Query(..., description="Comma-separated report IDs, e.g. 3,1,7"),
+    db: Session = Depends(get_db),
+    _: Account = Depends(get_current_account),
+):
+    """Return the requested reports keyed by id, in request order.
+
+    Ids that do not exist are listed in `missing` instead of failing the
+    whole request.
+    """
+    try:
+        report_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers",
+        )
+    report_ids = list(dict.fromkeys(report_ids))
+    if not report_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Provide at least one report id")
+    if len(report_ids) > REPORT_BATCH_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {REPORT_BATCH_MAX} report ids per request",
+        )
+
+    found = ReportService.get_reports_by_ids(db, report_ids)
+    return ReportBatchOut(
+        reports=found,
+        missing=[report_id for report_id in report_ids if report_id not in found],
+    )
+
+
 @router.get(
     "/{report_id}",
     response_model=ReportOut,
@@ -190,8 +441,8 @@ def get_report_by_id(
     db: Session = Depends(get_db),
     _: Account = Depends(get_current_account),
 ):
-    """Get report by id."""
-    report = ReportService.get_report_by_id(db, report_id)
+    """Get report by id (archived reports included)."""
+    report = ReportService.get_report_including_archived(db, report_id)
     if not report:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -200,6 +451,35 @@ def get_report_by_id(
     return report
 
 
+@router.get(
+    "/{report_id}/messages",
+    response_model=ChatHistoryPage,
+    summary="Report chat history",
+    description="Newest-first page of the report's chat; pass `next_cursor` back as `before` for older messages.",
+)
+def get_report_messages(
+    report_id: int,
+    before: Optional[str] = Query(None, description="Cursor returned as next_cursor"),
+    limit: int = Query(50, ge=1, le=CHAT_HISTORY_PAGE_MAX, description="Max results"),
+    db: Session = Depends(get_db),
+    current_account: Account = Depends(get_current_account),
+):
+    """Return paginated chat history for a report (its participants only)."""
+    report = ReportService._ensure_report_exists(db, report_id, include_archived=True)
+    if not ChatService.is_participant(db, report, current_account.email):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not a participant of this report",
+        )
+    try:
+        return ChatService.get_history(db, report_id, limit=limit, before=before)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+
 @router.post(
     "/{report_id}/accept",
     response_model=ReportOut,
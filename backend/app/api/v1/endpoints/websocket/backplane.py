@@ -0,0 +1,133 @@
+"""Pub/sub backplanes that fan WebSocket messages out across workers.
+
+Every `ConnectionManager` publishes through its backplane and delivers what
+the backplane hands back to its own sockets, so a message published on one
+worker reaches clients connected to any worker subscribed to the same channel.
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Optional, Set
+
+try:  # pragma: no cover - optional dependency
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str], Awaitable[None]]
+
+
+class Backplane(ABC):
+    """Interface implemented by every backplane."""
+
+    @abstractmethod
+    async def start(self, deliver: Deliver) -> None:
+        """Begin delivering published messages to `deliver`."""
+
+    @abstractmethod
+    async def publish(self, message: str) -> None:
+        """Send `message` to every subscribed worker (including this one)."""
+
+    @abstractmethod
+    async def stop(self, deliver: Deliver) -> None:
+        """Stop delivering to `deliver` (as passed to `start`) and release its resources."""
+
+
+class InMemoryBackplane(Backplane):
+    """Single-process backplane; managers sharing an instance share messages."""
+
+    def __init__(self):
+        self._subscribers: Set[Deliver] = set()
+
+    async def start(self, deliver: Deliver) -> None:
+        self._subscribers.add(deliver)
+
+    async def publish(self, message: str) -> None:
+        for deliver in list(self._subscribers):
+            await deliver(message)
+
+    async def stop(self, deliver: Deliver) -> None:
+        # Other managers sharing this instance keep receiving
+        self._subscribers.discard(deliver)
+
+
+class RedisBackplane(Backplane):
+    """Backplane over Redis PUBLISH/SUBSCRIBE (requires the `redis` package).
+
+    Works with any server speaking the Redis protocol; tests pass a
+    `fakeredis` client through `client`. Each instance holds one
+    subscription, so every manager needs its own.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        channel: str = "genlink:ws",
+        client=None,
+        reconnect_delay: float = 1.0,
+    ):
+        if client is None:
+            if aioredis is None:
+                raise RuntimeError("RedisBackplane requires the 'redis' package")
+            client = aioredis.from_url(url, decode_responses=True)
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._client = client
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(deliver))
+
+    async def _listen(self, deliver: Deliver) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Backplane receive failed, retrying: %s", exc)
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+            if message is None or message.get("type") != "message":
+                continue
+            data = message["data"]
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            try:
+                await deliver(data)
+            except Exception:
+                logger.exception("Backplane delivery failed")
+
+    async def publish(self, message: str) -> None:
+        await self._client.publish(self.channel, message)
+
+    async def stop(self, deliver: Deliver) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self._client.aclose()
+
+
+def create_backplane(url: str, channel: str) -> Backplane:
+    """Build the backplane configured by `WS_BACKPLANE_URL`.
+
+    An empty URL keeps fan-out inside the current process.
+    """
+    if not url:
+        return InMemoryBackplane()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackplane(url, channel=channel)
+    raise ValueError(f"Unsupported WS_BACKPLANE_URL scheme: {url}")
@@ -1,19 +1,321 @@
-from typing import List
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Set
+
 from fastapi import WebSocket
 
+from app.config import settings
+from .backplane import Backplane, create_backplane
+
+logger = logging.getLogger(__name__)
+
+# Close code sent to consumers that cannot keep up ("Try Again Later");
+# also used when refusing connections over the configured caps
+SLOW_CONSUMER_CLOSE_CODE = 1013
+# Close code sent to connections reaped after the idle timeout ("Going Away")
+IDLE_CLOSE_CODE = 1001
+
+PING_MESSAGE = json.dumps({"event": "ping"})
+
+
+class _Connection:
+    """A socket with its bounded outgoing queue, the task draining it and its topics."""
+
+    __slots__ = ("websocket", "queue", "writer", "topics", "account", "last_seen")
+
+    def __init__(self, websocket: WebSocket, max_queue_size: int, account: Optional[str]):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue_size)
+        self.writer: Optional[asyncio.Task] = None
+        self.topics: Set[str] = set()
+        self.account = account
+        self.last_seen = time.monotonic()
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    """Track WebSocket connections and fan messages out without blocking.
+
+    `broadcast` publishes through the backplane; messages coming back from it
+    are only enqueued locally: every connection has its own writer task, so a
+    slow or dead client never delays delivery to the others. A connection whose
+    queue overflows, or whose send fails or times out, is evicted.
+
+    `publish` targets a topic: the topic index maps each topic to its
+    subscribed connections, so delivery costs O(subscribers of that topic).
+
+    A background reaper pings connections silent for `heartbeat_interval`
+    and closes those silent for `idle_timeout`; handlers call `touch` on every
+    received frame. `connect` refuses sockets over the global or per-account caps.
+    """
+
+    def __init__(
+        self,
+        backplane: Optional[Backplane] = None,
+        max_queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+        max_topics_per_connection: int = settings.WS_MAX_TOPICS_PER_CONNECTION,
+        heartbeat_interval: float = settings.WS_HEARTBEAT_INTERVAL_SECONDS,
+        idle_timeout: float = settings.WS_IDLE_TIMEOUT_SECONDS,
+        max_connections: int = settings.WS_MAX_CONNECTIONS,
+        max_connections_per_account: int = settings.WS_MAX_CONNECTIONS_PER_ACCOUNT,
+    ):
+        self.backplane = backplane or create_backplane(
+            settings.WS_BACKPLANE_URL, settings.WS_BACKPLANE_CHANNEL
+        )
+        self.max_queue_size = max_queue_size
+        self.send_timeout = send_timeout
+        self.max_topics_per_connection = max_topics_per_connection
+        self.heartbeat_interval = heartbeat_interval
+        self.idle_timeout = idle_timeout
+        self.max_connections = max_connections
+        self.max_connections_per_account = max_connections_per_account
+        self._started = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self.active_connections: Dict[WebSocket, _Connection] = {}
+        self.account_connections: Dict[str, int] = {}
+        self.topics: Dict[str, Set[_Connection]] = {}
+        self.evicted_connections = 0
+        self.refused_connections = 0
+        self.reaped_connections = 0
+        self.reap_runs = 0
+        self.last_reap_at: Optional[float] = None
+        self._closing: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Subscribe to the backplane and start the reaper (idempotent)."""
+        if not self._started:
+            self._started = True
+            self._loop = asyncio.get_running_loop()
+            await self.backplane.start(self._deliver_local)
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    async def stop(self) -> None:
+        """Unsubscribe from the backplane and drop local connections."""
+        if self._started:
+            self._started = False
+            self._loop = None
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+            await self.backplane.stop(self._deliver_local)
+        for websocket in list(self.active_connections):
+            self.disconnect(websocket)
+
+    async def connect(self, websocket: WebSocket, account: Optional[str] = None) -> bool:
+        """Accept and register the socket; False (socket closed) when over a cap."""
+        await self.start()
+        if len(self.active_connections) >= self.max_connections:
+            reason = "Server connection limit reached"
+        elif account is not None and (
+            self.account_connections.get(account, 0) >= self.max_connections_per_account
+        ):
+            reason = "Too many connections for this account"
+        else:
+            reason = None
+        if reason is not None:
+            self.refused_connections += 1
+            await websocket.close(code=SLOW_CONSUMER_CLOSE_CODE, reason=reason)
+            return False
 
-    async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        connection = _Connection(websocket, self.max_queue_size, account)
+        connection.writer = asyncio.create_task(self._drain(connection))
+        self.active_connections[websocket] = connection
+        if account is not None:
+            self.account_connections[account] = self.account_connections.get(account, 0) + 1
+        return True
+
+    def touch(self, websocket: WebSocket) -> None:
+        """Record activity (any received frame, including pongs)."""
+        connection = self.active_connections.get(websocket)
+        if connection is not None:
+            connection.last_seen = time.monotonic()
+
+    def reap(self, now: Optional[float] = None) -> int:
+        """Ping quiet connections and close idle ones; returns how many were closed."""
+        now = time.monotonic() if now is None else now
+        reaped = 0
+        for connection in list(self.active_connections.values()):
+            idle = now - connection.last_seen
+            if idle >= self.idle_timeout:
+                if self._evict(connection, IDLE_CLOSE_CODE):
+                    reaped += 1
+            elif idle >= self.heartbeat_interval:
+                self._enqueue(connection, PING_MESSAGE)
+        self.reaped_connections += reaped
+        self.reap_runs += 1
+        self.last_reap_at = time.time()
+        return reaped
+
+    def stats(self) -> Dict[str, Any]:
+        """Live counters for this worker."""
+        return {
+            "connections": len(self.active_connections),
+            "accounts": len(self.account_connections),
+            "topics": len(self.topics),
+            "max_connections": self.max_connections,
+            "max_connections_per_account": self.max_connections_per_account,
+            "evicted_connections": self.evicted_connections,
+            "refused_connections": self.refused_connections,
+            "reaped_connections": self.reaped_connections,
+            "reap_runs": self.reap_runs,
+            "last_reap_at": self.last_reap_at,
+        }
+
+    async def _reap_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                reaped = self.reap()
+            except Exception:
+                logger.exception("WebSocket reaper run failed")
+                continue
+            if reaped:
+                logger.info("Reaped %d idle WebSocket connections", reaped)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        connection = self._remove(websocket)
+        if connection is not None and connection.writer is not None:
+            connection.writer.cancel()
+
+    def subscribe(self, websocket: WebSocket, topic: str) -> bool:
+        """Add the socket to `topic`; False if unknown socket or topic limit reached."""
+        connection = self.active_connections.get(websocket)
+        if connection is None:
+            return False
+        if topic not in connection.topics:
+            if len(connection.topics) >= self.max_topics_per_connection:
+                return False
+            connection.topics.add(topic)
+            self.topics.setdefault(topic, set()).add(connection)
+        return True
+
+    def unsubscribe(self, websocket: WebSocket, topic: str) -> None:
+        connection = self.active_connections.get(websocket)
+        if connection is not None and topic in connection.topics:
+            connection.topics.discard(topic)
+            self._unindex(connection, topic)
+
+    def send_personal(self, websocket: WebSocket, message: str) -> None:
+        """Queue a message for a single local socket."""
+        connection = self.active_connections.get(websocket)
+        if connection is not None:
+            self._enqueue(connection, message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        await self.start()
+        await self.backplane.publish(json.dumps({"topic": None, "message": message}))
+
+    async def publish(self, topic: str, message: Any):
+        """Deliver `message` (any JSON value) to subscribers of `topic` on every worker."""
+        await self.start()
+        await self.backplane.publish(json.dumps({"topic": topic, "message": message}))
+
+    def publish_threadsafe(self, topic: str, message: Any) -> None:
+        """`publish` from synchronous code, e.g. a service running in the threadpool.
+
+        Fire and forget: the message is scheduled on the manager's event loop
+        and failures are logged. A no-op while the manager is not started.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            future = asyncio.ensure_future(self.publish(topic, message))
+        else:
+            future = asyncio.run_coroutine_threadsafe(self.publish(topic, message), loop)
+        future.add_done_callback(_log_publish_failure)
+
+    async def _deliver_local(self, envelope: str) -> None:
+        try:
+            payload = json.loads(envelope)
+            topic = payload["topic"]
+            message = payload["message"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Dropping malformed backplane message")
+            return
+        if topic is None:
+            for connection in list(self.active_connections.values()):
+                self._enqueue(connection, message)
+            return
+        subscribers = self.topics.get(topic)
+        if not subscribers:
+            return
+        framed = json.dumps({"event": "message", "topic": topic, "message": message})
+        for connection in list(subscribers):
+            self._enqueue(connection, framed)
+
+    def _remove(self, websocket: WebSocket) -> Optional[_Connection]:
+        connection = self.active_connections.pop(websocket, None)
+        if connection is not None:
+            if connection.account is not None:
+                remaining = self.account_connections.get(connection.account, 1) - 1
+                if remaining > 0:
+                    self.account_connections[connection.account] = remaining
+                else:
+                    self.account_connections.pop(connection.account, None)
+            for topic in connection.topics:
+                self._unindex(connection, topic)
+            connection.topics.clear()
+        return connection
+
+    def _unindex(self, connection: _Connection, topic: str) -> None:
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self.topics[topic]
+
+    def _enqueue(self, connection: _Connection, message: str) -> None:
+        try:
+            connection.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning("Evicting slow WebSocket consumer (queue full)")
+            if self._evict(connection):
+                self.evicted_connections += 1
+
+    async def _drain(self, connection: _Connection) -> None:
+        websocket = connection.websocket
+        while True:
+            message = await connection.queue.get()
+            try:
+                await asyncio.wait_for(websocket.send_text(message), self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.info("Evicting WebSocket after failed send: %s", exc)
+                if self._evict(connection):
+                    self.evicted_connections += 1
+                return
+
+    def _evict(self, connection: _Connection, code: int = SLOW_CONSUMER_CLOSE_CODE) -> bool:
+        if self._remove(connection.websocket) is None:
+            return False
+        writer = connection.writer
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        closing = asyncio.create_task(self._close(connection.websocket, code))
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+        return True
+
+    async def _close(self, websocket: WebSocket, code: int) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(code=code), self.send_timeout)
+        except Exception:
+            pass
+
+
+def _log_publish_failure(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Topic publish failed", exc_info=future.exception())
+
 
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
@@ -0,0 +1,61 @@
+"""Topic names used for targeted WebSocket delivery.
+
+Topics are `<kind>:<key>` strings:
+
+- `city:<city key>` – volunteers in one city; the key is `normalize_city`,
+  so "Kraków", "krakow" and " KRAKOW " are the same topic
+- `report_type:<id>` – volunteers following a report category
+- `report:<id>` – the parties working on one report
+
+`city:` and `report_type:` topics carry server events (see `REPORT_CREATED`);
+the anonymous chat socket may subscribe to them but not publish. `report:`
+topics carry the persisted report chat rooms, so only the authenticated room
+endpoint subscribes to them.
+"""
+import re
+from typing import Iterable
+
+from app.core.cities import normalize_city
+
+TOPIC_KINDS = ("city", "report_type", "report")
+PUBLIC_TOPIC_KINDS = ("city", "report_type")
+
+_NUMERIC_KINDS = {"report_type", "report"}
+
+# `type` of the message published to a new report's city and report type topics
+REPORT_CREATED = "report_created"
+_TOPIC_KEY_MAX = 120
+
+
+def city_topic(city: str) -> str:
+    key = normalize_city(city)
+    if key is None:
+        raise ValueError("City topic requires a city name")
+    return f"city:{key}"
+
+
+def report_type_topic(report_type_id: int) -> str:
+    return f"report_type:{report_type_id}"
+
+
+def report_topic(report_id: int) -> str:
+    return f"report:{report_id}"
+
+
+def normalize_topic(raw: str, kinds: Iterable[str] = TOPIC_KINDS) -> str:
+    """Validate a client-supplied topic and return its canonical form.
+
+    Raises ValueError for malformed keys or kinds outside `kinds`.
+    """
+    kind, separator, key = raw.partition(":")
+    kind = kind.strip().lower()
+    key = key.strip()
+    if not separator or kind not in TOPIC_KINDS or not key or len(key) > _TOPIC_KEY_MAX:
+        raise ValueError(f"Invalid topic '{raw}'")
+    if kind not in kinds:
+        raise ValueError(f"Topic '{raw}' is not available on this socket")
+    if kind in _NUMERIC_KINDS:
+        if not re.fullmatch(r"\d+", key):
+            raise ValueError(f"Topic '{raw}' requires a numeric id")
+        return f"{kind}:{int(key)}"
+    return city_topic(key)
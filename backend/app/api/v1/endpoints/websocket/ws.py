@@ -1,15 +1,184 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import json
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect, status
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.security import decode_access_token, get_current_account
+from app.db.database import get_db
+from app.db.models import Account, Report
+from app.schemas.chat import ChatMessageOut
+from app.schemas.limits import CHAT_MESSAGE_MAX
+from app.services.chat_service import ChatService, chat_writer
 from .manager import manager
+from .topics import PUBLIC_TOPIC_KINDS, normalize_topic, report_topic
 
 router = APIRouter()
 
+
+def _parse_command(data: str) -> Optional[dict]:
+    """Return a topic command (`{"action": ...}` JSON object) or None for plain chat."""
+    if not data.startswith("{"):
+        return None
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or "action" not in payload:
+        return None
+    return payload
+
+
+def _reply(websocket: WebSocket, event: str, **fields) -> None:
+    manager.send_personal(websocket, json.dumps({"event": event, **fields}))
+
+
+async def _handle_command(websocket: WebSocket, command: dict) -> None:
+    action = command.get("action")
+    if action == "pong":
+        return
+    try:
+        topic = normalize_topic(str(command.get("topic", "")), kinds=PUBLIC_TOPIC_KINDS)
+    except ValueError as exc:
+        _reply(websocket, "error", detail=str(exc))
+        return
+
+    if action == "subscribe":
+        if manager.subscribe(websocket, topic):
+            _reply(websocket, "subscribed", topic=topic)
+        else:
+            _reply(websocket, "error", detail="Topic subscription limit reached")
+    elif action == "unsubscribe":
+        manager.unsubscribe(websocket, topic)
+        _reply(websocket, "unsubscribed", topic=topic)
+    elif action == "publish":
+        # Topics carry server events; anonymous clients only listen
+        _reply(websocket, "error", detail="Topics are subscribe-only on this socket")
+    else:
+        _reply(websocket, "error", detail=f"Unknown action '{action}'")
+
+
 @router.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket):
-    await manager.connect(websocket)
+    """Chat socket with optional topic subscriptions.
+
+    Plain text is broadcast to everyone. JSON objects with an `action` of
+    `subscribe` or `unsubscribe` and a `topic` (`city:<name>` or
+    `report_type:<id>`) follow the server events of that topic, such as
+    `{"type": "report_created", ...}` for every new report. Clients cannot
+    publish to topics. Report rooms (`report:<id>`) are only reachable
+    through `/reports/{id}/chat`.
+    Answer `{"event": "ping"}` with `{"action": "pong"}` to stay connected.
+    """
+    if not await manager.connect(websocket):
+        return
     try:
         while True:
             data = await websocket.receive_text()
-            await manager.broadcast(f"User: {data}")
+            manager.touch(websocket)
+            command = _parse_command(data)
+            if command is None:
+                await manager.broadcast(f"User: {data}")
+            else:
+                await _handle_command(websocket, command)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
-        await manager.broadcast("User disconnected")
\ No newline at end of file
+        await manager.broadcast("User disconnected")
+    finally:
+        # Any other error must not leave the socket in the connection and topic indexes
+        manager.disconnect(websocket)
+
+
+def _join_room(
+    db: Session, report_id: int, token: Optional[str]
+) -> Tuple[str, Optional[Tuple[str, str, List[ChatMessageOut]]]]:
+    """Authorize a room connection; returns (refusal reason, (email, name, history) or None)."""
+    email = decode_access_token(token) if token else None
+    account = db.query(Account).filter(Account.email == email).first() if email else None
+    if account is None:
+        return "Not authenticated", None
+    report = db.get(Report, report_id)
+    if report is None:
+        return "Report not found", None
+    if not ChatService.is_participant(db, report, account.email):
+        return "Not a participant of this report", None
+    history = ChatService.get_recent_with_pending(db, report_id, limit=settings.CHAT_HISTORY_ON_CONNECT)
+    return "", (account.email, account.full_name, history)
+
+
+@router.websocket("/reports/{report_id}/chat")
+async def report_chat(
+    websocket: WebSocket,
+    report_id: int,
+    token: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Persistent chat room bound to a report.
+
+    Authenticate with `?token=<access token>`; only the reporter and the
+    volunteer who accepted or completed the report may join (1008 otherwise).
+    On connect the client receives `{"event": "history", "messages": [...]}`
+    with the most recent messages;
+    afterwards every text frame is stored and delivered to the room as
+    `{"event": "message", "topic": "report:<id>", "message": {...}}`.
+    `{"action": "pong"}` frames answer server pings and are not stored.
+    """
+    try:
+        refusal, joined = await run_in_threadpool(_join_room, db, report_id, token)
+    finally:
+        # Release the pooled connection; the socket may stay open for hours
+        db.close()
+    if joined is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=refusal)
+        return
+    sender_email, sender_name, history = joined
+
+    topic = report_topic(report_id)
+    if not await manager.connect(websocket, account=sender_email):
+        return
+    manager.subscribe(websocket, topic)
+    manager.send_personal(
+        websocket,
+        json.dumps(
+            {"event": "history", "messages": [message.model_dump(mode="json") for message in history]}
+        ),
+    )
+    try:
+        while True:
+            content = (await websocket.receive_text()).strip()
+            manager.touch(websocket)
+            command = _parse_command(content)
+            if not content or (command is not None and command.get("action") == "pong"):
+                continue
+            if len(content) > CHAT_MESSAGE_MAX:
+                _reply(websocket, "error", detail=f"Message longer than {CHAT_MESSAGE_MAX} characters")
+                continue
+            row = {
+                "report_id": report_id,
+                "sender_email": sender_email,
+                "sender_name": sender_name,
+                "content": content,
+                "created_at": datetime.now(timezone.utc),
+            }
+            if not await chat_writer.add(row):
+                _reply(websocket, "error", detail="Chat is busy, message not sent")
+                continue
+            await manager.publish(topic, {**row, "id": None, "created_at": row["created_at"].isoformat()})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Also on unexpected errors, so the account's connection count is released
+        manager.disconnect(websocket)
+
+
+@router.get(
+    "/stats",
+    summary="WebSocket connection statistics",
+    description="Live connection counts and heartbeat reaper statistics for this worker",
+)
+async def get_websocket_stats(_: Account = Depends(get_current_account)):
+    """Return connection, eviction and reap counters."""
+    return manager.stats()
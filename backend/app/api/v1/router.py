@@ -1,7 +1,7 @@
 """Main API v1 router."""
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import accounts, types, users, reports, auth
+from app.api.v1.endpoints import accounts, admin, cities, jobs, leaderboard, types, users, reports, auth
 from app.api.v1.endpoints.websocket import ws
 # Create main API v1 router
 api_router = APIRouter()
@@ -12,12 +12,36 @@ api_router.include_router(
     tags=["👥 Accounts"]
 )
 
+api_router.include_router(
+    leaderboard.router,
+    prefix="/leaderboard",
+    tags=["🏆 Leaderboard"]
+)
+
 api_router.include_router(
     reports.router,
     prefix="/reports",
     tags=["📋 Reports"]
 )
 
+api_router.include_router(
+    cities.router,
+    prefix="/cities",
+    tags=["🏙️ Cities"]
+)
+
+api_router.include_router(
+    jobs.router,
+    prefix="/jobs",
+    tags=["⏱️ Jobs"]
+)
+
+api_router.include_router(
+    admin.router,
+    prefix="/admin",
+    tags=["🛠️ Admin"]
+)
+
 api_router.include_router(
     types.router,
     prefix="/types",
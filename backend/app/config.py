@@ -44,11 +44,101 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller bodies are sent as-is
+    COMPRESSION_OFFLOAD_SIZE: int = 64 * 1024  # bytes; larger bodies compress in a worker thread
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    # Comma-separated, in server preference order; unavailable codecs are skipped
+    COMPRESSION_ENCODINGS: str = "br,zstd,gzip"
+
+    # Stale-while-revalidate cache for public endpoints (seconds)
+    PUBLIC_CACHE_TTL_SECONDS: float = 5.0
+    PUBLIC_CACHE_MAX_STALE_SECONDS: float = 60.0
+
+    # Recommendation candidates are rebuilt from the database at this interval
+    # to pick up changes made by other workers (seconds)
+    RECOMMENDATION_REFRESH_SECONDS: float = 300.0
+
+    # City autocomplete dictionary rebuild interval (seconds)
+    CITY_DICTIONARY_REFRESH_SECONDS: float = 300.0
+
+    # Distinct availability schedules kept parsed in memory (per worker)
+    AVAILABILITY_CACHE_SIZE: int = 4096
+
+    # Accounts allowed to use the /admin endpoints (comma-separated emails)
+    ADMIN_EMAILS: str = ""
+
+    # Report export: rows per keyset page (each page is its own short read)
+    EXPORT_PAGE_SIZE: int = 1000
+
+    # Bulk volunteer import
+    ACCOUNT_IMPORT_BATCH_SIZE: int = 500  # accounts per INSERT transaction
+    ACCOUNT_IMPORT_WORKERS: int = 0  # bcrypt hashing processes; 0 = CPU count
+
+    # Periodic maintenance jobs (cron: minute hour day month weekday, 0 = Sunday)
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_POLL_SECONDS: float = 30.0
+    SCHEDULER_TIMEZONE: str = "Europe/Warsaw"
+    SCHEDULE_RESET_YEARLY_COUNTERS: str = "0 0 1 1 *"
+    SCHEDULE_OPTIMIZE_DATABASE: str = "30 3 * * *"
+    SCHEDULE_PRUNE_LOGS: str = "15 3 * * *"
+    LOG_RETENTION_DAYS: int = 30
+    SCHEDULE_ARCHIVE_REPORTS: str = "0 4 * * *"
+
+    # Reports completed longer ago than this move to `zgloszenia_archiwum`
+    REPORT_ARCHIVE_AFTER_DAYS: int = 90
+    REPORT_ARCHIVE_BATCH_SIZE: int = 1000
+    REPORT_ARCHIVE_MAX_BATCHES: int = 500  # per run; the rest waits for the next run
+
+    # Reporter PII (name, phone, age, address, location) of reports completed
+    # longer ago than this is redacted, or the report deleted with mode "delete"
+    PII_RETENTION_DAYS: int = 365
+    PII_RETENTION_MODE: str = "redact"
+    PII_RETENTION_BATCH_SIZE: int = 500
+    PII_RETENTION_PAUSE_SECONDS: float = 0.2  # between batches, lets API writes through
+    PII_RETENTION_MAX_SECONDS: float = 600.0  # per run; the cursor resumes next run
+    SCHEDULE_PURGE_PII: str = "30 4 * * *"
+
+    # Response-time percentile sketches: relative error of reported quantiles,
+    # and how often each worker merges its buffered observations into the DB
+    LATENCY_SKETCH_ACCURACY: float = 0.01
+    LATENCY_SKETCH_FLUSH_SECONDS: float = 10.0
+
+    # WebSocket fan-out
+    WS_SEND_QUEUE_SIZE: int = 64  # pending messages per connection before eviction
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0
+    WS_MAX_TOPICS_PER_CONNECTION: int = 50
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = 20.0  # ping connections silent this long
+    WS_IDLE_TIMEOUT_SECONDS: float = 60.0  # close connections silent this long
+    WS_MAX_CONNECTIONS: int = 10_000  # per worker
+    WS_MAX_CONNECTIONS_PER_ACCOUNT: int = 5
+    # Empty keeps fan-out in-process; set e.g. redis://localhost:6379/0 for multiple workers
+    WS_BACKPLANE_URL: str = ""
+    WS_BACKPLANE_CHANNEL: str = "genlink:ws"
+
+    # Report chat persistence
+    CHAT_FLUSH_BATCH_SIZE: int = 50
+    CHAT_FLUSH_INTERVAL_SECONDS: float = 0.5
+    CHAT_HISTORY_ON_CONNECT: int = 50
     
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+
+    @property
+    def admin_emails_list(self) -> List[str]:
+        """Parse administrator emails from comma-separated string (lowercased)."""
+        return [email.strip().lower() for email in self.ADMIN_EMAILS.split(",") if email.strip()]
+
+    @property
+    def compression_encodings_list(self) -> List[str]:
+        """Parse preferred response encodings from comma-separated string."""
+        return [name.strip().lower() for name in self.COMPRESSION_ENCODINGS.split(",") if name.strip()]
     
 def get_secret_key() -> str:
     """Read SECRET_KEY from environment (not from config file).
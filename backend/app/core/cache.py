@@ -0,0 +1,169 @@
+"""In-process caches: stale-while-revalidate for public endpoints, parsed-text LRU."""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Cache keys for public, unauthenticated endpoints
+ACTIVE_VOLUNTEERS_KEY = "accounts:volunteers:active"
+AVG_RESPONSE_TIME_KEY = "reports:metrics:avg-response-time"
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "refreshing")
+
+    def __init__(self, value: Any, stored_at: float):
+        self.value = value
+        self.stored_at = stored_at
+        self.refreshing = False
+
+
+class StaleWhileRevalidateCache:
+    """Keyed cache that serves stale values while one task refreshes them.
+
+    - age < `ttl`: the cached value is returned.
+    - `ttl` <= age < `ttl + max_stale`: the stale value is returned and a single
+      background refresh is scheduled; concurrent callers do not schedule more.
+    - otherwise (or missing): the value is loaded synchronously, with only one
+      caller per key running the loader while the others wait for its result.
+
+    Loaders must be self-contained (open their own DB session) because they
+    may run after the originating request finished.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_stale: float,
+        executor: Optional[Executor] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._executor = executor or ThreadPoolExecutor(max_workers=2, thread_name_prefix="swr-cache")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._generations: Dict[str, int] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, loading or refreshing as needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = self._clock() - entry.stored_at
+                if age < self.ttl:
+                    self.stats["hits"] += 1
+                    return entry.value
+                if age < self.ttl + self.max_stale:
+                    self.stats["stale_hits"] += 1
+                    if not entry.refreshing:
+                        entry.refreshing = True
+                        generation = self._generations.get(key, 0)
+                        self._executor.submit(self._refresh, key, loader, entry, generation)
+                    return entry.value
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self._clock() - entry.stored_at < self.ttl:
+                    self.stats["hits"] += 1
+                    return entry.value
+                self.stats["misses"] += 1
+                generation = self._generations.get(key, 0)
+            value = loader()
+            self._store(key, value, generation)
+            return value
+
+    def invalidate(self, key: str) -> None:
+        """Drop `key` so the next call recomputes it; in-flight refreshes are discarded."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            for key in list(self._entries):
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def _refresh(self, key: str, loader: Callable[[], Any], entry: _Entry, generation: int) -> None:
+        try:
+            value = loader()
+        except Exception:
+            logger.exception("Background refresh of cache key %s failed", key)
+            with self._lock:
+                self.stats["refresh_errors"] += 1
+                entry.refreshing = False
+            return
+        with self._lock:
+            self.stats["refreshes"] += 1
+        self._store(key, value, generation)
+
+    def _store(self, key: str, value: Any, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                return
+            self._entries[key] = _Entry(value, self._clock())
+
+
+public_cache = StaleWhileRevalidateCache(
+    ttl=settings.PUBLIC_CACHE_TTL_SECONDS,
+    max_stale=settings.PUBLIC_CACHE_MAX_STALE_SECONDS,
+)
+
+
+class ParsedTextCache(Generic[T]):
+    """Bounded LRU of `parse(text)` results keyed by a digest of the text.
+
+    Keys are 16-byte BLAKE2b digests, so memory does not depend on the size
+    of the cached text. Parsed values are shared between callers and must
+    be treated as immutable.
+    """
+
+    def __init__(self, parse: Callable[[str], T], max_entries: int):
+        self._parse = parse
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, T]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, text: str) -> T:
+        """Return the parsed value of `text`, parsing it on first sight."""
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+        # Parse outside the lock; a concurrent miss on the same text just parses twice
+        value = self._parse(text)
+        with self._lock:
+            self.stats["misses"] += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
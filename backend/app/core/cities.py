@@ -0,0 +1,140 @@
+"""City name normalization and the in-memory city dictionary.
+
+`normalize_city` produces the key stored in the indexed `miejscowosc_klucz`
+columns, so "Kraków", "krakow" and " KRAKOW " all share the key `krakow`.
+The dictionary maps keys to their most common spelling for autocomplete.
+"""
+import bisect
+import threading
+import time
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+# Letters without a Unicode decomposition to an ASCII base
+_SPECIAL_LETTERS = str.maketrans({"ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "ø": "o", "Ø": "O", "ß": "ss"})
+
+
+def normalize_city(value: Optional[str]) -> Optional[str]:
+    """Case-folded, diacritic-free, whitespace-collapsed city key (None if empty)."""
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value.translate(_SPECIAL_LETTERS))
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    key = " ".join(stripped.casefold().split())
+    return key or None
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with `prefix`.
+
+    `key >= prefix AND key < prefix_upper_bound(prefix)` is an index range
+    scan on every database, unlike `LIKE 'prefix%'`.
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class CityDictionary:
+    """Sorted city keys with display names and usage counts for prefix lookups."""
+
+    def __init__(
+        self,
+        refresh_interval: float = settings.CITY_DICTIONARY_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Held for the whole reload so only one thread scans the tables
+        self._reload_lock = threading.Lock()
+        # Cities observed while a reload is building, replayed before the swap
+        self._journal: Optional[List[Tuple[str, str]]] = None
+        self._keys: List[str] = []
+        self._entries: Dict[str, List] = {}  # key -> [display name, count]
+        self._loaded_at: Optional[float] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = []
+            self._entries = {}
+            self._loaded_at = None
+
+    def ensure_loaded(self, loader: Callable[[], Iterable[Tuple[str, str, int]]]) -> None:
+        """Rebuild from `(key, spelling, count)` rows when empty or expired.
+
+        The most frequent spelling of each key becomes its display name. The
+        scan runs outside `_lock`, so `suggest` and `observe` keep working
+        during a reload; cities first observed meanwhile are added to the new
+        dictionary before it is swapped in. While one thread reloads, others
+        use the current dictionary (or wait, if there is none yet).
+        """
+        with self._lock:
+            if self._is_fresh():
+                return
+            first_load = self._loaded_at is None
+        if not self._reload_lock.acquire(blocking=first_load):
+            return
+        try:
+            with self._lock:
+                if self._is_fresh():
+                    return
+                self._journal = []
+            entries: Dict[str, List] = {}
+            best: Dict[str, int] = {}
+            for key, spelling, count in loader():
+                if not key:
+                    continue
+                entry = entries.setdefault(key, [spelling.strip(), 0])
+                entry[1] += count
+                if count > best.get(key, 0):
+                    best[key] = count
+                    entry[0] = spelling.strip()
+            keys = sorted(entries)
+            with self._lock:
+                # Counts of known cities catch up on the next reload; new cities must not vanish
+                for key, spelling in self._journal:
+                    if key not in entries:
+                        entries[key] = [spelling, 1]
+                        bisect.insort(keys, key)
+                self._entries, self._keys = entries, keys
+                self._loaded_at = self._clock()
+        finally:
+            with self._lock:
+                self._journal = None
+            self._reload_lock.release()
+
+    def observe(self, city: Optional[str]) -> None:
+        """Count a newly written city (no-op until the dictionary is loaded)."""
+        key = normalize_city(city)
+        if key is None:
+            return
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((key, city.strip()))
+            if self._loaded_at is None:
+                return
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = [city.strip(), 1]
+                bisect.insort(self._keys, key)
+            else:
+                entry[1] += 1
+
+    def suggest(self, query: str, limit: int = 10) -> List[Tuple[str, str, int]]:
+        """Cities whose key starts with the normalized `query`: `(name, key, count)`, most used first."""
+        prefix = normalize_city(query)
+        if prefix is None:
+            return []
+        with self._lock:
+            start = bisect.bisect_left(self._keys, prefix)
+            end = bisect.bisect_left(self._keys, prefix_upper_bound(prefix), lo=start)
+            matches = [(self._entries[key][0], key, self._entries[key][1]) for key in self._keys[start:end]]
+        matches.sort(key=lambda match: (-match[2], match[1]))
+        return matches[:limit]
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and self._clock() - self._loaded_at < self.refresh_interval
+
+
+city_dictionary = CityDictionary()
@@ -0,0 +1,255 @@
+"""Response compression middleware with Accept-Encoding negotiation.
+
+gzip is always available. Brotli (`brotli` package) and zstd (`zstandard`
+package) are used when installed and accepted by the client.
+"""
+import gzip
+import zlib
+from typing import Dict, Optional, Sequence
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+# Content types that are already compressed or must not be buffered
+_SKIP_CONTENT_TYPE_PREFIXES = (
+    "image/",
+    "video/",
+    "audio/",
+    "text/event-stream",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+)
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class Codec:
+    """A content-coding with one-shot and streaming compression."""
+
+    def __init__(self, name: str, level: int):
+        self.name = name
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a complete body."""
+        if self.name == "br":
+            return brotli.compress(data, quality=self.level)
+        if self.name == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self):
+        """Return an incremental compressor flushing after every chunk."""
+        if self.name == "br":
+            return _BrotliStream(self.level)
+        if self.name == "zstd":
+            return _ZstdStream(self.level)
+        return _GzipStream(self.level)
+
+
+def available_encodings() -> list[str]:
+    """Content-codings supported by the installed libraries, best first."""
+    encodings = []
+    if brotli is not None:
+        encodings.append("br")
+    if zstandard is not None:
+        encodings.append("zstd")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, supported: Sequence[str]) -> Optional[str]:
+    """Pick the content-coding for an `Accept-Encoding` header value.
+
+    The client's q-values decide; ties go to the order of `supported`.
+    Returns None when nothing acceptable is supported.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[token] = weight
+
+    best: Optional[str] = None
+    best_weight = 0.0
+    for name in supported:
+        weight = weights.get(name, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
+
+
+class CompressionMiddleware:
+    """Compress HTTP responses using the best encoding the client accepts.
+
+    Bodies smaller than `minimum_size` are sent as-is. Complete bodies of at
+    least `offload_size` bytes are compressed in the threadpool so large JSON
+    lists do not block the event loop. Streaming responses are compressed
+    chunk by chunk and flushed so clients still receive bytes immediately.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        offload_size: int = 64 * 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        encodings: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+        levels = {"br": brotli_quality, "zstd": zstd_level, "gzip": gzip_level}
+        installed = available_encodings()
+        wanted = encodings if encodings is not None else installed
+        self.codecs: Dict[str, Codec] = {
+            name: Codec(name, levels[name]) for name in wanted if name in installed
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.codecs:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        name = negotiate_encoding(accept_encoding, list(self.codecs))
+        if name is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, self.codecs[name], send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request state for `CompressionMiddleware`."""
+
+    def __init__(self, middleware: CompressionMiddleware, codec: Codec, send: Send):
+        self.middleware = middleware
+        self.codec = codec
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.started = False
+        self.passthrough = False
+        self.stream = None
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until the first body chunk shows the body size
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if not self.started:
+            self.started = True
+            await self._send_first(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+
+        more_body = message.get("more_body", False)
+        data = self.stream.chunk(message.get("body", b""))
+        if not more_body:
+            data += self.stream.finish()
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_first(self, message: Message) -> None:
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start_message["headers"])
+
+        content_type = headers.get("content-type", "")
+        skip = (
+            "content-encoding" in headers
+            or content_type.startswith(_SKIP_CONTENT_TYPE_PREFIXES)
+            or (not more_body and len(body) < self.middleware.minimum_size)
+        )
+        if skip:
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.codec.name
+        headers.add_vary_header("Accept-Encoding")
+
+        if not more_body:
+            if len(body) >= self.middleware.offload_size:
+                compressed = await run_in_threadpool(self.codec.compress, body)
+            else:
+                compressed = self.codec.compress(body)
+            headers["Content-Length"] = str(len(compressed))
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": compressed})
+            return
+
+        if "content-length" in headers:
+            del headers["Content-Length"]
+        self.stream = self.codec.stream()
+        await self._send(self.start_message)
+        await self._send(
+            {"type": "http.response.body", "body": self.stream.chunk(body), "more_body": True}
+        )
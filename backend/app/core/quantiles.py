@@ -0,0 +1,124 @@
+"""Mergeable streaming quantile sketch with relative-error guarantees.
+
+A DDSketch-style histogram: positive values fall into logarithmic buckets
+`ceil(log(value) / log(gamma))`, so any quantile is reported within
+`relative_accuracy` of the true value (1% by default) using a few hundred
+buckets for anything from a second to a year. Sketches built on different
+workers or days merge exactly by adding bucket counts, which is what lets
+them be persisted and combined per report type and day.
+"""
+import json
+import math
+from typing import Dict, Optional
+
+
+class QuantileSketch:
+    """Streaming quantile estimator for non-negative values."""
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Record `value` (negative values count as zero) `weight` times."""
+        value = max(0.0, float(value))
+        if value == 0.0:
+            self.zero_count += weight
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + weight
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        self.count += weight
+        self.sum += value * weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add every observation of `other` into this sketch; returns self."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return self
+        for key, weight in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + weight
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the `q`-quantile (0 ≤ q ≤ 1); None for an empty sketch."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+        # Nearest-rank definition: the smallest value with at least q of the data at or below it
+        rank = max(1, math.ceil(q * self.count))
+        seen = self.zero_count
+        if seen >= rank:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen >= rank:
+                # Bucket midpoint in relative terms: within relative_accuracy of any value in it
+                estimate = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_json(self) -> str:
+        """Compact JSON form, as stored in `szkice_opoznien`."""
+        return json.dumps(
+            {
+                "a": self.relative_accuracy,
+                "z": self.zero_count,
+                "n": self.count,
+                "s": self.sum,
+                "lo": self.min,
+                "hi": self.max,
+                "b": sorted(self.buckets.items()),
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, raw: str, max_buckets: int = 2048) -> "QuantileSketch":
+        data = json.loads(raw)
+        sketch = cls(relative_accuracy=data["a"], max_buckets=max_buckets)
+        sketch.zero_count = data["z"]
+        sketch.count = data["n"]
+        sketch.sum = data["s"]
+        sketch.min = data["lo"]
+        sketch.max = data["hi"]
+        sketch.buckets = {int(key): weight for key, weight in data["b"]}
+        return sketch
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together to stay within `max_buckets`.
+
+        Only the smallest values lose accuracy, which for latencies are the
+        sub-second outliers nobody reads percentiles for.
+        """
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.buckets[target] += self.buckets.pop(key)
@@ -0,0 +1,261 @@
+"""In-process candidate index for volunteer report recommendations.
+
+Open reports are kept in memory, bucketed by city, with just the features
+the ranking needs. ReportService keeps the index current as reports are
+created, claimed, released, completed or deleted; a periodic full reload
+picks up changes made by other workers.
+"""
+import heapq
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.core.cities import normalize_city
+from app.core.timeutil import as_utc
+
+# Score weights (a perfect match scores 2.4)
+CITY_WEIGHT = 1.0
+TYPE_WEIGHT = 0.6
+WAIT_WEIGHT = 0.5
+AGE_WEIGHT = 0.3
+# Waiting longer than this no longer raises the score
+WAIT_SATURATION_HOURS = 72
+# Reporter ages mapped onto 0..1 for the age component
+AGE_FLOOR, AGE_CEILING = 60, 90
+# Oldest reports per other city considered when the volunteer's own city is short
+FALLBACK_PER_CITY = 20
+# Volunteers whose completed-type history is kept in memory
+HISTORY_CACHE_SIZE = 10_000
+
+REASON_SAME_CITY = "same_city"
+REASON_FAMILIAR_TYPE = "familiar_type"
+REASON_LONG_WAIT = "long_wait"
+REASON_SENIOR_REPORTER = "senior_reporter"
+
+
+def city_key(city: Optional[str]) -> str:
+    """City bucket key (see `normalize_city`); empty when unknown."""
+    return normalize_city(city) or ""
+
+
+class Candidate(NamedTuple):
+    id: int
+    city_key: str
+    report_type_id: int
+    reported_at: datetime
+    age: Optional[int]
+
+
+class Recommendation(NamedTuple):
+    report_id: int
+    score: float
+    reasons: List[str]
+
+
+class RecommendationIndex:
+    """Open-report candidates grouped by city, updated incrementally."""
+
+    def __init__(
+        self,
+        refresh_interval: float = settings.RECOMMENDATION_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Held for the whole reload so only one thread queries the database
+        self._reload_lock = threading.Lock()
+        # Changes made while a reload is building its maps, replayed before the swap
+        self._journal: Optional[List[Tuple[str, object]]] = None
+        self._by_city: Dict[str, Dict[int, Candidate]] = {}
+        self._city_of: Dict[int, str] = {}
+        self._histories: "OrderedDict[str, Counter]" = OrderedDict()
+        self._loaded_at: Optional[float] = None
+        self.stats = {"reloads": 0, "added": 0, "removed": 0, "history_loads": 0}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_city.clear()
+            self._city_of.clear()
+            self._histories.clear()
+            self._loaded_at = None
+
+    def __len__(self) -> int:
+        return len(self._city_of)
+
+    def ensure_loaded(self, loader: Callable[[], Iterable[Candidate]]) -> None:
+        """(Re)build the index from `loader` when empty or older than the refresh interval.
+
+        The query and sort run outside `_lock`, so `add`, `discard` and
+        `record_completion` are never held up by a reload; what they change
+        meanwhile is replayed onto the new maps before they are swapped in.
+        While one thread reloads, others keep using the current index (or
+        wait, if there is none yet).
+        """
+        with self._lock:
+            if self._is_fresh():
+                return
+            first_load = self._loaded_at is None
+        if not self._reload_lock.acquire(blocking=first_load):
+            return
+        try:
+            with self._lock:
+                if self._is_fresh():
+                    return
+                self._journal = []
+            by_city: Dict[str, Dict[int, Candidate]] = {}
+            city_of: Dict[int, str] = {}
+            for candidate in sorted(loader(), key=lambda item: (item.reported_at, item.id)):
+                candidate = candidate._replace(reported_at=as_utc(candidate.reported_at))
+                by_city.setdefault(candidate.city_key, {})[candidate.id] = candidate
+                city_of[candidate.id] = candidate.city_key
+            with self._lock:
+                for action, value in self._journal:
+                    _remove(by_city, city_of, value.id if action == "add" else value)
+                    if action == "add":
+                        _insert(by_city, city_of, value)
+                self._by_city, self._city_of = by_city, city_of
+                self._loaded_at = self._clock()
+                self.stats["reloads"] += 1
+        finally:
+            with self._lock:
+                self._journal = None
+            self._reload_lock.release()
+
+    def add(self, candidate: Candidate) -> None:
+        """Insert or refresh an open report (no-op until the index is loaded)."""
+        candidate = candidate._replace(reported_at=as_utc(candidate.reported_at))
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("add", candidate))
+            if self._loaded_at is None:
+                return
+            _remove(self._by_city, self._city_of, candidate.id)
+            _insert(self._by_city, self._city_of, candidate)
+            self.stats["added"] += 1
+
+    def discard(self, report_id: int) -> None:
+        """Drop a report that is no longer open."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(("discard", report_id))
+            if _remove(self._by_city, self._city_of, report_id):
+                self.stats["removed"] += 1
+
+    def record_completion(self, email: str, report_type_id: int) -> None:
+        """Count a completed report towards the volunteer's type history."""
+        with self._lock:
+            history = self._histories.get(email)
+            if history is not None:
+                history[report_type_id] += 1
+
+    def type_history(self, email: str, loader: Callable[[], Dict[int, int]]) -> Counter:
+        """Completed reports per type for `email`, loaded once and kept up to date."""
+        with self._lock:
+            history = self._histories.get(email)
+            if history is not None:
+                self._histories.move_to_end(email)
+                return Counter(history)
+        loaded = Counter(loader())
+        with self._lock:
+            self._histories.setdefault(email, loaded)
+            self._histories.move_to_end(email)
+            while len(self._histories) > HISTORY_CACHE_SIZE:
+                self._histories.popitem(last=False)
+            self.stats["history_loads"] += 1
+            return Counter(self._histories[email])
+
+    def rank(
+        self,
+        city: Optional[str],
+        history: Counter,
+        limit: int,
+        now: Optional[datetime] = None,
+    ) -> List[Recommendation]:
+        """Top `limit` open reports for a volunteer, best first.
+
+        Every report in the volunteer's city is scored. Other cities only
+        contribute their `FALLBACK_PER_CITY` longest-waiting reports, so the
+        number of scored candidates stays bounded by the local count.
+        """
+        now = now or datetime.now(timezone.utc)
+        home = city_key(city)
+        total_completed = sum(history.values())
+        with self._lock:
+            candidates: List[Candidate] = list(self._by_city.get(home, {}).values()) if home else []
+            if len(candidates) < limit:
+                for key, bucket in self._by_city.items():
+                    if key == home:
+                        continue
+                    # Buckets are not kept in waiting order (released reports are re-added last)
+                    candidates.extend(
+                        heapq.nsmallest(
+                            FALLBACK_PER_CITY,
+                            bucket.values(),
+                            key=lambda candidate: (candidate.reported_at, candidate.id),
+                        )
+                    )
+
+        scored = (
+            self._score(candidate, home, history, total_completed, now) for candidate in candidates
+        )
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item.score, item.report_id))
+        return best
+
+    @staticmethod
+    def _score(
+        candidate: Candidate,
+        home: str,
+        history: Counter,
+        total_completed: int,
+        now: datetime,
+    ) -> Recommendation:
+        reasons = []
+        score = 0.0
+        if home and candidate.city_key == home:
+            score += CITY_WEIGHT
+            reasons.append(REASON_SAME_CITY)
+        if total_completed and history.get(candidate.report_type_id):
+            score += TYPE_WEIGHT * history[candidate.report_type_id] / total_completed
+            reasons.append(REASON_FAMILIAR_TYPE)
+        wait_hours = max(0.0, (now - candidate.reported_at).total_seconds() / 3600)
+        wait = min(1.0, wait_hours / WAIT_SATURATION_HOURS)
+        score += WAIT_WEIGHT * wait
+        if wait >= 0.5:
+            reasons.append(REASON_LONG_WAIT)
+        if candidate.age is not None and candidate.age > AGE_FLOOR:
+            score += AGE_WEIGHT * min(1.0, (candidate.age - AGE_FLOOR) / (AGE_CEILING - AGE_FLOOR))
+            reasons.append(REASON_SENIOR_REPORTER)
+        return Recommendation(candidate.id, round(score, 4), reasons)
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and self._clock() - self._loaded_at < self.refresh_interval
+
+
+def _insert(by_city: Dict[str, Dict[int, Candidate]], city_of: Dict[int, str], candidate: Candidate) -> None:
+    by_city.setdefault(candidate.city_key, {})[candidate.id] = candidate
+    city_of[candidate.id] = candidate.city_key
+
+
+def _remove(by_city: Dict[str, Dict[int, Candidate]], city_of: Dict[int, str], report_id: int) -> bool:
+    key = city_of.pop(report_id, None)
+    if key is None:
+        return False
+    bucket = by_city.get(key)
+    if bucket is not None:
+        bucket.pop(report_id, None)
+        if not bucket:
+            del by_city[key]
+    return True
+
+
+def candidate_from_row(row: Tuple) -> Candidate:
+    """Build a candidate from `(id, city, report_type_id, reported_at, age)`."""
+    report_id, city, report_type_id, reported_at, age = row
+    return Candidate(report_id, city_key(city), report_type_id, reported_at, age)
+
+
+recommendation_index = RecommendationIndex()
@@ -0,0 +1,269 @@
+"""In-process scheduler for periodic maintenance jobs.
+
+Jobs use five-field cron expressions (`minute hour day month weekday`,
+weekday 0 = Sunday) evaluated in `SCHEDULER_TIMEZONE`. Every worker runs the
+scheduler, but each scheduled slot is claimed with a compare-and-set on the
+job's row in `zadania_cykliczne`, so exactly one worker executes it. Slots
+missed while no worker was running are caught up once on the next start.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.timeutil import as_utc
+from app.db.database import SessionLocal
+from app.db.models import ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# How far ahead `next_after` searches before declaring an expression unsatisfiable
+_MAX_SEARCH_DAYS = 366 * 5
+
+
+class CronSchedule:
+    """Parsed cron expression; supports `*`, lists, ranges, steps and @aliases."""
+
+    def __init__(self, expression: str, tz: str = "UTC"):
+        self.expression = expression
+        self.tz = ZoneInfo(tz)
+        fields = _ALIASES.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        parsed = [self._parse_field(text, *bounds) for text, bounds in zip(fields, _FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        # Standard cron: when both day fields are restricted, either may match
+        self._days_restricted = fields[2] != "*"
+        self._weekdays_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(text: str, low: int, high: int) -> List[int]:
+        values: Set[int] = set()
+        for part in text.split(","):
+            base, _, step_text = part.partition("/")
+            step = int(step_text) if step_text else 1
+            if base == "*":
+                start, end = low, high
+            elif "-" in base:
+                start, end = (int(value) for value in base.split("-", 1))
+            else:
+                start = int(base)
+                end = high if step_text else start
+            if not (low <= start <= end <= high) or step < 1:
+                raise ValueError(f"Invalid cron field '{text}'")
+            values.update(range(start, end + 1, step))
+        return sorted(values)
+
+    def _day_matches(self, day: date) -> bool:
+        if day.month not in self.months:
+            return False
+        day_ok = day.day in self.days
+        weekday_ok = (day.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after `moment`, as an aware UTC datetime."""
+        local = as_utc(moment).astimezone(self.tz).replace(tzinfo=None)
+        start = local.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for offset in range(_MAX_SEARCH_DAYS):
+            day = start.date() + timedelta(days=offset)
+            if not self._day_matches(day):
+                continue
+            for hour in self.hours:
+                if offset == 0 and hour < start.hour:
+                    continue
+                for minute in self.minutes:
+                    if offset == 0 and hour == start.hour and minute < start.minute:
+                        continue
+                    candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=self.tz)
+                    return candidate.astimezone(timezone.utc)
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
+
+
+@dataclass
+class Job:
+    name: str
+    schedule: CronSchedule
+    func: Callable[[Session], Any]
+    description: str = ""
+
+
+class Scheduler:
+    """Run registered jobs on their cron schedules with a per-slot DB claim."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        poll_interval: float = settings.SCHEDULER_POLL_SECONDS,
+        tz: str = settings.SCHEDULER_TIMEZONE,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+        owner: Optional[str] = None,
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.tz = tz
+        self._clock = clock
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}"
+        self._jobs: Dict[str, Job] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.local_runs = 0
+        self.lost_claims = 0
+
+    def register(self, name: str, schedule: str, func: Callable[[Session], Any], description: str = "") -> Job:
+        """Add a job; `func(db)` runs in a worker thread and may return a short summary."""
+        job = Job(name, CronSchedule(schedule, self.tz), func, description)
+        self._jobs[name] = job
+        return job
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    async def start(self) -> None:
+        if self._task is None and self._jobs:
+            self._task = asyncio.create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_pending(self) -> List[str]:
+        """Run every job whose next slot is due and that this worker claims."""
+        ran = []
+        for job in self.jobs:
+            slot = await run_in_threadpool(self._claim_due_slot, job)
+            if slot is None:
+                continue
+            await run_in_threadpool(self._execute, job, slot)
+            ran.append(job.name)
+        return ran
+
+    def stats(self) -> List[dict]:
+        """Cluster-wide run metrics per job (from `zadania_cykliczne`)."""
+        with self.session_factory() as db:
+            rows = {row.name: row for row in db.query(ScheduledJob)}
+        result = []
+        for job in self.jobs:
+            row = rows.get(job.name)
+            last_slot = as_utc(row.last_slot) if row and row.last_slot else None
+            result.append(
+                {
+                    "name": job.name,
+                    "description": job.description,
+                    "schedule": job.schedule.expression,
+                    "next_run_at": job.schedule.next_after(last_slot or self._clock()),
+                    "last_slot": last_slot,
+                    "last_started_at": row.last_started_at if row else None,
+                    "last_finished_at": row.last_finished_at if row else None,
+                    "last_duration_ms": row.last_duration_ms if row else None,
+                    "last_status": row.last_status if row else None,
+                    "last_result": row.last_result if row else None,
+                    "last_error": row.last_error if row else None,
+                    "last_owner": row.owner if row else None,
+                    "run_count": row.run_count if row else 0,
+                    "failure_count": row.failure_count if row else 0,
+                }
+            )
+        return result
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.run_pending()
+            except Exception:
+                logger.exception("Scheduler tick failed")
+            await asyncio.sleep(self.poll_interval)
+
+    def _claim_due_slot(self, job: Job) -> Optional[datetime]:
+        """Claim the job's due slot for this worker; None if not due or taken."""
+        now = self._clock()
+        with self.session_factory() as db:
+            row = db.get(ScheduledJob, job.name)
+            if row is None:
+                # First sighting: start counting slots from now, nothing is overdue
+                db.add(ScheduledJob(name=job.name, last_slot=now, run_count=0, failure_count=0))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    db.rollback()
+                return None
+            previous = as_utc(row.last_slot)
+            slot = job.schedule.next_after(previous)
+            if slot > now:
+                return None
+            # Catch up at most once: claim the latest missed slot
+            following = job.schedule.next_after(slot)
+            while following <= now:
+                slot, following = following, job.schedule.next_after(following)
+            claimed = db.execute(
+                update(ScheduledJob)
+                .where(ScheduledJob.name == job.name, ScheduledJob.last_slot == row.last_slot)
+                .values(last_slot=slot, owner=self.owner, last_started_at=now, last_status="running")
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        if claimed != 1:
+            self.lost_claims += 1
+            return None
+        return slot
+
+    def _execute(self, job: Job, slot: datetime) -> None:
+        started = time.perf_counter()
+        status, result, error = "ok", None, None
+        try:
+            with self.session_factory() as db:
+                outcome = job.func(db)
+            result = None if outcome is None else str(outcome)[:500]
+        except Exception as exc:
+            logger.exception("Scheduled job %s failed", job.name)
+            status, error = "failed", f"{type(exc).__name__}: {exc}"[:2000]
+        duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        self.local_runs += 1
+        with self.session_factory() as db:
+            db.execute(
+                update(ScheduledJob)
+                .where(ScheduledJob.name == job.name)
+                .values(
+                    last_finished_at=self._clock(),
+                    last_duration_ms=duration_ms,
+                    last_status=status,
+                    last_result=result,
+                    last_error=error,
+                    run_count=ScheduledJob.run_count + 1,
+                    failure_count=ScheduledJob.failure_count + (1 if error else 0),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        logger.info("Scheduled job %s (%s slot) %s in %.1f ms", job.name, slot.isoformat(), status, duration_ms)
+
+
+scheduler = Scheduler()
@@ -117,3 +117,13 @@ async def get_current_account(
         raise credentials_exception
 
     return account
+
+
+async def get_current_admin(current_account: Account = Depends(get_current_account)) -> Account:
+    """Require an account listed in `ADMIN_EMAILS`."""
+    if current_account.email.lower() not in settings.admin_emails_list:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator access required",
+        )
+    return current_account
@@ -0,0 +1,12 @@
+"""Timezone helpers for timestamps read back from or bound to the database."""
+from datetime import datetime, timezone
+
+
+def as_utc(moment: datetime) -> datetime:
+    """The same instant in UTC; naive timestamps are taken to be UTC already.
+
+    Every timestamp is stored in UTC and SQLite hands them back without an
+    offset; values with another offset are converted, since SQLite binds
+    drop the offset rather than converting it.
+    """
+    return moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
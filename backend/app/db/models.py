@@ -1,8 +1,9 @@
 """SQLAlchemy database models."""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Float, ForeignKey, Index, Text, desc
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 
+from app.core.cities import normalize_city
 from app.db.database import Base
 
 
@@ -38,6 +39,18 @@ class ReportType(Base):
 class Account(Base):
     """User account."""
     __tablename__ = "konta"
+    __table_args__ = (
+        # Leaderboards read these in order and count the rows above a score to rank
+        Index("ix_konta_genpoints", desc("genpoints"), "login_email"),
+        Index("ix_konta_miejscowosc_klucz_genpoints", "miejscowosc_klucz", desc("genpoints"), "login_email"),
+        Index("ix_konta_ten_rok", desc("rozwiazane_sprawy_ten_rok"), "login_email"),
+        Index(
+            "ix_konta_miejscowosc_klucz_ten_rok",
+            "miejscowosc_klucz",
+            desc("rozwiazane_sprawy_ten_rok"),
+            "login_email",
+        ),
+    )
     
     email = Column("login_email", String, primary_key=True, index=True)
     
@@ -47,6 +60,10 @@ class Account(Base):
     is_active = Column(Boolean, default=False, nullable=False)
     
     city = Column("miejscowosc", String, nullable=True)
+    # normalize_city(city), kept in sync by `_sync_city_key`
+    city_key = Column("miejscowosc_klucz", String, nullable=True, index=True)
+    latitude = Column("szerokosc_geo", Float, nullable=True)
+    longitude = Column("dlugosc_geo", Float, nullable=True)
     
     resolved_cases = Column("rozwiazane_sprawy", Integer, default=0, nullable=False)
     resolved_cases_this_year = Column("rozwiazane_sprawy_ten_rok", Integer, default=0, nullable=False)
@@ -79,6 +96,11 @@ class Account(Base):
         passive_deletes=True,
     )
     
+    @validates("city")
+    def _sync_city_key(self, key, value):
+        self.city_key = normalize_city(value)
+        return value
+
     def __repr__(self):
         return f"<Account(email='{self.email}', full_name='{self.full_name}')>"
 
@@ -86,6 +108,12 @@ class Account(Base):
 class Report(Base):
     """Problem report."""
     __tablename__ = "zgloszenia"
+    __table_args__ = (
+        # Bounding-box search on databases without the SQLite R*Tree (app.db.spatial)
+        Index("ix_zgloszenia_geo", "szerokosc_geo", "dlugosc_geo").ddl_if(
+            callable_=lambda ddl, target, bind, dialect, **kw: dialect.name != "sqlite"
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     
@@ -95,6 +123,10 @@ class Report(Base):
     age = Column("wiek", Integer, nullable=False)
     address = Column("adres", String, nullable=False)
     city = Column("miejscowosc", String, nullable=False)
+    # normalize_city(city), kept in sync by `_sync_city_key`
+    city_key = Column("miejscowosc_klucz", String, nullable=True, index=True)
+    latitude = Column("szerokosc_geo", Float, nullable=True)
+    longitude = Column("dlugosc_geo", Float, nullable=True)
     problem = Column(Text, nullable=False)
     
     # Contact & Status
@@ -113,11 +145,13 @@ class Report(Base):
     report_details = Column("zgloszenie_szczegoly", Text, nullable=True)  # JSON or detailed text
     reported_at = Column("data_zgloszenia", DateTime(timezone=True), server_default=func.now(), nullable=False)
     accepted_at = Column(DateTime(timezone=True), nullable=True)
-    completed_at = Column(DateTime(timezone=True), nullable=True)
+    # Archiver finds reports completed before its cutoff through this index
+    completed_at = Column(DateTime(timezone=True), nullable=True, index=True)
     completed_by_email = Column(
         String,
         ForeignKey("konta.login_email", use_alter=True, name="fk_completed_by", ondelete="SET NULL"),
         nullable=True,
+        index=True,  # volunteer history lookups
     )
     
     # Relationships
@@ -129,5 +163,145 @@ class Report(Base):
         passive_deletes=True,
     )
     
+    @validates("city")
+    def _sync_city_key(self, key, value):
+        self.city_key = normalize_city(value)
+        return value
+
     def __repr__(self):
         return f"<Report(id={self.id}, problem='{self.problem[:30]}...')>"
+
+
+class ArchivedReport(Base):
+    """Completed report moved out of `zgloszenia` by the archiver (same columns and ids)."""
+    __tablename__ = "zgloszenia_archiwum"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+
+    full_name = Column("imie_nazwisko", String, nullable=False)
+    phone = Column("nr_tel", String(9), nullable=False)
+    age = Column("wiek", Integer, nullable=False)
+    address = Column("adres", String, nullable=False)
+    city = Column("miejscowosc", String, nullable=False)
+    city_key = Column("miejscowosc_klucz", String, nullable=True, index=True)
+    latitude = Column("szerokosc_geo", Float, nullable=True)
+    longitude = Column("dlugosc_geo", Float, nullable=True)
+    problem = Column(Text, nullable=False)
+
+    contact_ok = Column("czy_do_kontaktu", Boolean, nullable=False)
+    is_reviewed = Column(Boolean, nullable=False)
+
+    report_type_id = Column("typ_zgloszenia_id", Integer, nullable=False, index=True)
+    reporter_email = Column(String, nullable=True)
+
+    report_details = Column("zgloszenie_szczegoly", Text, nullable=True)
+    reported_at = Column("data_zgloszenia", DateTime(timezone=True), nullable=False)
+    accepted_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    completed_by_email = Column(String, nullable=True, index=True)
+    archived_at = Column("data_archiwizacji", DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ArchivedReport(id={self.id}, completed_at={self.completed_at})>"
+
+
+class ChatMessage(Base):
+    """Chat message exchanged in the room bound to a report."""
+    __tablename__ = "wiadomosci"
+    __table_args__ = (
+        # History is paged newest-first per report with an (created_at, id) cursor
+        Index("ix_wiadomosci_zgloszenie_created", "zgloszenie_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # No foreign key: the report may have moved to `zgloszenia_archiwum`
+    # (ReportService.delete_report removes the messages itself)
+    report_id = Column("zgloszenie_id", Integer, nullable=False)
+    sender_email = Column(
+        String,
+        ForeignKey("konta.login_email", name="fk_wiadomosci_konta", ondelete="SET NULL"),
+        nullable=True,
+    )
+    sender_name = Column(String, nullable=False)
+    content = Column("tresc", Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ChatMessage(id={self.id}, report_id={self.report_id})>"
+
+
+class ScheduledJob(Base):
+    """Claim and run metrics of a periodic job (see app.core.scheduler)."""
+    __tablename__ = "zadania_cykliczne"
+
+    name = Column("nazwa", String, primary_key=True)
+    # Latest schedule slot claimed; the compare-and-set on it elects the runner
+    last_slot = Column(DateTime(timezone=True), nullable=False)
+    owner = Column("wykonawca", String, nullable=True)
+    last_started_at = Column(DateTime(timezone=True), nullable=True)
+    last_finished_at = Column(DateTime(timezone=True), nullable=True)
+    last_duration_ms = Column(Float, nullable=True)
+    last_status = Column(String, nullable=True)
+    last_result = Column(Text, nullable=True)
+    last_error = Column(Text, nullable=True)
+    run_count = Column(Integer, default=0, nullable=False)
+    failure_count = Column(Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<ScheduledJob(name='{self.name}', last_status='{self.last_status}')>"
+
+
+class JobProgress(Base):
+    """Resumable cursor of a long-running batched job (e.g. the PII purge)."""
+    __tablename__ = "postep_zadan"
+
+    name = Column("nazwa", String, primary_key=True)
+    cursor = Column("kursor", Text, nullable=True)  # JSON keyset position
+    processed = Column("przetworzone", Integer, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<JobProgress(name='{self.name}', processed={self.processed})>"
+
+
+class ReportDailyStats(Base):
+    """Per-day report lifecycle counters by type and city (analytics rollup).
+
+    Each event counts on its own UTC day: `created` on the day reported,
+    `accepted` on the day first accepted and `completed` on the day
+    completed. The seconds sums hold the time since `reported_at` of the
+    counted reports, so averages are `sum / count`.
+    """
+    __tablename__ = "statystyki_dzienne"
+
+    day = Column("dzien", Date, primary_key=True)
+    report_type_id = Column("typ_zgloszenia_id", Integer, primary_key=True)
+    city_key = Column("miejscowosc_klucz", String, primary_key=True, default="")  # "" = no city
+    created = Column("utworzone", Integer, default=0, nullable=False)
+    accepted = Column("przyjete", Integer, default=0, nullable=False)
+    completed = Column("zakonczone", Integer, default=0, nullable=False)
+    accept_seconds = Column("suma_czasu_przyjecia_s", Float, default=0.0, nullable=False)
+    complete_seconds = Column("suma_czasu_realizacji_s", Float, default=0.0, nullable=False)
+
+    def __repr__(self):
+        return f"<ReportDailyStats(day={self.day}, type={self.report_type_id}, city='{self.city_key}')>"
+
+
+class LatencySketch(Base):
+    """Persisted quantile sketch of report response times (app.core.quantiles).
+
+    One row per metric ("accept" / "complete"), report type (0 = all types)
+    and period ("all" or a UTC day, YYYY-MM-DD). Workers merge their
+    buffered observations in with a compare-and-set on `version`.
+    """
+    __tablename__ = "szkice_opoznien"
+
+    metric = Column("metryka", String, primary_key=True)
+    report_type_id = Column("typ_zgloszenia_id", Integer, primary_key=True)
+    period = Column("okres", String, primary_key=True)
+    sketch = Column("szkic", Text, nullable=False)  # QuantileSketch.to_json()
+    version = Column("wersja", Integer, default=0, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<LatencySketch(metric='{self.metric}', type={self.report_type_id}, period='{self.period}')>"
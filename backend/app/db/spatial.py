@@ -0,0 +1,109 @@
+"""Spatial index for nearby-report search.
+
+On SQLite open reports with coordinates are mirrored into an R*Tree virtual
+table kept in sync by triggers, so a bounding-box lookup touches only the
+matching rows. Completed reports leave the index. Other databases fall back
+to the `ix_zgloszenia_geo` (latitude, longitude) B-tree index on the table.
+"""
+import math
+from typing import Tuple
+
+from sqlalchemy import column, event, table
+
+from app.db.models import Report
+
+REPORT_GEO_RTREE = "zgloszenia_geo"
+
+report_geo_rtree = table(
+    REPORT_GEO_RTREE,
+    column("id"),
+    column("min_lat"),
+    column("max_lat"),
+    column("min_lon"),
+    column("max_lon"),
+)
+
+_OPEN_WITH_LOCATION = (
+    "new.szerokosc_geo IS NOT NULL AND new.dlugosc_geo IS NOT NULL AND new.completed_at IS NULL"
+)
+
+REPORT_GEO_RTREE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {REPORT_GEO_RTREE} "
+    "USING rtree(id, min_lat, max_lat, min_lon, max_lon)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {REPORT_GEO_RTREE}_ai AFTER INSERT ON zgloszenia
+    WHEN {_OPEN_WITH_LOCATION}
+    BEGIN
+        INSERT INTO {REPORT_GEO_RTREE}
+        VALUES (new.id, new.szerokosc_geo, new.szerokosc_geo, new.dlugosc_geo, new.dlugosc_geo);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {REPORT_GEO_RTREE}_au
+    AFTER UPDATE OF szerokosc_geo, dlugosc_geo, completed_at ON zgloszenia
+    BEGIN
+        DELETE FROM {REPORT_GEO_RTREE} WHERE id = old.id;
+        INSERT INTO {REPORT_GEO_RTREE}
+        SELECT new.id, new.szerokosc_geo, new.szerokosc_geo, new.dlugosc_geo, new.dlugosc_geo
+        WHERE {_OPEN_WITH_LOCATION};
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {REPORT_GEO_RTREE}_ad AFTER DELETE ON zgloszenia
+    BEGIN
+        DELETE FROM {REPORT_GEO_RTREE} WHERE id = old.id;
+    END
+    """,
+)
+
+# Rebuilds the index from existing rows (used after creation and by migrations)
+REPORT_GEO_RTREE_BACKFILL = (
+    f"INSERT OR REPLACE INTO {REPORT_GEO_RTREE} "
+    "SELECT id, szerokosc_geo, szerokosc_geo, dlugosc_geo, dlugosc_geo FROM zgloszenia "
+    "WHERE szerokosc_geo IS NOT NULL AND dlugosc_geo IS NOT NULL AND completed_at IS NULL"
+)
+
+EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEGREE_LAT = 111.32
+
+
+@event.listens_for(Report.__table__, "after_create")
+def _create_report_geo_rtree(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    # A fresh `zgloszenia` invalidates whatever an older R*Tree still holds
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {REPORT_GEO_RTREE}")
+    for statement in REPORT_GEO_RTREE_DDL:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql(REPORT_GEO_RTREE_BACKFILL)
+
+
+@event.listens_for(Report.__table__, "after_drop")
+def _drop_report_geo_rtree(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {REPORT_GEO_RTREE}")
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """Return (min_lat, max_lat, min_lon, max_lon) enclosing the search circle."""
+    delta_lat = radius_km / _KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6 or abs(latitude) + delta_lat >= 90:
+        delta_lon = 180.0
+    else:
+        delta_lon = min(180.0, radius_km / (_KM_PER_DEGREE_LAT * cos_lat))
+    return (
+        max(-90.0, latitude - delta_lat),
+        min(90.0, latitude + delta_lat),
+        max(-180.0, longitude - delta_lon),
+        min(180.0, longitude + delta_lon),
+    )
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
@@ -8,8 +8,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, RedirectResponse
 
 from app.config import settings
+from app.core.compression import CompressionMiddleware
 from app.db.database import engine, Base, SessionLocal
 from app.api.v1.router import api_router
+from app.api.v1.endpoints.websocket.manager import manager as ws_manager
+from app.core.scheduler import scheduler
+from app.services.chat_service import chat_writer
+from app.services.latency_service import latency_recorder
+from app.services.maintenance_service import register_default_jobs
 from app.services.type_service import ReportTypeService
 
 # Configure logging
@@ -22,6 +28,9 @@ logger = logging.getLogger(__name__)
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Periodic maintenance (yearly counter reset, DB statistics, log pruning)
+register_default_jobs(scheduler)
+
 # Lifespan handler for startup/shutdown logging
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -35,9 +44,24 @@ async def lifespan(app: FastAPI):
     except Exception as exc:  # pragma: no cover - startup failures halt the app
         logger.exception("Failed to seed default report categories: %s", exc)
         raise
+    await ws_manager.start()
+    await latency_recorder.start()
+    if settings.SCHEDULER_ENABLED:
+        await scheduler.start()
     try:
         yield
     finally:
+        # Buffered writes first; one failing step must not skip the others
+        for name, stop in (
+            ("chat writer", chat_writer.stop),
+            ("latency recorder", latency_recorder.stop),
+            ("scheduler", scheduler.stop),
+            ("WebSocket manager", ws_manager.stop),
+        ):
+            try:
+                await stop()
+            except Exception:
+                logger.exception("Failed to stop the %s", name)
         logger.info(f"Shutting down {settings.APP_NAME}")
 
 
@@ -61,6 +85,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (report lists) negotiated from Accept-Encoding
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+        encodings=settings.compression_encodings_list,
+    )
+
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
@@ -9,11 +9,26 @@ from app.schemas.account import (
     ActiveVolunteerOut,
     ActiveVolunteersResponse,
 )
+from app.schemas.account_import import (
+    AccountImportErrorOut,
+    AccountImportResultOut,
+    AccountImportRow,
+)
 from app.schemas.report import (
+    NearbyReportOut,
+    RecommendedReportOut,
+    ReportBatchOut,
     ReportCreate,
     ReportOut,
+    ReportSummaryOut,
     ReportUpdate,
 )
+from app.schemas.analytics import LatencyPercentilesOut, TimeseriesOut, TimeseriesPointOut
+from app.schemas.chat import ChatHistoryPage, ChatMessageOut
+from app.schemas.city import CitySuggestionOut
+from app.schemas.dashboard import AccountDashboardOut, DashboardCountersOut
+from app.schemas.job import ScheduledJobOut
+from app.schemas.leaderboard import LeaderboardEntryOut, LeaderboardOut, LeaderboardRankOut
 from app.schemas.report_type import (
     ReportTypeCreate,
     ReportTypeOut
@@ -24,6 +39,14 @@ __all__ = [
     "Token", "TokenPayload",
     "AccountCreate", "AccountOut", "AccountUpdate", "AccountLogin", "ActiveVolunteerOut",
     "ActiveVolunteersResponse",
-    "ReportCreate", "ReportOut", "ReportUpdate",
-    "ReportTypeCreate", "ReportTypeOut"
+    "AccountImportRow", "AccountImportErrorOut", "AccountImportResultOut",
+    "ReportCreate", "ReportOut", "ReportSummaryOut", "ReportUpdate", "NearbyReportOut",
+    "RecommendedReportOut", "ReportBatchOut",
+    "ReportTypeCreate", "ReportTypeOut",
+    "ChatMessageOut", "ChatHistoryPage",
+    "CitySuggestionOut",
+    "ScheduledJobOut",
+    "LeaderboardEntryOut", "LeaderboardOut", "LeaderboardRankOut",
+    "AccountDashboardOut", "DashboardCountersOut",
+    "TimeseriesOut", "TimeseriesPointOut", "LatencyPercentilesOut",
 ]
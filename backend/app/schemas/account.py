@@ -1,7 +1,7 @@
 """Account-related Pydantic schemas."""
 import json
 from datetime import datetime, time
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from pydantic import (
     BaseModel,
@@ -13,6 +13,9 @@ from pydantic import (
     model_validator,
 )
 
+from app.config import settings
+from app.core.cache import ParsedTextCache
+
 from .limits import (
     ACCOUNT_CITY_MAX,
     ACCOUNT_CITY_MIN,
@@ -27,6 +30,9 @@ from .limits import (
 class AvailabilitySlot(BaseModel):
     """Structured availability slot description."""
 
+    # Immutable so parsed schedules can be shared through `availability_cache`
+    model_config = ConfigDict(frozen=True)
+
     day_of_week: int = Field(..., ge=0, le=6, description="0=Monday, 6=Sunday")
     start_time: time = Field(..., description="Slot start time (HH:MM)")
     end_time: time = Field(..., description="Slot end time (HH:MM)")
@@ -80,6 +86,28 @@ def deserialize_availability(raw: Optional[str]) -> List[AvailabilitySlot]:
     return slots
 
 
+def _parse_availability_or_empty(raw: str) -> Tuple[AvailabilitySlot, ...]:
+    try:
+        return tuple(deserialize_availability(raw))
+    except ValueError:
+        return ()
+
+
+availability_cache = ParsedTextCache(_parse_availability_or_empty, max_entries=settings.AVAILABILITY_CACHE_SIZE)
+
+
+def cached_availability(raw: Optional[str]) -> Tuple[AvailabilitySlot, ...]:
+    """Parsed slots of a stored schedule, shared between callers.
+
+    Invalid JSON or slots yield an empty schedule, as everywhere the stored
+    value is read. Repeated calls with the same text cost a digest and a
+    dict lookup.
+    """
+    if not raw:
+        return ()
+    return availability_cache.get(raw)
+
+
 def is_active_now_from_slots(
     slots: List[AvailabilitySlot],
     reference: Optional[datetime] = None
@@ -108,6 +136,8 @@ class AccountBase(BaseModel):
         min_length=ACCOUNT_CITY_MIN,
         max_length=ACCOUNT_CITY_MAX,
     )
+    latitude: Optional[float] = Field(None, ge=-90, le=90, description="Home latitude (WGS84)")
+    longitude: Optional[float] = Field(None, ge=-180, le=180, description="Home longitude (WGS84)")
 
 
 class AccountCreate(AccountBase):
@@ -164,6 +194,8 @@ class AccountUpdate(BaseModel):
         min_length=ACCOUNT_CITY_MIN,
         max_length=ACCOUNT_CITY_MAX,
     )
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     availability: Optional[List[AvailabilitySlot]] = None
     password: Optional[str] = Field(
         None,
@@ -208,16 +240,13 @@ class AccountOut(AccountBase):
     def availability(self) -> List[AvailabilitySlot]:
         """Expose structured availability data."""
 
-        try:
-            return deserialize_availability(self.availability_json)
-        except ValueError:
-            return []
+        return list(cached_availability(self.availability_json))
 
     @computed_field(return_type=bool)
     def is_active_now(self) -> bool:
         """Return whether the volunteer is active right now."""
 
-        return self.is_active or is_active_now_from_slots(self.availability)
+        return self.is_active or is_active_now_from_slots(cached_availability(self.availability_json))
 
 
 class AccountLogin(BaseModel):
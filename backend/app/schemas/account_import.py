@@ -0,0 +1,34 @@
+"""Bulk volunteer import schemas."""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .account import AccountCreate, AvailabilitySlot
+
+
+class AccountImportRow(AccountCreate):
+    """One imported volunteer: registration fields plus an optional schedule."""
+
+    availability: Optional[List[AvailabilitySlot]] = Field(
+        None,
+        description="Weekly availability slots",
+    )
+
+
+class AccountImportErrorOut(BaseModel):
+    """A row that was not imported."""
+
+    row: int = Field(..., description="1-based position of the row in the file (CSV: excluding the header)")
+    email: Optional[str] = None
+    error: str
+
+
+class AccountImportResultOut(BaseModel):
+    """Outcome of a bulk import."""
+
+    total: int = Field(..., description="Rows read from the file")
+    created: int
+    failed: int
+    errors: List[AccountImportErrorOut]
+    seconds: float = Field(..., description="Wall time of the whole import")
+    rows_per_second: Optional[float] = Field(None, description="Created accounts per second")
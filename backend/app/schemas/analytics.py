@@ -0,0 +1,50 @@
+"""Report analytics schemas."""
+from datetime import date
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+AnalyticsInterval = Literal["day", "week", "month"]
+AnalyticsSplit = Literal["type", "city"]
+
+
+class TimeseriesPointOut(BaseModel):
+    """Report lifecycle volumes of one time bucket (and series, when split)."""
+
+    period_start: date = Field(..., description="First day of the bucket (weeks start on Monday)")
+    report_type_id: Optional[int] = Field(None, description="Set when split_by=type")
+    city_key: Optional[str] = Field(None, description="Normalized city, set when split_by=city")
+    created: int
+    accepted: int = Field(..., description="Reports accepted for the first time in the bucket")
+    completed: int
+    avg_accept_minutes: Optional[float] = Field(None, description="Mean submission-to-acceptance time")
+    avg_completion_minutes: Optional[float] = Field(None, description="Mean submission-to-completion time")
+
+
+class TimeseriesOut(BaseModel):
+    """Report analytics time series."""
+
+    date_from: date
+    date_to: date
+    interval: AnalyticsInterval
+    split_by: Optional[AnalyticsSplit] = None
+    points: List[TimeseriesPointOut]
+
+
+LatencyMetric = Literal["accept", "complete"]
+
+
+class LatencyPercentilesOut(BaseModel):
+    """Response-time distribution from the quantile sketches (minutes)."""
+
+    metric: LatencyMetric = Field(..., description="accept = submission to first acceptance, complete = to completion")
+    report_type_id: Optional[int] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    count: int
+    mean_minutes: Optional[float] = None
+    min_minutes: Optional[float] = None
+    p50_minutes: Optional[float] = None
+    p90_minutes: Optional[float] = None
+    p99_minutes: Optional[float] = None
+    max_minutes: Optional[float] = None
@@ -0,0 +1,26 @@
+"""Report chat schemas."""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChatMessageOut(BaseModel):
+    """Chat message as delivered to clients.
+
+    `id` is null for messages still waiting in the write buffer.
+    """
+    id: Optional[int] = None
+    report_id: int
+    sender_email: Optional[str] = None
+    sender_name: str
+    content: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChatHistoryPage(BaseModel):
+    """Newest-first page of chat history."""
+    messages: List[ChatMessageOut]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,9 @@
+"""City autocomplete schemas."""
+from pydantic import BaseModel, Field
+
+
+class CitySuggestionOut(BaseModel):
+    """City matching an autocomplete prefix."""
+    name: str = Field(..., description="Most common spelling of the city")
+    key: str = Field(..., description="Normalized key accepted by the `city` filters")
+    count: int = Field(..., description="Reports and accounts using this city")
@@ -0,0 +1,25 @@
+"""Volunteer dashboard schemas."""
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from .account import AccountOut
+from .report import ReportOut
+
+
+class DashboardCountersOut(BaseModel):
+    """Personal counters shown in the volunteer panel."""
+    genpoints: int
+    resolved_cases: int
+    resolved_cases_this_year: int
+    rank: int = Field(..., description="GenPoints leaderboard position")
+    city_rank: Optional[int] = Field(None, description="GenPoints position within the volunteer's city")
+
+
+class AccountDashboardOut(BaseModel):
+    """Everything the volunteer panel renders, in one response."""
+    account: AccountOut
+    active_report: Optional[ReportOut] = None
+    completed_reports: List[ReportOut] = Field(..., description="Most recently completed first")
+    completed_has_more: bool = Field(..., description="More completed reports are available via /reports/my-completed-reports")
+    counters: DashboardCountersOut
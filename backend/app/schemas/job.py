@@ -0,0 +1,23 @@
+"""Scheduled job schemas."""
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ScheduledJobOut(BaseModel):
+    """Schedule and latest run metrics of a periodic job."""
+    name: str
+    description: str
+    schedule: str = Field(..., description="Cron expression (minute hour day month weekday)")
+    next_run_at: datetime
+    last_slot: Optional[datetime] = Field(None, description="Latest schedule slot claimed by a worker")
+    last_started_at: Optional[datetime] = None
+    last_finished_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_status: Optional[str] = Field(None, description="running, ok or failed")
+    last_result: Optional[str] = None
+    last_error: Optional[str] = None
+    last_owner: Optional[str] = Field(None, description="Worker (host:pid) that ran the latest slot")
+    run_count: int = 0
+    failure_count: int = 0
@@ -0,0 +1,34 @@
+"""Volunteer leaderboard schemas."""
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# "all": lifetime GenPoints; "year": reports resolved this year
+LeaderboardPeriod = Literal["all", "year"]
+
+
+class LeaderboardEntryOut(BaseModel):
+    """Ranked volunteer (public, so no email); equal scores share a rank (1, 2, 2, 4)."""
+    rank: int
+    full_name: str
+    city: Optional[str] = None
+    score: int = Field(..., description="GenPoints, or reports resolved this year for period=year")
+    genpoints: int
+    resolved_cases: int
+    resolved_cases_this_year: int
+
+
+class LeaderboardOut(BaseModel):
+    """Top volunteers for a period, optionally within one city."""
+    period: LeaderboardPeriod
+    city: Optional[str] = Field(None, description="Normalized city key, when filtered")
+    entries: List[LeaderboardEntryOut]
+
+
+class LeaderboardRankOut(BaseModel):
+    """Position of a single volunteer globally and within their city."""
+    period: LeaderboardPeriod
+    score: int
+    rank: int
+    city: Optional[str] = Field(None, description="Normalized key of the volunteer's city")
+    city_rank: Optional[int] = None
@@ -13,6 +13,9 @@ ACCOUNT_CITY_MAX = 120
 PASSWORD_MIN_LENGTH = 8
 PASSWORD_MAX_LENGTH = 128
 
+# Rows accepted by one bulk volunteer import request (the CLI has no limit)
+ACCOUNT_IMPORT_MAX_ROWS = 10_000
+
 # Report payload limits
 REPORT_FULL_NAME_MIN = 2
 REPORT_FULL_NAME_MAX = 150
@@ -24,6 +27,40 @@ REPORT_PROBLEM_MIN = 5
 REPORT_PROBLEM_MAX = 1500
 REPORT_DETAILS_MAX = 4000
 
+# Characters of `problem` included in the list-view summary projection
+REPORT_PROBLEM_PREVIEW_MAX = 200
+
+# Report ids accepted by a single batch fetch
+REPORT_BATCH_MAX = 100
+
+# Report analytics time series range (days)
+ANALYTICS_RANGE_DEFAULT_DAYS = 30
+ANALYTICS_RANGE_MAX_DAYS = 731
+
+# Nearby search radius in kilometres
+GEO_NEARBY_RADIUS_DEFAULT_KM = 10
+GEO_NEARBY_RADIUS_MAX_KM = 100
+
+# Reports returned by the recommendation endpoint
+RECOMMENDATION_LIMIT_DEFAULT = 10
+RECOMMENDATION_LIMIT_MAX = 50
+
+# City autocomplete
+CITY_SUGGEST_QUERY_MAX = 120
+CITY_SUGGEST_LIMIT_MAX = 50
+
+# Leaderboard page size; pages up to the maximum are served from the cached top list
+LEADERBOARD_LIMIT_DEFAULT = 10
+LEADERBOARD_LIMIT_MAX = 100
+
+# Completed reports embedded in the volunteer dashboard
+DASHBOARD_COMPLETED_LIMIT_DEFAULT = 5
+DASHBOARD_COMPLETED_LIMIT_MAX = 50
+
+# Report chat
+CHAT_MESSAGE_MAX = 2000
+CHAT_HISTORY_PAGE_MAX = 200
+
 # Report type descriptions are displayed in UI tooltips
 REPORT_TYPE_NAME_MIN = 2
 REPORT_TYPE_NAME_MAX = 100
@@ -1,6 +1,6 @@
 """Report-related Pydantic schemas."""
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -15,6 +15,7 @@ from .limits import (
     REPORT_FULL_NAME_MIN,
     REPORT_PROBLEM_MAX,
     REPORT_PROBLEM_MIN,
+    REPORT_PROBLEM_PREVIEW_MAX,
 )
 
 
@@ -48,6 +49,8 @@ class ReportBase(BaseModel):
     )
     contact_ok: bool = Field(True, description="Can the reporter be contacted?")
     report_type_id: int = Field(..., description="ID of the report type")
+    latitude: Optional[float] = Field(None, ge=-90, le=90, description="Location latitude (WGS84)")
+    longitude: Optional[float] = Field(None, ge=-180, le=180, description="Location longitude (WGS84)")
 
     @field_validator("phone")
     @classmethod
@@ -98,6 +101,8 @@ class ReportUpdate(BaseModel):
     )
     contact_ok: Optional[bool] = None
     report_type_id: Optional[int] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     report_details: Optional[str] = Field(
         None,
         max_length=REPORT_DETAILS_MAX,
@@ -117,6 +122,52 @@ class ReportOut(ReportBase):
     completed_by_email: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class NearbyReportOut(ReportOut):
+    """Report returned by the nearby search with its distance from the origin."""
+    distance_km: float
+
+
+class RecommendedReportOut(ReportOut):
+    """Report ranked for the current volunteer."""
+    score: float = Field(..., description="Higher is a better match")
+    reasons: List[str] = Field(
+        default_factory=list,
+        description="Matched signals: same_city, familiar_type, long_wait, senior_reporter",
+    )
+
+
+class ReportBatchOut(BaseModel):
+    """Reports fetched by id list."""
+    reports: Dict[int, ReportOut] = Field(..., description="Found reports keyed by id, in request order")
+    missing: List[int] = Field(default_factory=list, description="Requested ids that do not exist")
+
+
+class ReportSummaryOut(BaseModel):
+    """Lightweight list-view projection of a report.
+
+    Carries only the columns rendered on the volunteer board; the full record
+    (phone, details, lifecycle timestamps) is served by `GET /reports/{id}`.
+    """
+    id: int
+    full_name: str
+    age: Optional[int] = None
+    address: str
+    city: str
+    report_type_id: int
+    problem_preview: str = Field(
+        ...,
+        description=f"First {REPORT_PROBLEM_PREVIEW_MAX} characters of the problem description",
+    )
+    problem_truncated: bool = False
+    contact_ok: bool
+    is_reviewed: bool
+    reported_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ReportWithDetails(ReportOut):
     """Extended schema with related and aggregated fields."""
     report_type_name: Optional[str] = None
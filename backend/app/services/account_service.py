@@ -5,17 +5,24 @@ from typing import List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
-from app.db.models import Account
+from app.db.models import Account, Report
 from app.schemas.account import (
     AccountCreate,
+    AccountOut,
     AccountUpdate,
     AvailabilitySlot,
-    deserialize_availability,
+    cached_availability,
     is_active_now_from_slots,
     serialize_availability,
 )
+from app.core.cache import ACTIVE_VOLUNTEERS_KEY, AVG_RESPONSE_TIME_KEY, public_cache
+from app.core.cities import city_dictionary
 from app.core.security import get_password_hash, verify_password
 from app.core.exceptions import UserAlreadyExistsException, InvalidCredentialsException
+from app.schemas.dashboard import AccountDashboardOut, DashboardCountersOut
+from app.schemas.report import ReportOut
+from app.services.leaderboard_service import LeaderboardService
+from app.services.report_service import ReportService
 
 
 @dataclass
@@ -44,6 +51,13 @@ class AccountService:
             return raw_json
         return "[]"
 
+    @staticmethod
+    def _invalidate_public_caches() -> None:
+        """Drop cached public payloads that depend on volunteer availability."""
+
+        public_cache.invalidate(ACTIVE_VOLUNTEERS_KEY)
+        public_cache.invalidate(AVG_RESPONSE_TIME_KEY)
+
     @staticmethod
     def get_account_by_email(db: Session, email: str) -> Optional[Account]:
         """Get account by email."""
@@ -69,6 +83,8 @@ class AccountService:
             phone=account_data.phone,
             password_hash=hashed_password,
             city=account_data.city,
+            latitude=account_data.latitude,
+            longitude=account_data.longitude,
             is_active=account_data.is_active,
             availability_json="[]",
             resolved_cases=0,
@@ -79,6 +95,8 @@ class AccountService:
         db.add(new_account)
         db.commit()
         db.refresh(new_account)
+        AccountService._invalidate_public_caches()
+        city_dictionary.observe(new_account.city)
         
         return new_account
     
@@ -108,6 +126,10 @@ class AccountService:
             account.phone = account_data.phone
         if account_data.city is not None:
             account.city = account_data.city
+        if account_data.latitude is not None:
+            account.latitude = account_data.latitude
+        if account_data.longitude is not None:
+            account.longitude = account_data.longitude
         # Only allow updating availability via structured `availability` on the
         # update endpoint. Raw JSON is no longer accepted for updates.
         if account_data.availability is not None:
@@ -122,6 +144,9 @@ class AccountService:
         
         db.commit()
         db.refresh(account)
+        AccountService._invalidate_public_caches()
+        if account_data.city is not None:
+            city_dictionary.observe(account.city)
         
         return account
     
@@ -134,6 +159,7 @@ class AccountService:
         
         db.delete(account)
         db.commit()
+        AccountService._invalidate_public_caches()
         return True
     
     @staticmethod
@@ -168,10 +194,7 @@ class AccountService:
         manual_count = 0
         schedule_count = 0
         for account in accounts:
-            try:
-                slots = deserialize_availability(account.availability_json)
-            except ValueError:
-                slots = []
+            slots = cached_availability(account.availability_json)
             schedule_active = is_active_now_from_slots(slots, moment)
             manual_active = bool(account.is_active)
             if manual_active:
@@ -182,9 +205,37 @@ class AccountService:
                 active.append(
                     VolunteerActivity(
                         account=account,
-                        availability=slots,
+                        availability=list(slots),
                         manual_active=manual_active,
                         schedule_active=schedule_active,
                     )
                 )
         return active, manual_count, schedule_count
+
+    @staticmethod
+    def get_dashboard(db: Session, account: Account, completed_limit: int = 5) -> AccountDashboardOut:
+        """Assemble the volunteer panel for an already loaded account.
+
+        Besides the account itself this costs at most one primary-key lookup
+        for the active report, one page of completed reports from the live and
+        archive tables (fetched one row long to learn whether more exist) and
+        two index-only rank counts.
+        """
+        active_report = db.get(Report, account.active_report) if account.active_report else None
+        completed = ReportService.get_completed_reports_by_volunteer(
+            db, account.email, skip=0, limit=completed_limit + 1
+        )
+        rank = LeaderboardService.get_rank(db, account, period="all")
+        return AccountDashboardOut(
+            account=AccountOut.model_validate(account),
+            active_report=ReportOut.model_validate(active_report) if active_report else None,
+            completed_reports=[ReportOut.model_validate(report) for report in completed[:completed_limit]],
+            completed_has_more=len(completed) > completed_limit,
+            counters=DashboardCountersOut(
+                genpoints=account.genpoints,
+                resolved_cases=account.resolved_cases,
+                resolved_cases_this_year=account.resolved_cases_this_year,
+                rank=rank.rank,
+                city_rank=rank.city_rank,
+            ),
+        )
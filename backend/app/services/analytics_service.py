@@ -0,0 +1,282 @@
+"""Daily report rollups (`statystyki_dzienne`) and the time series built on them."""
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Date, cast, delete, extract, func, insert, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.cities import normalize_city, prefix_upper_bound
+from app.core.timeutil import as_utc
+from app.db.models import ArchivedReport, Report, ReportDailyStats
+from app.schemas.analytics import AnalyticsInterval, AnalyticsSplit, TimeseriesOut, TimeseriesPointOut
+
+_COUNTERS = ("created", "accepted", "completed", "accept_seconds", "complete_seconds")
+_KEY_COLUMNS = ("dzien", "typ_zgloszenia_id", "miejscowosc_klucz")
+
+
+def _utc_day(moment: datetime) -> date:
+    return as_utc(moment).astimezone(timezone.utc).date()
+
+
+def _seconds_between(later: datetime, earlier: datetime) -> float:
+    return max(0.0, (as_utc(later) - as_utc(earlier)).total_seconds())
+
+
+class ReportAnalyticsService:
+    """Service maintaining and reading the report analytics rollup."""
+
+    @staticmethod
+    def record_created(db: Session, report: Report) -> None:
+        """Count a new report; call before the report's own commit."""
+        ReportAnalyticsService._apply(
+            db, _utc_day(report.reported_at), report.report_type_id, report.city_key, created=1
+        )
+
+    @staticmethod
+    def record_accepted(db: Session, report: Report) -> None:
+        """Count the first acceptance of a report and its waiting time."""
+        ReportAnalyticsService._apply(
+            db,
+            _utc_day(report.accepted_at),
+            report.report_type_id,
+            report.city_key,
+            accepted=1,
+            accept_seconds=_seconds_between(report.accepted_at, report.reported_at),
+        )
+
+    @staticmethod
+    def record_completed(db: Session, report: Report) -> None:
+        """Count a completion and the time from submission to completion."""
+        ReportAnalyticsService._apply(
+            db,
+            _utc_day(report.completed_at),
+            report.report_type_id,
+            report.city_key,
+            completed=1,
+            complete_seconds=_seconds_between(report.completed_at, report.reported_at),
+        )
+
+    @staticmethod
+    def record_removed(db: Session, report: Report) -> None:
+        """Take back everything a deleted report contributed."""
+        for day, counters in ReportAnalyticsService._contributions(report):
+            ReportAnalyticsService._apply(
+                db, day, report.report_type_id, report.city_key, **{k: -v for k, v in counters.items()}
+            )
+
+    @staticmethod
+    def record_moved(
+        db: Session,
+        report: Report,
+        old_report_type_id: int,
+        old_city_key: Optional[str],
+    ) -> None:
+        """Move a report's contributions after its type or city was edited."""
+        for day, counters in ReportAnalyticsService._contributions(report):
+            ReportAnalyticsService._apply(
+                db, day, old_report_type_id, old_city_key, **{k: -v for k, v in counters.items()}
+            )
+            ReportAnalyticsService._apply(db, day, report.report_type_id, report.city_key, **counters)
+
+    @staticmethod
+    def rebuild(db: Session) -> dict:
+        """Recompute the whole rollup from the live and archived reports.
+
+        One `INSERT ... SELECT ... GROUP BY` over both tables in a single
+        transaction. Reports deleted outright (e.g. PII retention in
+        "delete" mode) are no longer counted afterwards.
+        """
+        started = time.perf_counter()
+        dialect = db.get_bind().dialect.name
+        events = union_all(
+            *(
+                statement
+                for model in (Report, ArchivedReport)
+                for statement in ReportAnalyticsService._event_selects(model, dialect)
+            )
+        ).subquery()
+        grouped = select(
+            events.c.day,
+            events.c.report_type_id,
+            events.c.city_key,
+            *(func.sum(events.c[name]) for name in _COUNTERS),
+        ).group_by(events.c.day, events.c.report_type_id, events.c.city_key)
+
+        db.execute(delete(ReportDailyStats))
+        db.execute(
+            insert(ReportDailyStats).from_select(
+                [ReportDailyStats.__mapper__.columns[name] for name in ("day", "report_type_id", "city_key", *_COUNTERS)],
+                grouped,
+            )
+        )
+        db.commit()
+        rows = db.query(func.count()).select_from(ReportDailyStats).scalar()
+        return {"rows": rows, "seconds": round(time.perf_counter() - started, 3)}
+
+    @staticmethod
+    def get_timeseries(
+        db: Session,
+        date_from: date,
+        date_to: date,
+        interval: AnalyticsInterval = "day",
+        report_type_id: Optional[int] = None,
+        city: Optional[str] = None,
+        split_by: Optional[AnalyticsSplit] = None,
+    ) -> TimeseriesOut:
+        """Sum the rollup per `interval` bucket, optionally one series per type or city.
+
+        Reads at most one row per day, type and city in the range. Without
+        `split_by`, buckets with no activity are returned as zeros.
+        """
+        split_column = {
+            None: None,
+            "type": ReportDailyStats.report_type_id,
+            "city": ReportDailyStats.city_key,
+        }[split_by]
+        group = [ReportDailyStats.day] + ([split_column] if split_column is not None else [])
+        query = db.query(
+            *group,
+            *(func.sum(getattr(ReportDailyStats, name)) for name in _COUNTERS),
+        ).filter(ReportDailyStats.day >= date_from, ReportDailyStats.day <= date_to)
+        if report_type_id:
+            query = query.filter(ReportDailyStats.report_type_id == report_type_id)
+        city_prefix = normalize_city(city)
+        if city_prefix:
+            query = query.filter(
+                ReportDailyStats.city_key >= city_prefix,
+                ReportDailyStats.city_key < prefix_upper_bound(city_prefix),
+            )
+
+        buckets: Dict[Tuple[date, object], List[float]] = {}
+        for row in query.group_by(*group):
+            day, split_value = row[0], (row[1] if split_column is not None else None)
+            totals = buckets.setdefault((_bucket_start(day, interval), split_value), [0] * len(_COUNTERS))
+            for index, value in enumerate(row[len(group):]):
+                totals[index] += value or 0
+
+        if split_by is None:
+            for start in _bucket_starts(date_from, date_to, interval):
+                buckets.setdefault((start, None), [0] * len(_COUNTERS))
+
+        points = []
+        for (start, split_value), totals in sorted(buckets.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            created, accepted, completed, accept_seconds, complete_seconds = totals
+            points.append(
+                TimeseriesPointOut(
+                    period_start=start,
+                    report_type_id=split_value if split_by == "type" else None,
+                    city_key=(split_value or None) if split_by == "city" else None,
+                    created=int(created),
+                    accepted=int(accepted),
+                    completed=int(completed),
+                    avg_accept_minutes=round(accept_seconds / accepted / 60, 1) if accepted else None,
+                    avg_completion_minutes=round(complete_seconds / completed / 60, 1) if completed else None,
+                )
+            )
+        return TimeseriesOut(
+            date_from=date_from,
+            date_to=date_to,
+            interval=interval,
+            split_by=split_by,
+            points=points,
+        )
+
+    @staticmethod
+    def _contributions(report: Report) -> Iterator[Tuple[date, dict]]:
+        yield _utc_day(report.reported_at), {"created": 1}
+        if report.accepted_at:
+            yield _utc_day(report.accepted_at), {
+                "accepted": 1,
+                "accept_seconds": _seconds_between(report.accepted_at, report.reported_at),
+            }
+        if report.completed_at:
+            yield _utc_day(report.completed_at), {
+                "completed": 1,
+                "complete_seconds": _seconds_between(report.completed_at, report.reported_at),
+            }
+
+    @staticmethod
+    def _apply(
+        db: Session,
+        day: date,
+        report_type_id: int,
+        city_key: Optional[str],
+        **increments: float,
+    ) -> None:
+        """Add `increments` to one rollup row, creating it if needed (single upsert)."""
+        values = {name: increments.get(name, 0) for name in _COUNTERS}
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        statement = dialect_insert(ReportDailyStats).values(
+            day=day, report_type_id=report_type_id, city_key=city_key or "", **values
+        )
+        columns = ReportDailyStats.__mapper__.columns
+        statement = statement.on_conflict_do_update(
+            index_elements=list(_KEY_COLUMNS),
+            set_={
+                columns[name].name: columns[name] + statement.excluded[columns[name].name]
+                for name in increments
+            },
+        )
+        db.execute(statement)
+
+    @staticmethod
+    def _event_selects(model, dialect: str) -> list:
+        """One SELECT per lifecycle event of `model`, shaped like the rollup columns."""
+
+        def day(column):
+            if dialect == "sqlite":
+                return func.date(column)
+            return cast(func.timezone("UTC", column), Date)
+
+        def seconds(later, earlier):
+            if dialect == "sqlite":
+                return func.max(0.0, (func.julianday(later) - func.julianday(earlier)) * 86400.0)
+            return func.greatest(0.0, extract("epoch", later - earlier))
+
+        city_key = func.coalesce(model.city_key, "")
+        zero = literal(0)
+        zero_seconds = literal(0.0)
+
+        def shaped(day_column, created, accepted, completed, accept_seconds, complete_seconds):
+            return select(
+                day(day_column).label("day"),
+                model.report_type_id.label("report_type_id"),
+                city_key.label("city_key"),
+                created.label("created"),
+                accepted.label("accepted"),
+                completed.label("completed"),
+                accept_seconds.label("accept_seconds"),
+                complete_seconds.label("complete_seconds"),
+            )
+
+        return [
+            shaped(model.reported_at, literal(1), zero, zero, zero_seconds, zero_seconds),
+            shaped(
+                model.accepted_at, zero, literal(1), zero,
+                seconds(model.accepted_at, model.reported_at), zero_seconds,
+            ).where(model.accepted_at.isnot(None)),
+            shaped(
+                model.completed_at, zero, zero, literal(1),
+                zero_seconds, seconds(model.completed_at, model.reported_at),
+            ).where(model.completed_at.isnot(None)),
+        ]
+
+
+def _bucket_start(day: date, interval: AnalyticsInterval) -> date:
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _bucket_starts(date_from: date, date_to: date, interval: AnalyticsInterval) -> Iterator[date]:
+    current = _bucket_start(date_from, interval)
+    while current <= date_to:
+        yield current
+        if interval == "month":
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+        else:
+            current += timedelta(days=7 if interval == "week" else 1)
@@ -0,0 +1,65 @@
+"""Hot/cold split for reports: move long-completed reports to the archive table."""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.models import ArchivedReport, Report
+
+# Columns copied verbatim; the archive adds only `data_archiwizacji`
+_REPORT_COLUMNS = [column.name for column in Report.__table__.columns]
+
+
+class ReportArchiveService:
+    """Service moving completed reports out of `zgloszenia`."""
+
+    @staticmethod
+    def archive_completed(
+        db: Session,
+        older_than_days: int = settings.REPORT_ARCHIVE_AFTER_DAYS,
+        batch_size: int = settings.REPORT_ARCHIVE_BATCH_SIZE,
+        max_batches: Optional[int] = settings.REPORT_ARCHIVE_MAX_BATCHES,
+        now: Optional[datetime] = None,
+    ) -> dict:
+        """Move reports completed more than `older_than_days` ago, oldest first.
+
+        Every batch is copied with INSERT ... SELECT, deleted from the hot
+        table and committed on its own, so locks stay short and an
+        interrupted run simply continues next time. The newest report id
+        always stays in `zgloszenia` so SQLite never hands a new report the
+        id of an archived one.
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(days=older_than_days)
+        started = time.perf_counter()
+        moved = batches = 0
+        newest_id = db.query(func.max(Report.id)).scalar()
+        while newest_id is not None and (max_batches is None or batches < max_batches):
+            ids = [
+                report_id
+                for (report_id,) in db.query(Report.id)
+                .filter(Report.completed_at < cutoff, Report.id < newest_id)
+                .order_by(Report.completed_at)
+                .limit(batch_size)
+            ]
+            if not ids:
+                break
+            source = select(
+                *(Report.__table__.c[name] for name in _REPORT_COLUMNS),
+                literal(now, DateTime(timezone=True)),
+            ).where(Report.__table__.c.id.in_(ids))
+            db.execute(
+                insert(ArchivedReport.__table__).from_select(_REPORT_COLUMNS + ["data_archiwizacji"], source)
+            )
+            db.execute(delete(Report).where(Report.id.in_(ids)).execution_options(synchronize_session=False))
+            db.commit()
+            moved += len(ids)
+            batches += 1
+        return {
+            "moved": moved,
+            "batches": batches,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
@@ -0,0 +1,196 @@
+"""Report chat service: buffered persistence and paginated history."""
+import asyncio
+import base64
+import logging
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple, Union
+
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.db.database import SessionLocal
+from app.db.models import Account, ArchivedReport, ChatMessage, Report
+from app.schemas.chat import ChatHistoryPage, ChatMessageOut
+
+logger = logging.getLogger(__name__)
+
+
+class ChatMessageWriter:
+    """Buffer chat messages and insert them in batches.
+
+    Messages are flushed when `batch_size` rows are pending or every
+    `flush_interval` seconds, with one multi-row INSERT and one commit per
+    batch. Failed batches are kept and retried; a full buffer makes `add`
+    wait for a flush rather than drop anything.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = settings.CHAT_FLUSH_BATCH_SIZE,
+        flush_interval: float = settings.CHAT_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = 10_000,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[dict] = []
+        self._inflight: List[dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Lock] = None
+        self.flushed_batches = 0
+        self.flushed_messages = 0
+
+    async def add(self, row: dict) -> bool:
+        """Queue a message row (column attribute names as keys).
+
+        When `max_pending` rows are waiting the caller flushes them first
+        instead of losing any; returns False (row not queued) only if that
+        flush fails too.
+        """
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        if len(self._pending) >= self.max_pending:
+            await self.flush()
+            if len(self._pending) >= self.max_pending:
+                logger.warning("Chat write buffer full, refusing message")
+                return False
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def pending_for(self, report_id: int) -> List[dict]:
+        """Rows of `report_id` not yet committed, oldest first."""
+        return [row for row in self._inflight + self._pending if row["report_id"] == report_id]
+
+    async def flush(self) -> None:
+        """Write every pending row now."""
+        if self._flushing is None:
+            self._flushing = asyncio.Lock()
+        # One flush at a time, so `_inflight` always holds the batch being written
+        async with self._flushing:
+            await self._flush_pending()
+
+    async def _flush_pending(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size:]
+            self._inflight = batch
+            try:
+                await run_in_threadpool(self._write, batch)
+            except Exception:
+                logger.exception("Failed to persist %d chat messages, will retry", len(batch))
+                self._pending = batch + self._pending
+                return
+            finally:
+                self._inflight = []
+            self.flushed_batches += 1
+            self.flushed_messages += len(batch)
+
+    async def stop(self) -> None:
+        """Stop the background flusher and write what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._flushing = None  # bound to this event loop
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _write(self, batch: List[dict]) -> None:
+        with self.session_factory() as db:
+            db.execute(insert(ChatMessage), batch)
+            db.commit()
+
+
+chat_writer = ChatMessageWriter()
+
+
+class ChatService:
+    """Service for report chat history."""
+
+    @staticmethod
+    def is_participant(db: Session, report: Union[Report, ArchivedReport], email: str) -> bool:
+        """Whether `email` reported, is working on or completed `report`."""
+        if email in (report.reporter_email, report.completed_by_email):
+            return True
+        return (
+            db.query(Account.email)
+            .filter(Account.email == email, Account.active_report == report.id)
+            .first()
+            is not None
+        )
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, message_id: int) -> str:
+        raw = f"{created_at.isoformat()}|{message_id}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decode a history cursor; raises ValueError if malformed."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+            created_at, message_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at), int(message_id)
+        except (UnicodeError, ValueError, TypeError) as exc:
+            raise ValueError("Invalid cursor") from exc
+
+    @staticmethod
+    def get_history(
+        db: Session,
+        report_id: int,
+        limit: int = 50,
+        before: Optional[str] = None,
+    ) -> ChatHistoryPage:
+        """Return up to `limit` persisted messages older than `before`, newest first."""
+        query = db.query(ChatMessage).filter(ChatMessage.report_id == report_id)
+        if before:
+            created_at, message_id = ChatService.decode_cursor(before)
+            query = query.filter(
+                or_(
+                    ChatMessage.created_at < created_at,
+                    and_(ChatMessage.created_at == created_at, ChatMessage.id < message_id),
+                )
+            )
+        rows = (
+            query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = ChatService.encode_cursor(rows[-1].created_at, rows[-1].id)
+        return ChatHistoryPage(
+            messages=[ChatMessageOut.model_validate(row) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def get_recent_with_pending(db: Session, report_id: int, limit: int = 50) -> List[ChatMessageOut]:
+        """Recent history for a (re)connecting client, oldest first.
+
+        Includes messages still buffered by `chat_writer` on this worker.
+        """
+        page = ChatService.get_history(db, report_id, limit=limit)
+        messages = list(reversed(page.messages))
+        messages.extend(ChatMessageOut(**row) for row in chat_writer.pending_for(report_id))
+        return messages[-limit:]
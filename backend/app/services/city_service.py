@@ -0,0 +1,35 @@
+"""City lookup services."""
+from functools import partial
+from typing import List
+
+from sqlalchemy import func, union_all
+from sqlalchemy.orm import Session
+
+from app.core.cities import city_dictionary
+from app.db.models import Account, ArchivedReport, Report
+from app.schemas.city import CitySuggestionOut
+
+
+class CityService:
+    """Service for city autocomplete."""
+
+    @staticmethod
+    def suggest(db: Session, query: str, limit: int = 10) -> List[CitySuggestionOut]:
+        """Cities starting with `query` (accents and case ignored), most used first."""
+        city_dictionary.ensure_loaded(partial(CityService._load_city_counts, db))
+        return [
+            CitySuggestionOut(name=name, key=key, count=count)
+            for name, key, count in city_dictionary.suggest(query, limit=limit)
+        ]
+
+    @staticmethod
+    def _load_city_counts(db: Session):
+        """`(key, spelling, count)` for every city used by (archived) reports or accounts."""
+        cities = union_all(
+            db.query(Report.city_key.label("key"), Report.city.label("city")).statement,
+            db.query(ArchivedReport.city_key.label("key"), ArchivedReport.city.label("city")).statement,
+            db.query(Account.city_key.label("key"), Account.city.label("city"))
+            .filter(Account.city_key.isnot(None))
+            .statement,
+        ).subquery()
+        return db.query(cities.c.key, cities.c.city, func.count()).group_by(cities.c.key, cities.c.city).all()
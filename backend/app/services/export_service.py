@@ -0,0 +1,200 @@
+"""Streaming report export (CSV / NDJSON) with constant memory."""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Literal, Optional
+
+from sqlalchemy import Connection, Engine, case, false, literal, select, true
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cities import normalize_city, prefix_upper_bound
+from app.core.timeutil import as_utc
+from app.db.models import Account, ArchivedReport, Report
+
+ExportFormat = Literal["csv", "ndjson"]
+ExportStatus = Literal["all", "open", "accepted", "completed"]
+
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+EXPORT_COLUMNS = [
+    "id",
+    "status",
+    "archived",
+    "full_name",
+    "phone",
+    "age",
+    "address",
+    "city",
+    "latitude",
+    "longitude",
+    "problem",
+    "contact_ok",
+    "is_reviewed",
+    "report_type_id",
+    "reporter_email",
+    "report_details",
+    "reported_at",
+    "accepted_at",
+    "completed_at",
+    "completed_by_email",
+]
+# Characters that make spreadsheet applications evaluate a cell as a formula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# Flush the CSV buffer once it holds this many characters
+_CSV_CHUNK_CHARS = 64 * 1024
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return as_utc(value).isoformat()
+    return value
+
+
+class ReportExportService:
+    """Service streaming filtered reports from the live table and the archive."""
+
+    @staticmethod
+    def iter_rows(
+        bind: Engine | Connection,
+        status: ExportStatus = "all",
+        report_type_id: Optional[int] = None,
+        city: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        page_size: int = settings.EXPORT_PAGE_SIZE,
+    ) -> Iterator[dict]:
+        """Yield matching reports as dicts keyed by `EXPORT_COLUMNS`, by id.
+
+        Reads keyset pages (`id > last ORDER BY id LIMIT page_size`), each in
+        its own short-lived session, so no read transaction or database lock
+        is held while the client downloads. Rows written during the export
+        are included if their id is past the current page.
+        """
+        sources = [
+            (Report, ReportExportService._live_query(status, report_type_id, city, date_from, date_to)),
+        ]
+        if status in ("all", "completed"):
+            sources.append(
+                (ArchivedReport, ReportExportService._archive_query(report_type_id, city, date_from, date_to))
+            )
+        for model, statement in sources:
+            last_id = None
+            while True:
+                page = statement if last_id is None else statement.where(model.id > last_id)
+                with Session(bind=bind) as db:
+                    rows = db.execute(page.limit(page_size)).all()
+                for row in rows:
+                    yield dict(zip(EXPORT_COLUMNS, row))
+                if len(rows) < page_size:
+                    break
+                last_id = rows[-1][0]
+
+    @staticmethod
+    def stream_csv(rows: Iterable[dict]) -> Iterator[str]:
+        """Encode rows as CSV with a header, in chunks of about 64 KiB."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            writer.writerow([ReportExportService._csv_cell(row[column]) for column in EXPORT_COLUMNS])
+            if buffer.tell() >= _CSV_CHUNK_CHARS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    @staticmethod
+    def stream_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+        """Encode rows as newline-delimited JSON, in chunks of about 64 KiB."""
+        chunk = []
+        size = 0
+        for row in rows:
+            line = json.dumps({key: _plain(value) for key, value in row.items()}, ensure_ascii=False) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= _CSV_CHUNK_CHARS:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        yield "".join(chunk)
+
+    @staticmethod
+    def _csv_cell(value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        value = _plain(value)
+        if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    @staticmethod
+    def _live_query(
+        status: ExportStatus,
+        report_type_id: Optional[int],
+        city: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+    ):
+        assigned = (
+            select(Account.active_report.label("report_id"))
+            .where(Account.active_report.isnot(None))
+            .distinct()
+            .subquery()
+        )
+        status_column = case(
+            (Report.completed_at.isnot(None), "completed"),
+            (assigned.c.report_id.isnot(None), "accepted"),
+            else_="open",
+        )
+        statement = (
+            select(Report.id, status_column, false(), *ReportExportService._data_columns(Report))
+            .outerjoin(assigned, assigned.c.report_id == Report.id)
+        )
+        if status == "open":
+            statement = statement.where(Report.completed_at.is_(None), assigned.c.report_id.is_(None))
+        elif status == "accepted":
+            statement = statement.where(Report.completed_at.is_(None), assigned.c.report_id.isnot(None))
+        elif status == "completed":
+            statement = statement.where(Report.completed_at.isnot(None))
+        statement = ReportExportService._filter(statement, Report, report_type_id, city, date_from, date_to)
+        return statement.order_by(Report.id)
+
+    @staticmethod
+    def _archive_query(
+        report_type_id: Optional[int],
+        city: Optional[str],
+        date_from: Optional[datetime],
+        date_to: Optional[datetime],
+    ):
+        statement = select(
+            ArchivedReport.id,
+            literal("completed"),
+            true(),
+            *ReportExportService._data_columns(ArchivedReport),
+        )
+        statement = ReportExportService._filter(
+            statement, ArchivedReport, report_type_id, city, date_from, date_to
+        )
+        return statement.order_by(ArchivedReport.id)
+
+    @staticmethod
+    def _data_columns(model) -> list:
+        return [getattr(model, column) for column in EXPORT_COLUMNS[3:]]
+
+    @staticmethod
+    def _filter(statement, model, report_type_id, city, date_from, date_to):
+        if report_type_id:
+            statement = statement.where(model.report_type_id == report_type_id)
+        city_prefix = normalize_city(city)
+        if city_prefix:
+            statement = statement.where(
+                model.city_key >= city_prefix,
+                model.city_key < prefix_upper_bound(city_prefix),
+            )
+        if date_from:
+            statement = statement.where(model.reported_at >= date_from)
+        if date_to:
+            statement = statement.where(model.reported_at <= date_to)
+        return statement
@@ -0,0 +1,222 @@
+"""Bulk volunteer import from CSV or JSON."""
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, List, Literal, Set
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cities import city_dictionary, normalize_city
+from app.core.security import get_password_hash
+from app.db.models import Account
+from app.schemas.account import serialize_availability
+from app.schemas.account_import import AccountImportErrorOut, AccountImportResultOut, AccountImportRow
+from app.services.account_service import AccountService
+
+logger = logging.getLogger(__name__)
+
+ImportFormat = Literal["csv", "json"]
+
+# Emails per existing-account lookup; stays below SQLite's bound-parameter limit
+_EMAIL_LOOKUP_CHUNK = 10_000
+
+
+class AccountImportService:
+    """Service creating many volunteer accounts in one go."""
+
+    @staticmethod
+    def parse(content: str, fmt: ImportFormat) -> List[Any]:
+        """Turn an uploaded file into one raw record per volunteer.
+
+        CSV needs a header row with the `AccountImportRow` field names; the
+        optional `availability` column holds the slots as a JSON list. JSON
+        is a list of objects or `{"accounts": [...]}`. Raises ValueError when
+        the file as a whole cannot be read.
+        """
+        if fmt == "csv":
+            return AccountImportService._parse_csv(content)
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON: {exc.msg} (line {exc.lineno})") from exc
+        if isinstance(data, dict):
+            data = data.get("accounts")
+        if not isinstance(data, list):
+            raise ValueError('JSON import must be a list of accounts or {"accounts": [...]}')
+        return data
+
+    @staticmethod
+    def import_accounts(
+        db: Session,
+        records: Iterable[Any],
+        workers: int = settings.ACCOUNT_IMPORT_WORKERS,
+        batch_size: int = settings.ACCOUNT_IMPORT_BATCH_SIZE,
+    ) -> AccountImportResultOut:
+        """Validate, hash and insert volunteers; bad rows are reported, not fatal.
+
+        Emails already registered are found with one lookup for the whole
+        file, passwords are hashed across `workers` processes (0 = one per
+        CPU) and accounts are written with one multi-row INSERT per
+        `batch_size` rows, each batch in its own transaction.
+        """
+        started = time.perf_counter()
+        errors: List[AccountImportErrorOut] = []
+        candidates: List[tuple[int, AccountImportRow]] = []
+        seen: Set[str] = set()
+        total = 0
+        for total, record in enumerate(records, start=1):
+            email = record.get("email") if isinstance(record, dict) else None
+            try:
+                row = AccountImportRow.model_validate(record)
+            except ValidationError as exc:
+                errors.append(AccountImportErrorOut(row=total, email=email, error=_describe(exc)))
+                continue
+            email = row.email.lower()
+            if email in seen:
+                errors.append(AccountImportErrorOut(row=total, email=email, error="Duplicate email in import"))
+                continue
+            seen.add(email)
+            candidates.append((total, row))
+
+        existing = AccountImportService._existing_emails(db, seen)
+        pending = []
+        for position, row in candidates:
+            if row.email.lower() in existing:
+                errors.append(
+                    AccountImportErrorOut(row=position, email=row.email.lower(), error="Email already registered")
+                )
+            else:
+                pending.append((position, row))
+
+        hashes = AccountImportService._hash_passwords([row.password for _, row in pending], workers)
+        created = 0
+        for start in range(0, len(pending), batch_size):
+            batch = [
+                (position, AccountImportService._account_values(row, password_hash))
+                for (position, row), password_hash in zip(
+                    pending[start:start + batch_size], hashes[start:start + batch_size]
+                )
+            ]
+            created += AccountImportService._insert_batch(db, batch, errors)
+
+        if created:
+            AccountService._invalidate_public_caches()
+            for _, row in pending:
+                city_dictionary.observe(row.city)
+
+        elapsed = time.perf_counter() - started
+        errors.sort(key=lambda error: error.row)
+        result = AccountImportResultOut(
+            total=total,
+            created=created,
+            failed=len(errors),
+            errors=errors,
+            seconds=round(elapsed, 3),
+            rows_per_second=round(created / elapsed, 1) if elapsed > 0 else None,
+        )
+        logger.info(
+            "Account import: %s read, %s created, %s failed in %.2fs",
+            result.total, result.created, result.failed, elapsed,
+        )
+        return result
+
+    @staticmethod
+    def _parse_csv(content: str) -> List[Any]:
+        reader = csv.DictReader(io.StringIO(content.lstrip("\ufeff")))
+        if not reader.fieldnames or "email" not in [name.strip().lower() for name in reader.fieldnames]:
+            raise ValueError("CSV import needs a header row with at least an 'email' column")
+        records: List[Any] = []
+        for raw in reader:
+            record = {
+                key.strip().lower(): value.strip()
+                for key, value in raw.items()
+                if key and isinstance(value, str) and value.strip()
+            }
+            if "availability" in record:
+                try:
+                    record["availability"] = json.loads(record["availability"])
+                except json.JSONDecodeError:
+                    pass  # left as text, so validation reports it against the row
+            records.append(record)
+        return records
+
+    @staticmethod
+    def _existing_emails(db: Session, emails: Set[str]) -> Set[str]:
+        ordered = sorted(emails)
+        existing: Set[str] = set()
+        for start in range(0, len(ordered), _EMAIL_LOOKUP_CHUNK):
+            chunk = ordered[start:start + _EMAIL_LOOKUP_CHUNK]
+            existing.update(email for (email,) in db.query(Account.email).filter(Account.email.in_(chunk)))
+        return existing
+
+    @staticmethod
+    def _hash_passwords(passwords: List[str], workers: int) -> List[str]:
+        """bcrypt every password, in parallel when there is more than one CPU to use."""
+        workers = min(workers or os.cpu_count() or 1, len(passwords))
+        if workers <= 1:
+            return [get_password_hash(password) for password in passwords]
+        # Spawned (not forked) workers: forking a threaded server can copy held locks
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(pool.map(get_password_hash, passwords, chunksize=chunksize))
+
+    @staticmethod
+    def _account_values(row: AccountImportRow, password_hash: str) -> dict:
+        return {
+            "email": row.email.lower(),
+            "full_name": row.full_name,
+            "phone": row.phone,
+            "password_hash": password_hash,
+            "is_active": row.is_active,
+            "city": row.city,
+            "city_key": normalize_city(row.city),
+            "latitude": row.latitude,
+            "longitude": row.longitude,
+            "availability_json": serialize_availability(row.availability) if row.availability else "[]",
+            "resolved_cases": 0,
+            "resolved_cases_this_year": 0,
+            "genpoints": 0,
+        }
+
+    @staticmethod
+    def _insert_batch(
+        db: Session,
+        batch: List[tuple[int, dict]],
+        errors: List[AccountImportErrorOut],
+    ) -> int:
+        """Insert one batch; on a conflict (e.g. a concurrent registration) retry row by row."""
+        try:
+            db.execute(insert(Account), [values for _, values in batch])
+            db.commit()
+            return len(batch)
+        except IntegrityError:
+            db.rollback()
+        created = 0
+        for position, values in batch:
+            try:
+                db.execute(insert(Account), [values])
+                db.commit()
+                created += 1
+            except IntegrityError:
+                db.rollback()
+                errors.append(
+                    AccountImportErrorOut(row=position, email=values["email"], error="Email already registered")
+                )
+        return created
+
+
+def _describe(exc: ValidationError) -> str:
+    """Compact one-line summary of a validation error."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}" for error in exc.errors()
+    )
@@ -0,0 +1,325 @@
+"""Response-time percentiles from persisted quantile sketches."""
+import asyncio
+import logging
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import and_, delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.core.quantiles import QuantileSketch
+from app.core.timeutil import as_utc
+from app.db.database import SessionLocal
+from app.db.models import ArchivedReport, LatencySketch, Report
+from app.schemas.analytics import LatencyMetric, LatencyPercentilesOut
+
+logger = logging.getLogger(__name__)
+
+ALL_PERIODS = "all"
+ALL_TYPES = 0
+# (metric, report_type_id or ALL_TYPES, ALL_PERIODS or "YYYY-MM-DD")
+SketchKey = Tuple[str, int, str]
+
+# Compare-and-set attempts per sketch before the delta waits for the next flush
+_MAX_MERGE_ATTEMPTS = 5
+
+
+def _sketch_keys(metric: str, report_type_id: int, moment: datetime) -> Tuple[SketchKey, ...]:
+    day = as_utc(moment).astimezone(timezone.utc).date().isoformat()
+    return (
+        (metric, ALL_TYPES, ALL_PERIODS),
+        (metric, report_type_id, ALL_PERIODS),
+        (metric, ALL_TYPES, day),
+        (metric, report_type_id, day),
+    )
+
+
+class LatencyRecorder:
+    """Collect response-time observations and merge them into `szkice_opoznien`.
+
+    Each observation updates four in-memory sketch deltas (overall, per
+    type, per day, per type and day). Every `flush_interval` seconds the
+    deltas are merged into their rows with a compare-and-set on `version`,
+    so several workers can flush the same sketch without losing updates.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        flush_interval: float = settings.LATENCY_SKETCH_FLUSH_SECONDS,
+        relative_accuracy: float = settings.LATENCY_SKETCH_ACCURACY,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.relative_accuracy = relative_accuracy
+        self._pending: Dict[SketchKey, QuantileSketch] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_sketches = 0
+
+    def new_sketch(self) -> QuantileSketch:
+        return QuantileSketch(relative_accuracy=self.relative_accuracy)
+
+    def record_accepted(self, report: Report) -> None:
+        """Observe submission-to-first-acceptance time of `report`."""
+        self.observe("accept", report.report_type_id, report.accepted_at, report.reported_at)
+
+    def record_completed(self, report: Report) -> None:
+        """Observe submission-to-completion time of `report`."""
+        self.observe("complete", report.report_type_id, report.completed_at, report.reported_at)
+
+    def observe(self, metric: LatencyMetric, report_type_id: int, happened_at: datetime, since: datetime) -> None:
+        seconds = (as_utc(happened_at) - as_utc(since)).total_seconds()
+        with self._lock:
+            for key in _sketch_keys(metric, report_type_id, happened_at):
+                sketch = self._pending.get(key)
+                if sketch is None:
+                    sketch = self._pending[key] = self.new_sketch()
+                sketch.add(seconds)
+
+    def pending_matching(self, predicate: Callable[[SketchKey], bool]) -> QuantileSketch:
+        """Merged copy of the not-yet-flushed deltas whose key satisfies `predicate`."""
+        merged = self.new_sketch()
+        with self._lock:
+            for key, sketch in self._pending.items():
+                if predicate(key):
+                    merged.merge(sketch)
+        return merged
+
+    def flush(self) -> int:
+        """Merge every buffered delta into the database; returns sketches written."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        written = 0
+        with self.session_factory() as db:
+            for key, delta in batch.items():
+                try:
+                    merged = self._merge_into_db(db, key, delta)
+                except Exception:
+                    logger.exception("Failed to persist latency sketch %s, will retry", key)
+                    db.rollback()
+                    merged = False
+                if merged:
+                    written += 1
+                else:
+                    self._requeue(key, delta)
+        self.flushed_sketches += written
+        return written
+
+    async def start(self) -> None:
+        """Start the periodic flush loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await run_in_threadpool(self.flush)
+
+    def clear(self) -> None:
+        """Drop buffered observations (tests, `LatencyMetricsService.rebuild`)."""
+        with self._lock:
+            self._pending.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await run_in_threadpool(self.flush)
+            except Exception:
+                logger.exception("Latency sketch flush failed")
+
+    def _requeue(self, key: SketchKey, delta: QuantileSketch) -> None:
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = delta
+            else:
+                pending.merge(delta)
+
+    @staticmethod
+    def _merge_into_db(db: Session, key: SketchKey, delta: QuantileSketch) -> bool:
+        metric, report_type_id, period = key
+        match = and_(
+            LatencySketch.metric == metric,
+            LatencySketch.report_type_id == report_type_id,
+            LatencySketch.period == period,
+        )
+        for _ in range(_MAX_MERGE_ATTEMPTS):
+            current = db.execute(select(LatencySketch.sketch, LatencySketch.version).where(match)).first()
+            now = datetime.now(timezone.utc)
+            if current is None:
+                try:
+                    db.execute(
+                        insert(LatencySketch).values(
+                            metric=metric,
+                            report_type_id=report_type_id,
+                            period=period,
+                            sketch=delta.to_json(),
+                            version=1,
+                            updated_at=now,
+                        )
+                    )
+                    db.commit()
+                    return True
+                except IntegrityError:
+                    db.rollback()  # another worker created it first
+                    continue
+            merged = QuantileSketch.from_json(current.sketch).merge(delta)
+            swapped = db.execute(
+                update(LatencySketch)
+                .where(match, LatencySketch.version == current.version)
+                .values(sketch=merged.to_json(), version=current.version + 1, updated_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+            if swapped:
+                return True
+        return False
+
+
+latency_recorder = LatencyRecorder()
+
+
+class LatencyMetricsService:
+    """Service answering percentile queries from the stored sketches."""
+
+    @staticmethod
+    def get_percentiles(
+        db: Session,
+        metric: LatencyMetric = "accept",
+        report_type_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> LatencyPercentilesOut:
+        """p50/p90/p99 of one metric, overall or over a range of UTC days.
+
+        Merges one stored sketch per day in the range (or the all-time
+        sketch) plus this worker's unflushed observations; report history
+        is never read.
+        """
+        type_key = report_type_id or ALL_TYPES
+        query = db.query(LatencySketch.sketch).filter(
+            LatencySketch.metric == metric, LatencySketch.report_type_id == type_key
+        )
+        if date_from is None and date_to is None:
+            query = query.filter(LatencySketch.period == ALL_PERIODS)
+
+            def in_range(period: str) -> bool:
+                return period == ALL_PERIODS
+        else:
+            low = date_from.isoformat() if date_from else "0000-00-00"
+            high = date_to.isoformat() if date_to else "9999-99-99"
+            query = query.filter(
+                LatencySketch.period != ALL_PERIODS,
+                LatencySketch.period >= low,
+                LatencySketch.period <= high,
+            )
+
+            def in_range(period: str) -> bool:
+                return period != ALL_PERIODS and low <= period <= high
+
+        sketch = latency_recorder.new_sketch()
+        for (raw,) in query:
+            sketch.merge(QuantileSketch.from_json(raw))
+        sketch.merge(
+            latency_recorder.pending_matching(
+                lambda key: key[0] == metric and key[1] == type_key and in_range(key[2])
+            )
+        )
+
+        def minutes(seconds: Optional[float]) -> Optional[float]:
+            return None if seconds is None else round(seconds / 60, 1)
+
+        return LatencyPercentilesOut(
+            metric=metric,
+            report_type_id=report_type_id,
+            date_from=date_from,
+            date_to=date_to,
+            count=sketch.count,
+            mean_minutes=minutes(sketch.mean),
+            min_minutes=minutes(sketch.min),
+            p50_minutes=minutes(sketch.quantile(0.5)),
+            p90_minutes=minutes(sketch.quantile(0.9)),
+            p99_minutes=minutes(sketch.quantile(0.99)),
+            max_minutes=minutes(sketch.max),
+        )
+
+    @staticmethod
+    def rebuild(db: Session, yield_per: int = settings.EXPORT_PAGE_SIZE) -> dict:
+        """Recompute every sketch from the live and archived reports.
+
+        A one-off backfill (after upgrading or bulk loads): streams the
+        lifecycle timestamps once and replaces `szkice_opoznien` in one
+        transaction. This worker's buffered observations are dropped first,
+        since the scan already counts them. Buffers of other workers cannot
+        be reached and would be merged on top, counting their reports twice,
+        so run it with no API workers up (as `scripts/rebuild_latency_sketches.py`
+        does).
+        """
+        started = time.perf_counter()
+        latency_recorder.clear()
+        sketches: Dict[SketchKey, QuantileSketch] = {}
+
+        def observe(metric: str, report_type_id: int, happened_at: datetime, since: datetime) -> None:
+            seconds = (as_utc(happened_at) - as_utc(since)).total_seconds()
+            for key in _sketch_keys(metric, report_type_id, happened_at):
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = sketches[key] = latency_recorder.new_sketch()
+                sketch.add(seconds)
+
+        observations = 0
+        for model in (Report, ArchivedReport):
+            rows = db.execute(
+                select(model.report_type_id, model.reported_at, model.accepted_at, model.completed_at)
+                .where(model.accepted_at.isnot(None))
+                .execution_options(yield_per=yield_per)
+            )
+            for report_type_id, reported_at, accepted_at, completed_at in rows:
+                observe("accept", report_type_id, accepted_at, reported_at)
+                observations += 1
+                if completed_at is not None:
+                    observe("complete", report_type_id, completed_at, reported_at)
+                    observations += 1
+
+        now = datetime.now(timezone.utc)
+        db.execute(delete(LatencySketch))
+        _insert_sketches(db, sketches.items(), now)
+        db.commit()
+        return {
+            "sketches": len(sketches),
+            "observations": observations,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+
+def _insert_sketches(db: Session, items: Iterable[Tuple[SketchKey, QuantileSketch]], now: datetime) -> None:
+    batch = []
+    for (metric, report_type_id, period), sketch in items:
+        batch.append(
+            {
+                "metric": metric,
+                "report_type_id": report_type_id,
+                "period": period,
+                "sketch": sketch.to_json(),
+                "version": 1,
+                "updated_at": now,
+            }
+        )
+        if len(batch) >= 1000:
+            db.execute(insert(LatencySketch), batch)
+            batch = []
+    if batch:
+        db.execute(insert(LatencySketch), batch)
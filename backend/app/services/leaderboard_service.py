@@ -0,0 +1,105 @@
+"""Volunteer leaderboard service."""
+from functools import partial
+from typing import List, Optional
+
+from sqlalchemy import Connection, Engine, func
+from sqlalchemy.orm import Session
+
+from app.core.cache import public_cache
+from app.core.cities import normalize_city
+from app.db.models import Account
+from app.schemas.leaderboard import LeaderboardEntryOut, LeaderboardPeriod, LeaderboardRankOut
+from app.schemas.limits import LEADERBOARD_LIMIT_MAX
+
+_SCORE_COLUMNS = {"all": Account.genpoints, "year": Account.resolved_cases_this_year}
+
+
+def _cache_key(period: str, city_key: Optional[str]) -> str:
+    return f"accounts:leaderboard:{period}:{city_key or ''}"
+
+
+class LeaderboardService:
+    """Service for volunteer rankings.
+
+    The top `LEADERBOARD_LIMIT_MAX` of each (period, city) are cached in the
+    public cache and dropped when a volunteer completes a report. Single
+    ranks count the accounts scoring higher, a range scan on the
+    `ix_konta_*` score indexes rather than a sort of every account.
+    """
+
+    @staticmethod
+    def get_top(
+        db: Session,
+        period: LeaderboardPeriod = "all",
+        city: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[LeaderboardEntryOut]:
+        """Top `limit` volunteers with a positive score, best first."""
+        key = normalize_city(city)
+        entries = public_cache.get_or_load(
+            _cache_key(period, key),
+            partial(LeaderboardService._load_top, db.get_bind(), period, key),
+        )
+        return entries[:limit]
+
+    @staticmethod
+    def get_rank(db: Session, account: Account, period: LeaderboardPeriod = "all") -> LeaderboardRankOut:
+        """Competition rank of `account` globally and within its city."""
+        score_column = _SCORE_COLUMNS[period]
+        score = getattr(account, score_column.key) or 0
+        above = db.query(func.count()).select_from(Account).filter(score_column > score)
+        city_rank = None
+        if account.city_key:
+            city_rank = above.filter(Account.city_key == account.city_key).scalar() + 1
+        return LeaderboardRankOut(
+            period=period,
+            score=score,
+            rank=above.scalar() + 1,
+            city=account.city_key,
+            city_rank=city_rank,
+        )
+
+    @staticmethod
+    def invalidate_for(account: Account) -> None:
+        """Drop the cached boards a change to `account`'s score can affect."""
+        for period in _SCORE_COLUMNS:
+            public_cache.invalidate(_cache_key(period, None))
+            if account.city_key:
+                public_cache.invalidate(_cache_key(period, account.city_key))
+
+    @staticmethod
+    def _load_top(
+        bind: Engine | Connection,
+        period: LeaderboardPeriod,
+        city_key: Optional[str],
+    ) -> List[LeaderboardEntryOut]:
+        """Read the cached top list in a dedicated session (index-ordered scan)."""
+        score_column = _SCORE_COLUMNS[period]
+        with Session(bind=bind) as db:
+            query = db.query(
+                Account.full_name,
+                Account.city,
+                Account.genpoints,
+                Account.resolved_cases,
+                Account.resolved_cases_this_year,
+                score_column.label("score"),
+            ).filter(score_column > 0)
+            if city_key:
+                query = query.filter(Account.city_key == city_key)
+            rows = query.order_by(score_column.desc(), Account.email).limit(LEADERBOARD_LIMIT_MAX).all()
+
+        entries = []
+        for position, row in enumerate(rows, start=1):
+            tied = entries and entries[-1].score == row.score
+            entries.append(
+                LeaderboardEntryOut(
+                    rank=entries[-1].rank if tied else position,
+                    full_name=row.full_name,
+                    city=row.city,
+                    score=row.score,
+                    genpoints=row.genpoints,
+                    resolved_cases=row.resolved_cases,
+                    resolved_cases_this_year=row.resolved_cases_this_year,
+                )
+            )
+        return entries
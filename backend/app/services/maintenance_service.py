@@ -0,0 +1,97 @@
+"""Periodic database and housekeeping jobs run by the scheduler."""
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import logger as activity_log
+from app.core.scheduler import Scheduler
+from app.db.models import Account
+from app.services.archive_service import ReportArchiveService
+from app.services.retention_service import RetentionService
+
+# Session log files written by app.core.logger ("DD-MM-YYYYTHH-MM-SS.log")
+_SESSION_LOG_PATTERN = re.compile(r"^\d{2}-\d{2}-\d{4}T\d{2}-\d{2}-\d{2}\.log$")
+
+
+class MaintenanceService:
+    """Service for scheduled maintenance tasks."""
+
+    @staticmethod
+    def reset_yearly_counters(db: Session) -> str:
+        """Zero every volunteer's `resolved_cases_this_year` in one statement."""
+        reset = db.execute(
+            update(Account)
+            .where(Account.resolved_cases_this_year != 0)
+            .values(resolved_cases_this_year=0)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        return f"reset {reset} accounts"
+
+    @staticmethod
+    def optimize_database(db: Session) -> str:
+        """Refresh planner statistics (`PRAGMA optimize` + `ANALYZE` on SQLite)."""
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            db.execute(text("PRAGMA optimize"))
+        db.execute(text("ANALYZE"))
+        db.commit()
+        return f"analyzed ({dialect})"
+
+    @staticmethod
+    def prune_log_files(
+        db: Session,
+        logs_dir: Optional[Path] = None,
+        retention_days: int = settings.LOG_RETENTION_DAYS,
+    ) -> str:
+        """Delete per-session log files older than `retention_days`."""
+        logs_dir = logs_dir or activity_log.LOGS_DIR
+        cutoff = time.time() - retention_days * 86400
+        removed = 0
+        for path in logs_dir.iterdir():
+            if path == activity_log.TIMESTAMPED_LOG or not _SESSION_LOG_PATTERN.match(path.name):
+                continue
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return f"removed {removed} log files"
+
+
+def register_default_jobs(scheduler: Scheduler) -> None:
+    """Register the built-in maintenance jobs with their configured schedules."""
+    scheduler.register(
+        "reset_yearly_counters",
+        settings.SCHEDULE_RESET_YEARLY_COUNTERS,
+        MaintenanceService.reset_yearly_counters,
+        "Zero resolved_cases_this_year at the start of the year",
+    )
+    scheduler.register(
+        "optimize_database",
+        settings.SCHEDULE_OPTIMIZE_DATABASE,
+        MaintenanceService.optimize_database,
+        "Refresh query planner statistics",
+    )
+    scheduler.register(
+        "prune_log_files",
+        settings.SCHEDULE_PRUNE_LOGS,
+        MaintenanceService.prune_log_files,
+        f"Delete session logs older than {settings.LOG_RETENTION_DAYS} days",
+    )
+    scheduler.register(
+        "archive_completed_reports",
+        settings.SCHEDULE_ARCHIVE_REPORTS,
+        ReportArchiveService.archive_completed,
+        f"Move reports completed over {settings.REPORT_ARCHIVE_AFTER_DAYS} days ago to zgloszenia_archiwum",
+    )
+    scheduler.register(
+        "purge_report_pii",
+        settings.SCHEDULE_PURGE_PII,
+        RetentionService.purge_pii,
+        f"{settings.PII_RETENTION_MODE.capitalize()} reporter data of reports completed over "
+        f"{settings.PII_RETENTION_DAYS} days ago",
+    )
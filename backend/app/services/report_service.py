@@ -1,14 +1,27 @@
 """Report service for business logic."""
+import heapq
 from datetime import datetime, time, timezone
-from typing import List, Optional
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import Row, func, select
 from sqlalchemy.orm import Session
 
-from app.db.models import Account, Report
+from app.api.v1.endpoints.websocket.manager import manager as ws_manager
+from app.api.v1.endpoints.websocket.topics import REPORT_CREATED, city_topic, report_type_topic
+from app.core.cache import AVG_RESPONSE_TIME_KEY, public_cache
+from app.core.cities import city_dictionary, normalize_city, prefix_upper_bound
+from app.core.recommendations import Recommendation, candidate_from_row, recommendation_index
+from app.core.timeutil import as_utc
+from app.db.models import Account, ArchivedReport, ChatMessage, Report
+from app.db.spatial import bounding_box, haversine_km, report_geo_rtree
+from app.schemas.limits import REPORT_PROBLEM_PREVIEW_MAX
 from app.schemas.report import ReportCreate, ReportUpdate
-from app.schemas.account import deserialize_availability, is_active_now_from_slots
+from app.schemas.account import cached_availability, is_active_now_from_slots
+from app.services.analytics_service import ReportAnalyticsService
+from app.services.latency_service import latency_recorder
+from app.services.leaderboard_service import LeaderboardService
 
 
 class ReportService:
@@ -20,8 +33,35 @@ class ReportService:
         return db.query(Report).filter(Report.id == report_id).first()
 
     @staticmethod
-    def _ensure_report_exists(db: Session, report_id: int) -> Report:
-        report = ReportService.get_report_by_id(db, report_id)
+    def get_report_including_archived(db: Session, report_id: int) -> Optional[Report | ArchivedReport]:
+        """Get a live report by ID, falling back to the archive (read-only use)."""
+        return ReportService.get_report_by_id(db, report_id) or db.get(ArchivedReport, report_id)
+
+    @staticmethod
+    def get_reports_by_ids(db: Session, report_ids: List[int]) -> Dict[int, Report | ArchivedReport]:
+        """Fetch reports with one IN query, keyed by id in the order requested.
+
+        Ids not in the live table are looked up in the archive with a second
+        IN query. Duplicate ids are collapsed; unknown ids are left out.
+        """
+        wanted = list(dict.fromkeys(report_ids))
+        if not wanted:
+            return {}
+        found = {report.id: report for report in db.query(Report).filter(Report.id.in_(wanted))}
+        cold = [report_id for report_id in wanted if report_id not in found]
+        if cold:
+            found.update(
+                (report.id, report)
+                for report in db.query(ArchivedReport).filter(ArchivedReport.id.in_(cold))
+            )
+        return {report_id: found[report_id] for report_id in wanted if report_id in found}
+
+    @staticmethod
+    def _ensure_report_exists(db: Session, report_id: int, include_archived: bool = False) -> Report:
+        if include_archived:
+            report = ReportService.get_report_including_archived(db, report_id)
+        else:
+            report = ReportService.get_report_by_id(db, report_id)
         if not report:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -30,17 +70,15 @@ class ReportService:
         return report
     
     @staticmethod
-    def get_all_reports(
+    def _open_reports_query(
         db: Session,
-        skip: int = 0,
-        limit: int = 100,
         report_type_id: Optional[int] = None,
         city: Optional[str] = None,
         search: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
-    ) -> List[Report]:
-        """Get all unaccepted and uncompleted reports with optional filters and pagination."""
+    ):
+        """Build the filtered query over unaccepted and uncompleted reports."""
         # Exclude reports currently assigned to any volunteer
         assigned_ids = (
             select(Account.active_report)
@@ -56,8 +94,13 @@ class ReportService:
         if report_type_id:
             query = query.filter(Report.report_type_id == report_type_id)
         
-        if city:
-            query = query.filter(Report.city.ilike(f"%{city}%"))
+        city_prefix = normalize_city(city)
+        if city_prefix:
+            # Prefix match on the normalized key: an index range scan
+            query = query.filter(
+                Report.city_key >= city_prefix,
+                Report.city_key < prefix_upper_bound(city_prefix),
+            )
 
         if search:
             pattern = f"%{search}%"
@@ -78,9 +121,189 @@ class ReportService:
             else:
                 end_dt = datetime.combine(date_to, time.max)
             query = query.filter(Report.reported_at <= end_dt)
-        
+
+        return query
+
+    @staticmethod
+    def get_all_reports(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        report_type_id: Optional[int] = None,
+        city: Optional[str] = None,
+        search: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[Report]:
+        """Get all unaccepted and uncompleted reports with optional filters and pagination."""
+        query = ReportService._open_reports_query(
+            db,
+            report_type_id=report_type_id,
+            city=city,
+            search=search,
+            date_from=date_from,
+            date_to=date_to,
+        )
         return query.order_by(Report.reported_at.desc()).offset(skip).limit(limit).all()
+
+    @staticmethod
+    def get_report_summaries(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        report_type_id: Optional[int] = None,
+        city: Optional[str] = None,
+        search: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+    ) -> List[Row]:
+        """Same listing as `get_all_reports`, selecting only the board columns.
+
+        The problem text is truncated in SQL so the long `problem` and
+        `report_details` values never leave the database.
+        """
+        query = ReportService._open_reports_query(
+            db,
+            report_type_id=report_type_id,
+            city=city,
+            search=search,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        return (
+            query.with_entities(
+                Report.id,
+                Report.full_name,
+                Report.age,
+                Report.address,
+                Report.city,
+                Report.report_type_id,
+                func.substr(Report.problem, 1, REPORT_PROBLEM_PREVIEW_MAX).label("problem_preview"),
+                (func.length(Report.problem) > REPORT_PROBLEM_PREVIEW_MAX).label("problem_truncated"),
+                Report.contact_ok,
+                Report.is_reviewed,
+                Report.reported_at,
+            )
+            .order_by(Report.reported_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
     
+    @staticmethod
+    def get_nearby_reports(
+        db: Session,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 50,
+        report_type_id: Optional[int] = None,
+    ) -> List[Tuple[Report, float]]:
+        """Open reports within `radius_km` of a point, nearest first.
+
+        Candidates come from a bounding-box lookup on the spatial index, so the
+        cost follows the number of reports in the box rather than the table;
+        exact great-circle distances are then computed for those rows only.
+        Returns `(report, distance_km)` pairs.
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        query = ReportService._open_reports_query(db, report_type_id=report_type_id)
+        if db.get_bind().dialect.name == "sqlite":
+            rtree = report_geo_rtree.c
+            query = query.filter(
+                Report.id.in_(
+                    select(rtree.id).where(
+                        rtree.max_lat >= min_lat,
+                        rtree.min_lat <= max_lat,
+                        rtree.max_lon >= min_lon,
+                        rtree.min_lon <= max_lon,
+                    )
+                )
+            )
+        else:
+            query = query.filter(
+                Report.latitude.between(min_lat, max_lat),
+                Report.longitude.between(min_lon, max_lon),
+            )
+
+        # Rank on (id, lat, lon) only; full rows are loaded for the page alone
+        distances = []
+        for report_id, report_lat, report_lon in query.with_entities(
+            Report.id, Report.latitude, Report.longitude
+        ):
+            distance = haversine_km(latitude, longitude, report_lat, report_lon)
+            if distance <= radius_km:
+                distances.append((distance, report_id))
+        nearest = heapq.nsmallest(limit, distances)
+        if not nearest:
+            return []
+        reports = {
+            report.id: report
+            for report in db.query(Report).filter(Report.id.in_([report_id for _, report_id in nearest]))
+        }
+        return [(reports[report_id], distance) for distance, report_id in nearest]
+
+    @staticmethod
+    def get_recommended_reports(
+        db: Session,
+        volunteer: Account,
+        limit: int = 10,
+    ) -> List[Tuple[Report, Recommendation]]:
+        """Open reports ranked for `volunteer`, best first.
+
+        Ranking uses the in-memory candidate index (city match, the
+        volunteer's completed-type history, wait time and reporter age). The
+        winners are re-read with the open-report filter so reports claimed
+        through another worker since the last index refresh are dropped.
+        """
+        recommendation_index.ensure_loaded(partial(ReportService._load_candidates, db))
+        history = recommendation_index.type_history(
+            volunteer.email,
+            partial(ReportService._load_type_history, db, volunteer.email),
+        )
+        ranked = recommendation_index.rank(volunteer.city, history, limit=limit * 2)
+        if not ranked:
+            return []
+        reports = {
+            report.id: report
+            for report in ReportService._open_reports_query(db).filter(
+                Report.id.in_([item.report_id for item in ranked])
+            )
+        }
+        return [(reports[item.report_id], item) for item in ranked if item.report_id in reports][:limit]
+
+    @staticmethod
+    def _load_candidates(db: Session):
+        rows = ReportService._open_reports_query(db).with_entities(
+            Report.id, Report.city, Report.report_type_id, Report.reported_at, Report.age
+        )
+        return [candidate_from_row(row) for row in rows]
+
+    @staticmethod
+    def _load_type_history(db: Session, email: str) -> dict:
+        history: dict = {}
+        for model in (Report, ArchivedReport):
+            rows = (
+                db.query(model.report_type_id, func.count(model.id))
+                .filter(model.completed_by_email == email)
+                .group_by(model.report_type_id)
+            )
+            for report_type_id, count in rows:
+                history[report_type_id] = history.get(report_type_id, 0) + count
+        return history
+
+    @staticmethod
+    def _index_open_report(report: Report) -> None:
+        recommendation_index.add(
+            candidate_from_row(
+                (report.id, report.city, report.report_type_id, report.reported_at, report.age)
+            )
+        )
+
+    @staticmethod
+    def _is_assigned(db: Session, report_id: int) -> bool:
+        return db.query(Account.email).filter(Account.active_report == report_id).first() is not None
+
     @staticmethod
     def get_reports_by_reporter(
         db: Session, 
@@ -109,19 +332,39 @@ class ReportService:
             age=report_data.age,
             address=report_data.address,
             city=report_data.city,
+            latitude=report_data.latitude,
+            longitude=report_data.longitude,
             problem=report_data.problem,
             contact_ok=report_data.contact_ok,
             report_type_id=report_data.report_type_id,
             report_details=report_data.report_details,
             reporter_email=reporter_email,
             is_reviewed=report_data.is_reviewed,
+            reported_at=datetime.now(timezone.utc),
         )
         
         db.add(new_report)
+        ReportAnalyticsService.record_created(db, new_report)
         db.commit()
         db.refresh(new_report)
+        ReportService._index_open_report(new_report)
+        city_dictionary.observe(new_report.city)
+        ReportService._announce_created(new_report)
         
         return new_report
+
+    @staticmethod
+    def _announce_created(report: Report) -> None:
+        """Tell the report's city and type topic subscribers (public fields only)."""
+        event = {
+            "type": REPORT_CREATED,
+            "report_id": report.id,
+            "city": report.city,
+            "report_type_id": report.report_type_id,
+            "reported_at": as_utc(report.reported_at).isoformat(),
+        }
+        for topic in (city_topic(report.city), report_type_topic(report.report_type_id)):
+            ws_manager.publish_threadsafe(topic, event)
     
     @staticmethod
     def update_report(
@@ -136,11 +379,18 @@ class ReportService:
         
         # Update fields if provided
         update_data = report_data.model_dump(exclude_unset=True)
+        old_type_id, old_city_key = report.report_type_id, report.city_key
         for field, value in update_data.items():
             setattr(report, field, value)
+        if (report.report_type_id, report.city_key) != (old_type_id, old_city_key):
+            ReportAnalyticsService.record_moved(db, report, old_type_id, old_city_key)
         
         db.commit()
         db.refresh(report)
+        if "city" in update_data:
+            city_dictionary.observe(report.city)
+        if report.completed_at is None and not ReportService._is_assigned(db, report.id):
+            ReportService._index_open_report(report)
         
         return report
     
@@ -151,8 +401,11 @@ class ReportService:
         if not report:
             return False
         
+        db.query(ChatMessage).filter(ChatMessage.report_id == report_id).delete(synchronize_session=False)
+        ReportAnalyticsService.record_removed(db, report)
         db.delete(report)
         db.commit()
+        recommendation_index.discard(report_id)
         return True
 
     @staticmethod
@@ -185,12 +438,18 @@ class ReportService:
         volunteer.active_report = report_id
         if not report.is_reviewed:
             report.is_reviewed = True
-        if not report.accepted_at:
+        first_acceptance = not report.accepted_at
+        if first_acceptance:
             report.accepted_at = datetime.now(timezone.utc)
+            ReportAnalyticsService.record_accepted(db, report)
 
         db.commit()
         db.refresh(volunteer)
         db.refresh(report)
+        recommendation_index.discard(report_id)
+        if first_acceptance:
+            public_cache.invalidate(AVG_RESPONSE_TIME_KEY)
+            latency_recorder.record_accepted(report)
         return report
 
     @staticmethod
@@ -209,6 +468,8 @@ class ReportService:
         db.commit()
         db.refresh(volunteer)
         db.refresh(report)
+        if report.completed_at is None:
+            ReportService._index_open_report(report)
         return report
 
     @staticmethod
@@ -230,10 +491,15 @@ class ReportService:
         report.is_reviewed = True
         report.completed_at = datetime.now(timezone.utc)
         report.completed_by_email = volunteer.email
+        ReportAnalyticsService.record_completed(db, report)
 
         db.commit()
         db.refresh(volunteer)
         db.refresh(report)
+        recommendation_index.discard(report.id)
+        recommendation_index.record_completion(volunteer.email, report.report_type_id)
+        LeaderboardService.invalidate_for(volunteer)
+        latency_recorder.record_completed(report)
         return report
     
     @staticmethod
@@ -273,24 +539,20 @@ class ReportService:
 
         if not manual_active_exists:
             schedule_active_exists = False
-            accounts = db.query(Account).all()
-            for account in accounts:
-                try:
-                    slots = deserialize_availability(account.availability_json)
-                except ValueError:
-                    slots = []
-                if is_active_now_from_slots(slots):
+            schedules = db.query(Account.availability_json).distinct()
+            for (raw_schedule,) in schedules:
+                if is_active_now_from_slots(cached_availability(raw_schedule)):
                     schedule_active_exists = True
                     break
 
             if not schedule_active_exists:
                 return None
 
-        rows = (
-            db.query(Report.reported_at, Report.accepted_at)
-            .filter(Report.accepted_at.isnot(None))
-            .all()
-        )
+        rows = [
+            row
+            for model in (Report, ArchivedReport)
+            for row in db.query(model.reported_at, model.accepted_at).filter(model.accepted_at.isnot(None))
+        ]
         if not rows:
             return None
 
@@ -317,13 +579,21 @@ class ReportService:
         volunteer_email: str,
         skip: int = 0,
         limit: int = 100,
-    ) -> List[Report]:
-        """Return reports completed by the given volunteer."""
-        return (
-            db.query(Report)
-            .filter(Report.completed_by_email == volunteer_email)
-            .order_by(Report.completed_at.desc())
-            .offset(skip)
-            .limit(limit)
+    ) -> List[Report | ArchivedReport]:
+        """Return reports completed by the given volunteer, newest first.
+
+        Reads the live table and the archive; each side returns at most
+        `skip + limit` rows from its `completed_by_email` index and the two
+        sorted lists are merged.
+        """
+        window = skip + limit
+        sides = [
+            db.query(model)
+            .filter(model.completed_by_email == volunteer_email)
+            .order_by(model.completed_at.desc(), model.id.desc())
+            .limit(window)
             .all()
-        )
+            for model in (Report, ArchivedReport)
+        ]
+        merged = heapq.merge(*sides, key=lambda report: (as_utc(report.completed_at), report.id), reverse=True)
+        return list(merged)[skip:window]
@@ -0,0 +1,155 @@
+"""Retention purge of reporter personal data on old reports."""
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.timeutil import as_utc
+from app.db.models import ArchivedReport, ChatMessage, JobProgress, Report
+
+logger = logging.getLogger(__name__)
+
+REDACTED_TEXT = "[dane usunięte]"
+REDACTED_PHONE = "0" * 9
+REDACTED_VALUES = {
+    "full_name": REDACTED_TEXT,
+    "phone": REDACTED_PHONE,
+    "age": 0,
+    "address": REDACTED_TEXT,
+    "latitude": None,
+    "longitude": None,
+    "contact_ok": False,
+}
+RETENTION_MODES = ("redact", "delete")
+
+
+class RetentionService:
+    """Service redacting (or deleting) reports past the PII retention window."""
+
+    @staticmethod
+    def purge_pii(
+        db: Session,
+        retention_days: int = settings.PII_RETENTION_DAYS,
+        mode: str = settings.PII_RETENTION_MODE,
+        batch_size: int = settings.PII_RETENTION_BATCH_SIZE,
+        pause_seconds: float = settings.PII_RETENTION_PAUSE_SECONDS,
+        max_seconds: Optional[float] = settings.PII_RETENTION_MAX_SECONDS,
+        now: Optional[datetime] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> dict:
+        """Purge reports completed more than `retention_days` ago, live and archived.
+
+        Each table is walked in `(completed_at, id)` order from a cursor
+        stored in `postep_zadan`. Every batch is a short transaction that
+        also advances the cursor, followed by a pause, so an interrupted or
+        time-boxed run resumes where it stopped and the next run only visits
+        newly eligible reports. Chat messages of purged reports are deleted
+        in both modes.
+        """
+        if mode not in RETENTION_MODES:
+            raise ValueError(f"Unknown retention mode '{mode}', expected one of {RETENTION_MODES}")
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+        started = time.perf_counter()
+        deadline = None if max_seconds is None else started + max_seconds
+        processed = batches = 0
+        finished = True
+        for model in (ArchivedReport, Report):
+            table_processed, table_batches, table_finished = RetentionService._purge_table(
+                db, model, cutoff, mode, batch_size, pause_seconds, deadline, sleep
+            )
+            processed += table_processed
+            batches += table_batches
+            if not table_finished:
+                finished = False
+                break
+        elapsed = time.perf_counter() - started
+        result = {
+            "mode": mode,
+            "processed": processed,
+            "batches": batches,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(processed / elapsed, 1) if elapsed > 0 else None,
+            "finished": finished,
+        }
+        logger.info("PII retention purge: %s", result)
+        return result
+
+    @staticmethod
+    def _purge_table(
+        db: Session,
+        model,
+        cutoff: datetime,
+        mode: str,
+        batch_size: int,
+        pause_seconds: float,
+        deadline: Optional[float],
+        sleep: Callable[[float], None],
+    ) -> Tuple[int, int, bool]:
+        """Process one table until caught up or out of time: `(rows, batches, finished)`."""
+        progress_name = f"pii_retention:{model.__tablename__}"
+        progress = db.get(JobProgress, progress_name)
+        if progress is None:
+            progress = JobProgress(name=progress_name, processed=0)
+            db.add(progress)
+            db.commit()
+        position = RetentionService._decode_cursor(progress.cursor)
+
+        processed = batches = 0
+        while True:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return processed, batches, False
+            query = db.query(model.id, model.completed_at).filter(
+                model.completed_at.isnot(None), model.completed_at < cutoff
+            )
+            if position is not None:
+                last_completed, last_id = position
+                query = query.filter(
+                    or_(
+                        model.completed_at > last_completed,
+                        and_(model.completed_at == last_completed, model.id > last_id),
+                    )
+                )
+            rows = query.order_by(model.completed_at, model.id).limit(batch_size).all()
+            if not rows:
+                return processed, batches, True
+
+            ids = [row.id for row in rows]
+            db.execute(
+                delete(ChatMessage)
+                .where(ChatMessage.report_id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            if mode == "delete":
+                statement = delete(model).where(model.id.in_(ids))
+            else:
+                statement = update(model).where(model.id.in_(ids)).values(**REDACTED_VALUES)
+            db.execute(statement.execution_options(synchronize_session=False))
+
+            position = (as_utc(rows[-1].completed_at), rows[-1].id)
+            progress.cursor = RetentionService._encode_cursor(position)
+            progress.processed = (progress.processed or 0) + len(ids)
+            progress.updated_at = datetime.now(timezone.utc)
+            db.commit()
+            processed += len(ids)
+            batches += 1
+            if len(rows) < batch_size:
+                return processed, batches, True
+            if pause_seconds:
+                sleep(pause_seconds)
+
+    @staticmethod
+    def _encode_cursor(position: Tuple[datetime, int]) -> str:
+        completed_at, report_id = position
+        return json.dumps({"completed_at": completed_at.isoformat(), "id": report_id})
+
+    @staticmethod
+    def _decode_cursor(raw: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        if not raw:
+            return None
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["completed_at"]), int(data["id"])
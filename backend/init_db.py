@@ -1,6 +1,7 @@
 """Initialize database tables."""
 from app.db.database import engine, Base
 from app.db.models import User, Account, Report, ReportType
+import app.db.spatial  # noqa: F401 - registers the SQLite R*Tree for nearby search
 
 
 def init_db():
@@ -0,0 +1,163 @@
+"""Fixtures and the regression gate for the hot-path micro-benchmarks.
+
+Each run is compared with a pinned baseline: `BENCH_BASELINE` (default
+`perf/baseline.json`). The run fails when a benchmark's median is more than
+`BENCH_MAX_SLOWDOWN` (default 0.5, i.e. 50%) slower than in the baseline.
+Medians are compared because they were the steadier statistic in repeated
+runs (up to ~45% apart on a busy machine, minimums up to ~60%); tighten the
+threshold on a quiet, dedicated runner.
+`BENCH_SAVE_BASELINE=1` writes the baseline from a run, but only from one
+that passed, so a regression never becomes the reference. Without a
+baseline file the run is reported but not gated.
+
+Seeded table sizes come from `BENCH_REPORT_ROWS` (comma-separated, default
+`10000`); use `BENCH_REPORT_ROWS=10000,100000,1000000` for the full matrix.
+Databases are seeded with `scripts/generate_data.py` and cached per size and
+schema fingerprint under the pytest cache directory, so a checkout with
+different tables or indexes seeds its own copy instead of reusing a stale one.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+pytest.importorskip("pytest_benchmark")
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.dialects import sqlite  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.schema import CreateIndex, CreateTable  # noqa: E402
+
+from app.db.database import Base  # noqa: E402
+from app.db.models import Report  # noqa: E402
+from scripts.generate_data import DataGenerator  # noqa: E402
+
+SEED_BATCH_SIZE = 10_000
+
+BASELINE_PATH = Path(os.getenv("BENCH_BASELINE", Path(__file__).resolve().parent.parent / "baseline.json"))
+# Relative median slowdown that fails the run; kept above the measured run-to-run noise
+MAX_SLOWDOWN = float(os.getenv("BENCH_MAX_SLOWDOWN", "0.5"))
+SAVE_BASELINE = os.getenv("BENCH_SAVE_BASELINE", "") not in ("", "0")
+
+
+def find_regressions(baseline: Dict[str, dict], results: Dict[str, dict], max_slowdown: float) -> List[str]:
+    """Describe every benchmark whose median grew by more than `max_slowdown`."""
+    regressions = []
+    for name, current in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference or not reference.get("median"):
+            continue
+        slowdown = current["median"] / reference["median"] - 1
+        if slowdown > max_slowdown:
+            regressions.append(
+                f"{name}: median {current['median'] * 1e6:.1f}us vs {reference['median'] * 1e6:.1f}us "
+                f"(+{slowdown:.0%}, limit +{max_slowdown:.0%})"
+            )
+    return regressions
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    """Gate the run on the pinned baseline and optionally re-pin it."""
+    benchmarks = getattr(session.config, "_benchmarksession", None)
+    if benchmarks is None:
+        return
+    results = {
+        bench.fullname: {"min": bench.stats.min, "median": bench.stats.median}
+        for bench in benchmarks.benchmarks
+        if bench and bench.stats
+    }
+    if not results:
+        return
+    reporter = session.config.pluginmanager.get_plugin("terminalreporter")
+
+    def report(line: str, **markup) -> None:
+        if reporter is not None:
+            reporter.write_line(line, **markup)
+
+    baseline: Dict[str, dict] = {}
+    if BASELINE_PATH.exists():
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))["benchmarks"]
+        regressions = find_regressions(baseline, results, MAX_SLOWDOWN)
+        for line in regressions:
+            report(f"REGRESSION {line}", red=True)
+        if regressions and session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+    else:
+        report(f"No benchmark baseline at {BASELINE_PATH}; results are not gated", yellow=True)
+
+    if SAVE_BASELINE:
+        if session.exitstatus != pytest.ExitCode.OK:
+            report("Run failed; baseline left unchanged", yellow=True)
+            return
+        # Merge, so a run filtered with -k only re-pins the benchmarks it ran
+        baseline.update(results)
+        BASELINE_PATH.write_text(json.dumps({"benchmarks": baseline}, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        report(f"Baseline written to {BASELINE_PATH}")
+
+
+def report_row_sizes():
+    raw = os.getenv("BENCH_REPORT_ROWS", "10000")
+    return [int(value) for value in raw.split(",") if value.strip()]
+
+
+def weekly_availability_json() -> str:
+    """A realistic schedule: two slots on each weekday."""
+    slots = []
+    for day in range(5):
+        slots.append({"day_of_week": day, "start_time": "08:00:00", "end_time": "12:00:00", "is_active": True})
+        slots.append({"day_of_week": day, "start_time": "16:00:00", "end_time": "20:00:00", "is_active": True})
+    return json.dumps(slots)
+
+
+def schema_fingerprint() -> str:
+    """Short hash of the SQLite DDL for every mapped table and index."""
+    dialect = sqlite.dialect()
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=dialect)))
+        statements.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name or "")
+        )
+    return hashlib.sha256("\n".join(statements).encode("utf-8")).hexdigest()[:12]
+
+
+def _seed(engine, rows: int) -> None:
+    generator = DataGenerator(engine, seed=rows, batch_size=SEED_BATCH_SIZE)
+    generator.run(accounts=max(10, rows // 100), reports=rows, password="Benchmark123", log=lambda _: None)
+
+
+@pytest.fixture(scope="session", params=report_row_sizes(), ids=lambda rows: f"{rows}rows")
+def seeded_session(request):
+    """Session over a SQLite file seeded with `rows` reports (built once, then reused)."""
+    rows = request.param
+    cache_dir = request.config.cache.mkdir("bench-db")
+    path = cache_dir / f"reports-{rows}-{schema_fingerprint()}.db"
+    # Drop copies seeded for another schema (and the unversioned name used before)
+    for stale in [cache_dir / f"reports-{rows}.db", *cache_dir.glob(f"reports-{rows}-*.db")]:
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    if not path.exists() or _count_reports(engine) != rows:
+        engine.dispose()
+        path.unlink(missing_ok=True)
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        _seed(engine, rows)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        yield db
+    engine.dispose()
+
+
+def _count_reports(engine) -> int:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(Report)).scalar_one()
+    except Exception:
+        return -1
@@ -0,0 +1,83 @@
+"""Micro-benchmarks for request hot paths.
+
+Run from `backend/`:
+
+    python -m pytest -c perf/pytest.ini perf/benchmarks
+    BENCH_REPORT_ROWS=10000,100000,1000000 python -m pytest -c perf/pytest.ini perf/benchmarks
+
+Pin a baseline on the reference machine with `BENCH_SAVE_BASELINE=1`; later
+runs fail when a median is more than `BENCH_MAX_SLOWDOWN` slower than in it
+(see `conftest.py`).
+"""
+from datetime import datetime
+
+import pytest
+
+from app.core.security import create_access_token, decode_access_token
+from app.db.models import Account, Report
+from app.schemas import AccountOut, ReportOut
+from app.schemas.account import deserialize_availability, is_active_now_from_slots
+from app.services.report_service import ReportService
+
+from .conftest import weekly_availability_json
+
+AVAILABILITY_JSON = weekly_availability_json()
+# Wednesday 17:30 – inside the second slot, so every earlier slot is checked
+REFERENCE_MOMENT = datetime(2025, 1, 8, 17, 30)
+
+
+def _account() -> Account:
+    return Account(
+        email="volunteer@example.com",
+        full_name="Jan Kowalski",
+        phone="123456789",
+        city="Warszawa",
+        password_hash="x",
+        is_active=False,
+        resolved_cases=12,
+        resolved_cases_this_year=4,
+        genpoints=120,
+        availability_json=AVAILABILITY_JSON,
+    )
+
+
+def test_deserialize_availability(benchmark):
+    slots = benchmark(deserialize_availability, AVAILABILITY_JSON)
+    assert len(slots) == 10
+
+
+def test_is_active_now_from_slots(benchmark):
+    slots = deserialize_availability(AVAILABILITY_JSON)
+    assert benchmark(is_active_now_from_slots, slots, REFERENCE_MOMENT) is True
+
+
+def test_account_out_serialization(benchmark):
+    account = _account()
+
+    def serialize():
+        return AccountOut.model_validate(account).model_dump(mode="json")
+
+    payload = benchmark(serialize)
+    assert payload["email"] == account.email
+
+
+def test_report_out_serialization(benchmark, seeded_session):
+    reports = seeded_session.query(Report).limit(100).all()
+
+    def serialize():
+        return [ReportOut.model_validate(report).model_dump(mode="json") for report in reports]
+
+    assert len(benchmark(serialize)) == 100
+
+
+def test_access_token_roundtrip(benchmark):
+    def roundtrip():
+        return decode_access_token(create_access_token({"sub": "volunteer@example.com"}))
+
+    assert benchmark(roundtrip) == "volunteer@example.com"
+
+
+@pytest.mark.parametrize("city", [None, "Kraków"], ids=["all", "city"])
+def test_get_all_reports(benchmark, seeded_session, city):
+    reports = benchmark(ReportService.get_all_reports, seeded_session, limit=100, city=city)
+    assert all(report.accepted_at is None for report in reports)
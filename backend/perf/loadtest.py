@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""HTTP load test with scripted GenLink traffic scenarios.
+
+Run against a live server (e.g. `uvicorn app.main:app --workers 4`):
+
+  python perf/loadtest.py run --base-url http://localhost:8000 --duration 60 \
+      --volunteers 50 --kiosks 5 --racers 10 --visitors 20 --output results/head.json
+
+Compare two saved runs (e.g. from two commits):
+
+  python perf/loadtest.py compare results/base.json results/head.json
+
+Scenarios:
+  volunteers – log in, then poll `GET /reports/` every `--poll-interval` seconds
+  kiosks     – submit a new report every `--kiosk-interval` seconds
+  racers     – all racers accept the same fresh report at once; the winner cancels
+  visitors   – anonymous hits on `/accounts/volunteers/active` and the public metric
+
+Each request is timed per endpoint; the summary reports throughput and
+p50/p95/p99 latency, and `--output` stores it as JSON with the git commit.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+PASSWORD = "LoadTest123"
+
+FIRST_NAMES = ["Anna", "Jan", "Maria", "Piotr", "Krystyna", "Andrzej", "Barbara", "Stanisław", "Zofia", "Józef"]
+LAST_NAMES = ["Nowak", "Kowalski", "Wiśniewska", "Wójcik", "Kamińska", "Lewandowski", "Zielińska", "Szymański"]
+CITIES = ["Warszawa", "Kraków", "Łódź", "Wrocław", "Poznań", "Gdańsk", "Szczecin", "Lublin"]
+STREETS = ["Długa", "Polna", "Leśna", "Słoneczna", "Krótka", "Szkolna", "Ogrodowa", "Lipowa"]
+PROBLEMS = [
+    "Nie potrafię zalogować się do aplikacji banku na telefonie",
+    "Dostałem podejrzanego SMS-a z linkiem do dopłaty za przesyłkę",
+    "Telefon nie łączy się z siecią Wi-Fi po aktualizacji",
+    "Nie wiem jak umówić wizytę u lekarza przez internet",
+    "Ktoś dzwonił podając się za wnuczka i prosił o pieniądze",
+]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # Same rank as QuantileSketch.quantile: the smallest value with `fraction` of the data at or below it
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    """Collect latency samples and status codes per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, name: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.statuses[name][type(exc).__name__] += 1
+            return None
+        self.latencies[name].append(time.perf_counter() - start)
+        self.statuses[name][str(response.status_code)] += 1
+        return response
+
+    def summary(self, duration: float) -> Dict[str, dict]:
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.statuses)):
+            values = sorted(self.latencies.get(name, []))
+            statuses = self.statuses.get(name, Counter())
+            # 4xx such as 409 on a lost accept race are expected outcomes
+            failures = sum(
+                count for code, count in statuses.items() if not code.isdigit() or code.startswith("5")
+            )
+            endpoints[name] = {
+                "requests": len(values),
+                "throughput_rps": round(len(values) / duration, 2) if duration else 0.0,
+                "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+                "failures": failures,
+                "statuses": dict(statuses),
+            }
+        return endpoints
+
+
+def _report_payload() -> dict:
+    return {
+        "full_name": f"{random.choice(FIRST_NAMES)} {random.choice(LAST_NAMES)}",
+        "phone": "".join(random.choice("0123456789") for _ in range(9)),
+        "age": random.randint(60, 95),
+        "address": f"ul. {random.choice(STREETS)} {random.randint(1, 120)}",
+        "city": random.choice(CITIES),
+        "problem": random.choice(PROBLEMS),
+        "contact_ok": True,
+        "report_type_id": random.randint(1, 5),
+        "report_details": "Zgłoszenie z testu obciążeniowego",
+    }
+
+
+async def _login(client: httpx.AsyncClient, email: str) -> dict:
+    await client.post(
+        "/api/v1/accounts/register",
+        json={
+            "email": email,
+            "password": PASSWORD,
+            "full_name": "Wolontariusz Testowy",
+            "phone": "500600700",
+            "city": random.choice(CITIES),
+        },
+    )
+    response = await client.post("/api/v1/accounts/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def volunteer_poller(client, recorder: Recorder, headers: dict, deadline: float, interval: float):
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.monotonic() < deadline:
+        await recorder.request(
+            client, "GET", "/api/v1/reports/", "GET /reports/", headers=headers, params={"limit": 100}
+        )
+        await asyncio.sleep(interval)
+
+
+async def kiosk(client, recorder: Recorder, deadline: float, interval: float):
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.monotonic() < deadline:
+        await recorder.request(client, "POST", "/api/v1/reports/", "POST /reports/", json=_report_payload())
+        await asyncio.sleep(interval)
+
+
+async def accept_race(client, recorder: Recorder, racers: List[dict], deadline: float, interval: float):
+    while time.monotonic() < deadline:
+        created = await recorder.request(
+            client, "POST", "/api/v1/reports/", "POST /reports/", json=_report_payload()
+        )
+        if created is None or created.status_code != 201:
+            await asyncio.sleep(interval)
+            continue
+        report_id = created.json()["id"]
+        responses = await asyncio.gather(
+            *(
+                recorder.request(
+                    client,
+                    "POST",
+                    f"/api/v1/reports/{report_id}/accept",
+                    "POST /reports/{id}/accept",
+                    headers=headers,
+                )
+                for headers in racers
+            )
+        )
+        for headers, response in zip(racers, responses):
+            if response is not None and response.status_code == 200:
+                await recorder.request(
+                    client, "POST", "/api/v1/reports/active/cancel", "POST /reports/active/cancel",
+                    headers=headers,
+                )
+        await asyncio.sleep(interval)
+
+
+async def visitor(client, recorder: Recorder, deadline: float, interval: float):
+    await asyncio.sleep(random.uniform(0, interval))
+    while time.monotonic() < deadline:
+        await recorder.request(
+            client, "GET", "/api/v1/accounts/volunteers/active", "GET /accounts/volunteers/active"
+        )
+        await recorder.request(
+            client, "GET", "/api/v1/reports/metrics/avg-response-time", "GET /reports/metrics/avg-response-time"
+        )
+        await asyncio.sleep(interval)
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    recorder = Recorder()
+    total_clients = args.volunteers + args.kiosks + args.racers + args.visitors
+    limits = httpx.Limits(max_connections=max(total_clients, 1), max_keepalive_connections=max(total_clients, 1))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        print(f"Preparing {args.volunteers} volunteers and {args.racers} racers...")
+        volunteer_headers = await asyncio.gather(
+            *(_login(client, f"loadtest-volunteer-{index}@example.com") for index in range(args.volunteers))
+        )
+        racer_headers = await asyncio.gather(
+            *(_login(client, f"loadtest-racer-{index}@example.com") for index in range(args.racers))
+        )
+        for headers in racer_headers:
+            # Leftovers from an interrupted run would block new acceptances
+            await client.post("/api/v1/reports/active/cancel", headers=headers)
+
+        print(f"Running for {args.duration}s...")
+        started = time.monotonic()
+        deadline = started + args.duration
+        tasks = [volunteer_poller(client, recorder, h, deadline, args.poll_interval) for h in volunteer_headers]
+        tasks += [kiosk(client, recorder, deadline, args.kiosk_interval) for _ in range(args.kiosks)]
+        if racer_headers:
+            tasks.append(accept_race(client, recorder, list(racer_headers), deadline, args.race_interval))
+        tasks += [visitor(client, recorder, deadline, args.visitor_interval) for _ in range(args.visitors)]
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "base_url": args.base_url,
+            "duration_s": round(elapsed, 2),
+            "volunteers": args.volunteers,
+            "kiosks": args.kiosks,
+            "racers": args.racers,
+            "visitors": args.visitors,
+        },
+        "endpoints": recorder.summary(elapsed),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_summary(result: dict) -> None:
+    meta = result["meta"]
+    print(f"\nCommit {meta.get('git_commit')} – {meta['duration_s']}s against {meta['base_url']}")
+    header = f"{'endpoint':<42}{'req':>8}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'fail':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in result["endpoints"].items():
+        print(
+            f"{name:<42}{stats['requests']:>8}{stats['throughput_rps']:>9}"
+            f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}{stats['failures']:>7}"
+        )
+
+
+def compare(base_path: Path, head_path: Path) -> None:
+    base = json.loads(base_path.read_text(encoding="utf-8"))
+    head = json.loads(head_path.read_text(encoding="utf-8"))
+    print(f"base {base['meta'].get('git_commit')} -> head {head['meta'].get('git_commit')}")
+    header = f"{'endpoint':<42}{'metric':>10}{'base':>10}{'head':>10}{'change':>10}"
+    print(header)
+    print("-" * len(header))
+    for name in sorted(set(base["endpoints"]) | set(head["endpoints"])):
+        before = base["endpoints"].get(name)
+        after = head["endpoints"].get(name)
+        if before is None or after is None:
+            print(f"{name:<42}{'only in ' + ('head' if before is None else 'base'):>40}")
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            old, new = before[metric], after[metric]
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{name:<42}{metric:>10}{old:>10}{new:>10}{change:>10}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the scenarios against a server")
+    run.add_argument("--base-url", default="http://localhost:8000")
+    run.add_argument("--duration", type=float, default=60.0, help="seconds")
+    run.add_argument("--volunteers", type=int, default=20)
+    run.add_argument("--kiosks", type=int, default=2)
+    run.add_argument("--racers", type=int, default=5)
+    run.add_argument("--visitors", type=int, default=10)
+    run.add_argument("--poll-interval", type=float, default=2.0)
+    run.add_argument("--kiosk-interval", type=float, default=5.0)
+    run.add_argument("--race-interval", type=float, default=3.0)
+    run.add_argument("--visitor-interval", type=float, default=1.0)
+    run.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    run.add_argument("--output", type=Path, help="write the results as JSON")
+
+    diff = commands.add_parser("compare", help="compare two saved runs")
+    diff.add_argument("base", type=Path)
+    diff.add_argument("head", type=Path)
+
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        compare(args.base, args.head)
+        return
+
+    result = asyncio.run(run_load(args))
+    print_summary(result)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
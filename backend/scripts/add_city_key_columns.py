@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Add and backfill the normalized city key on 'zgloszenia' and 'konta'.
+
+Usage:
+  python scripts/add_city_key_columns.py path/to/users.db
+
+Adds the column 'miejscowosc_klucz' (case-folded, diacritics stripped,
+trimmed 'miejscowosc') to both tables, fills it for existing rows in
+batches and creates the indexes used by the city filters. Safe to re-run:
+rows whose key is already up to date are left untouched.
+
+A timestamped backup of the database will be created before altering the tables.
+"""
+
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.cities import normalize_city  # noqa: E402
+
+# table -> key column used to walk it in batches
+TABLES = {"zgloszenia": "id", "konta": "login_email"}
+BATCH_SIZE = 5_000
+
+
+def backup(db_path: Path) -> Path:
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    backup_path = db_path.with_suffix(f".bak.{ts}")
+    shutil.copy2(db_path, backup_path)
+    return backup_path
+
+
+def column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    cur = conn.execute(f"PRAGMA table_info('{table}')")
+    return any(row[1] == column for row in cur.fetchall())
+
+
+def ensure_city_key_columns(conn: sqlite3.Connection) -> None:
+    for table in TABLES:
+        if column_exists(conn, table, "miejscowosc_klucz"):
+            print(f"Column 'miejscowosc_klucz' already present on '{table}' — skipping.")
+            continue
+        print(f"Adding column 'miejscowosc_klucz' to table '{table}'")
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN miejscowosc_klucz VARCHAR;")
+    conn.commit()
+
+
+def backfill(conn: sqlite3.Connection, table: str, key_column: str) -> int:
+    """Recompute keys in keyset-ordered batches; return the number of rows changed."""
+    changed = 0
+    last = None
+    while True:
+        where = f"WHERE {key_column} > ?" if last is not None else ""
+        rows = conn.execute(
+            f"SELECT {key_column}, miejscowosc, miejscowosc_klucz FROM {table} {where} "
+            f"ORDER BY {key_column} LIMIT ?",
+            ((last,) if last is not None else ()) + (BATCH_SIZE,),
+        ).fetchall()
+        if not rows:
+            return changed
+        updates = [
+            (normalize_city(city), row_key)
+            for row_key, city, current in rows
+            if normalize_city(city) != current
+        ]
+        conn.executemany(f"UPDATE {table} SET miejscowosc_klucz = ? WHERE {key_column} = ?", updates)
+        conn.commit()
+        changed += len(updates)
+        last = rows[-1][0]
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    for table in TABLES:
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{table}_miejscowosc_klucz ON {table} (miejscowosc_klucz);"
+        )
+    conn.commit()
+
+
+def migrate(db_path: Path) -> None:
+    if not db_path.exists():
+        raise SystemExit(f"DB not found: {db_path}")
+
+    print(f"Backing up DB: {db_path}")
+    bak = backup(db_path)
+    print(f"Backup created: {bak}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        ensure_city_key_columns(conn)
+        for table, key_column in TABLES.items():
+            changed = backfill(conn, table, key_column)
+            print(f"Backfilled {changed} rows in '{table}'")
+        ensure_indexes(conn)
+        print("City key indexes ready.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/add_city_key_columns.py path/to/db.sqlite")
+        raise SystemExit(2)
+
+    migrate(Path(sys.argv[1]))
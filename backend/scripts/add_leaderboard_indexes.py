@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Create the leaderboard indexes on 'konta'.
+
+Usage:
+  python scripts/add_leaderboard_indexes.py path/to/users.db
+
+Adds descending score indexes (GenPoints and reports resolved this year),
+globally and per normalized city, used to read the top volunteers in order
+and to count the accounts above a volunteer's score. Requires the
+'miejscowosc_klucz' column (scripts/add_city_key_columns.py). Safe to re-run.
+
+A timestamped backup of the database will be created before altering the table.
+"""
+
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+INDEXES = {
+    "ix_konta_genpoints": "genpoints DESC, login_email",
+    "ix_konta_miejscowosc_klucz_genpoints": "miejscowosc_klucz, genpoints DESC, login_email",
+    "ix_konta_ten_rok": "rozwiazane_sprawy_ten_rok DESC, login_email",
+    "ix_konta_miejscowosc_klucz_ten_rok": "miejscowosc_klucz, rozwiazane_sprawy_ten_rok DESC, login_email",
+}
+
+
+def backup(db_path: Path) -> Path:
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    backup_path = db_path.with_suffix(f".bak.{ts}")
+    shutil.copy2(db_path, backup_path)
+    return backup_path
+
+
+def column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    cur = conn.execute(f"PRAGMA table_info('{table}')")
+    return any(row[1] == column for row in cur.fetchall())
+
+
+def migrate(db_path: Path) -> None:
+    if not db_path.exists():
+        raise SystemExit(f"DB not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        if not column_exists(conn, "konta", "miejscowosc_klucz"):
+            raise SystemExit("Column 'miejscowosc_klucz' missing — run scripts/add_city_key_columns.py first.")
+
+        print(f"Backing up DB: {db_path}")
+        bak = backup(db_path)
+        print(f"Backup created: {bak}")
+
+        for name, columns in INDEXES.items():
+            print(f"Creating index '{name}' on 'konta' ({columns})")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON konta ({columns});")
+        conn.execute("ANALYZE konta;")
+        conn.commit()
+        print("Leaderboard indexes ready.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/add_leaderboard_indexes.py path/to/db.sqlite")
+        raise SystemExit(2)
+
+    migrate(Path(sys.argv[1]))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Add optional coordinates to 'zgloszenia' and 'konta' plus the nearby-search index.
+
+Usage:
+  python scripts/add_location_columns.py path/to/users.db
+
+Adds the nullable REAL columns 'szerokosc_geo' (latitude) and 'dlugosc_geo'
+(longitude) to both tables, then creates the R*Tree index over open reports
+used by GET /reports/nearby together with the triggers that keep it in sync.
+
+A timestamped backup of the database will be created before altering the tables.
+"""
+
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.db.spatial import (  # noqa: E402
+    REPORT_GEO_RTREE_BACKFILL,
+    REPORT_GEO_RTREE_DDL,
+)
+
+LOCATION_COLUMNS = ("szerokosc_geo", "dlugosc_geo")
+
+
+def backup(db_path: Path) -> Path:
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    backup_path = db_path.with_suffix(f".bak.{ts}")
+    shutil.copy2(db_path, backup_path)
+    return backup_path
+
+
+def column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    cur = conn.execute(f"PRAGMA table_info('{table}')")
+    return any(row[1] == column for row in cur.fetchall())
+
+
+def ensure_location_columns(conn: sqlite3.Connection) -> bool:
+    changed = False
+    for table in ("zgloszenia", "konta"):
+        for column in LOCATION_COLUMNS:
+            if column_exists(conn, table, column):
+                print(f"Column '{column}' already present on '{table}' — skipping.")
+                continue
+            print(f"Adding column '{column}' to table '{table}'")
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} REAL;")
+            changed = True
+    conn.commit()
+    return changed
+
+
+def ensure_spatial_index(conn: sqlite3.Connection) -> None:
+    print("Creating R*Tree index and triggers for nearby search (if missing)")
+    for statement in REPORT_GEO_RTREE_DDL:
+        conn.execute(statement)
+    conn.execute(REPORT_GEO_RTREE_BACKFILL)
+    conn.commit()
+
+
+def migrate(db_path: Path) -> None:
+    if not db_path.exists():
+        raise SystemExit(f"DB not found: {db_path}")
+
+    print(f"Backing up DB: {db_path}")
+    bak = backup(db_path)
+    print(f"Backup created: {bak}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        if ensure_location_columns(conn):
+            print("Columns added successfully.")
+        ensure_spatial_index(conn)
+        print("Spatial index ready.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/add_location_columns.py path/to/db.sqlite")
+        raise SystemExit(2)
+
+    migrate(Path(sys.argv[1]))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Prepare an existing database for report archiving.
+
+Usage:
+  python scripts/add_report_archive.py path/to/users.db
+
+Creates the 'zgloszenia_archiwum' table (same columns as 'zgloszenia' plus
+'data_archiwizacji') with its indexes, and the index on
+'zgloszenia.completed_at' the archiver uses to find old completed reports.
+The archiver itself runs as the 'archive_completed_reports' scheduled job.
+Safe to re-run.
+
+A timestamped backup of the database will be created before altering the tables.
+"""
+
+import shutil
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ARCHIVE_DDL = """
+CREATE TABLE IF NOT EXISTS zgloszenia_archiwum (
+    id INTEGER NOT NULL PRIMARY KEY,
+    imie_nazwisko VARCHAR NOT NULL,
+    nr_tel VARCHAR(9) NOT NULL,
+    wiek INTEGER NOT NULL,
+    adres VARCHAR NOT NULL,
+    miejscowosc VARCHAR NOT NULL,
+    miejscowosc_klucz VARCHAR,
+    szerokosc_geo FLOAT,
+    dlugosc_geo FLOAT,
+    problem TEXT NOT NULL,
+    czy_do_kontaktu BOOLEAN NOT NULL,
+    is_reviewed BOOLEAN NOT NULL,
+    typ_zgloszenia_id INTEGER NOT NULL,
+    reporter_email VARCHAR,
+    zgloszenie_szczegoly TEXT,
+    data_zgloszenia DATETIME NOT NULL,
+    accepted_at DATETIME,
+    completed_at DATETIME NOT NULL,
+    completed_by_email VARCHAR,
+    data_archiwizacji DATETIME NOT NULL
+);
+"""
+
+INDEXES = {
+    "ix_zgloszenia_completed_at": "zgloszenia (completed_at)",
+    "ix_zgloszenia_archiwum_typ_zgloszenia_id": "zgloszenia_archiwum (typ_zgloszenia_id)",
+    "ix_zgloszenia_archiwum_miejscowosc_klucz": "zgloszenia_archiwum (miejscowosc_klucz)",
+    "ix_zgloszenia_archiwum_completed_at": "zgloszenia_archiwum (completed_at)",
+    "ix_zgloszenia_archiwum_completed_by_email": "zgloszenia_archiwum (completed_by_email)",
+}
+
+
+def backup(db_path: Path) -> Path:
+    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    backup_path = db_path.with_suffix(f".bak.{ts}")
+    shutil.copy2(db_path, backup_path)
+    return backup_path
+
+
+def migrate(db_path: Path) -> None:
+    if not db_path.exists():
+        raise SystemExit(f"DB not found: {db_path}")
+
+    print(f"Backing up DB: {db_path}")
+    bak = backup(db_path)
+    print(f"Backup created: {bak}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        print("Creating table 'zgloszenia_archiwum' (if missing)")
+        conn.execute(ARCHIVE_DDL)
+        for name, target in INDEXES.items():
+            print(f"Creating index '{name}' on {target}")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target};")
+        conn.commit()
+        print("Report archive ready.")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/add_report_archive.py path/to/db.sqlite")
+        raise SystemExit(2)
+
+    migrate(Path(sys.argv[1]))
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""Bulk-generate a synthetic GenLink dataset for benchmarking and demos.
+
+Usage:
+  python scripts/generate_data.py --accounts 100000 --reports 1000000
+  python scripts/generate_data.py --accounts 500 --reports 5000 --database-url sqlite:///./demo.db
+
+Generates volunteer accounts (cities, availability schedules, GenPoints) and
+reports in every lifecycle state (open, reviewed, accepted, completed) with
+Polish names, addresses, coordinates and problem descriptions. Rows are written with
+batched multi-row inserts; the same --seed always produces the same data.
+
+All generated accounts share one password (--password) so that only a single
+bcrypt hash has to be computed. Data is appended to an existing database;
+report ids continue after the current maximum.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine, func, insert, update  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.core.cities import normalize_city  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.database import Base  # noqa: E402
+from app.db.models import Account, Report, ReportType  # noqa: E402
+import app.db.spatial  # noqa: E402,F401 - registers the SQLite R*Tree
+from app.services.analytics_service import ReportAnalyticsService  # noqa: E402
+from app.services.latency_service import LatencyMetricsService  # noqa: E402
+from app.services.type_service import ReportTypeService  # noqa: E402
+
+FIRST_NAMES = [
+    "Anna", "Maria", "Katarzyna", "Małgorzata", "Agnieszka", "Barbara", "Ewa", "Krystyna",
+    "Elżbieta", "Zofia", "Jadwiga", "Halina", "Teresa", "Danuta", "Irena", "Grażyna",
+    "Jan", "Andrzej", "Piotr", "Krzysztof", "Stanisław", "Tomasz", "Paweł", "Józef",
+    "Marcin", "Marek", "Michał", "Grzegorz", "Jerzy", "Tadeusz", "Łukasz", "Zbigniew",
+]
+LAST_NAMES = [
+    "Nowak", "Kowalski", "Wiśniewski", "Wójcik", "Kowalczyk", "Kamiński", "Lewandowski",
+    "Zieliński", "Szymański", "Woźniak", "Dąbrowski", "Kozłowski", "Jankowski", "Mazur",
+    "Kwiatkowski", "Krawczyk", "Piotrowski", "Grabowski", "Nowakowski", "Pawłowski",
+    "Michalski", "Król", "Wieczorek", "Jabłoński", "Wróbel", "Majewski", "Olszewski",
+]
+# (city, relative weight, latitude, longitude) – larger cities get more rows
+CITIES = [
+    ("Warszawa", 18, 52.2297, 21.0122), ("Kraków", 8, 50.0647, 19.9450),
+    ("Łódź", 7, 51.7592, 19.4560), ("Wrocław", 6, 51.1079, 17.0385),
+    ("Poznań", 5, 52.4064, 16.9252), ("Gdańsk", 5, 54.3520, 18.6466),
+    ("Szczecin", 4, 53.4285, 14.5528), ("Bydgoszcz", 3, 53.1235, 18.0084),
+    ("Lublin", 3, 51.2465, 22.5684), ("Białystok", 3, 53.1325, 23.1688),
+    ("Katowice", 3, 50.2649, 19.0238), ("Gdynia", 2, 54.5189, 18.5305),
+    ("Częstochowa", 2, 50.8118, 19.1203), ("Radom", 2, 51.4027, 21.1471),
+    ("Toruń", 2, 53.0138, 18.5984), ("Rzeszów", 2, 50.0412, 21.9991),
+    ("Kielce", 2, 50.8661, 20.6286), ("Olsztyn", 2, 53.7784, 20.4801),
+    ("Opole", 1, 50.6751, 17.9213), ("Zielona Góra", 1, 51.9356, 15.5062),
+    ("Gorzów Wielkopolski", 1, 52.7368, 15.2288), ("Nowy Sącz", 1, 49.6175, 20.7153),
+    ("Zakopane", 1, 49.2992, 19.9496), ("Sopot", 1, 54.4416, 18.5601),
+]
+# Coordinates are scattered up to ~0.1° (roughly 10 km) around the city centre
+LOCATION_JITTER_DEGREES = 0.1
+STREETS = [
+    "Długa", "Krótka", "Polna", "Leśna", "Słoneczna", "Ogrodowa", "Lipowa", "Kościuszki",
+    "Mickiewicza", "Sienkiewicza", "Piłsudskiego", "Kolejowa", "Szkolna", "Łąkowa",
+    "Żeromskiego", "Wojska Polskiego", "3 Maja", "Jana Pawła II", "Kwiatowa", "Brzozowa",
+]
+PROBLEMS = {
+    "Aplikacje": [
+        "Nie umiem zainstalować aplikacji mObywatel na telefonie.",
+        "Aplikacja do wideorozmów z wnukami przestała działać po aktualizacji.",
+        "Nie wiem, jak zapisać się do lekarza przez Internetowe Konto Pacjenta.",
+        "Zniknęły mi ikony z ekranu telefonu i nie mogę znaleźć poczty.",
+    ],
+    "Bezpieczeństwo": [
+        "Dostałem SMS-a o dopłacie do przesyłki z dziwnym linkiem.",
+        "Ktoś dzwonił, podając się za wnuczka, i prosił o pieniądze.",
+        "Na komputerze wyskakują okienka, że mam wirusa i muszę zadzwonić.",
+        "Chyba ktoś zna moje hasło do poczty, przychodzą dziwne wiadomości.",
+    ],
+    "Kontakt i połączenia": [
+        "Telefon nie łączy się z domowym Wi-Fi.",
+        "Nie słyszę rozmówcy podczas połączeń, choć głośność jest ustawiona.",
+        "Nie potrafię dodać nowego kontaktu do książki telefonicznej.",
+        "Internet w telefonie działa bardzo wolno od kilku dni.",
+    ],
+    "Płatności i bankowość": [
+        "Nie mogę zalogować się do bankowości internetowej.",
+        "Nie wiem, jak zapłacić rachunek za prąd przez internet.",
+        "Karta zbliżeniowa nie działa przy płatności telefonem.",
+        "Bank prosi o potwierdzenie w aplikacji, a ja nie wiem gdzie.",
+    ],
+    "Inne": [
+        "Potrzebuję pomocy z wydrukowaniem dokumentu z poczty e-mail.",
+        "Nie umiem ustawić większej czcionki na tablecie.",
+        "Chciałabym nauczyć się wysyłać zdjęcia rodzinie.",
+        "Telewizor po aktualizacji nie pokazuje kanałów.",
+    ],
+}
+PROBLEM_DETAILS = [
+    None,
+    "Najlepiej kontaktować się po południu.",
+    "Proszę dzwonić dwa razy, słabo słyszę dzwonek.",
+    "Mam telefon z systemem Android, kupiony dwa lata temu.",
+    "Korzystam z laptopa z Windows 10.",
+]
+
+# Share of reports per lifecycle state (the rest stays open)
+COMPLETED_SHARE = 0.6
+ACCEPTED_SHARE = 0.1
+REVIEWED_OPEN_SHARE = 0.3
+ACTIVE_VOLUNTEER_SHARE = 0.15
+AVAILABILITY_TEMPLATES = 64
+
+
+def ascii_fold(value: str) -> str:
+    """`Łukasz Wiśniewski` -> `lukasz wisniewski` (for generated e-mails)."""
+    value = value.replace("ł", "l").replace("Ł", "L")
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def availability_templates(rng: random.Random) -> List[str]:
+    """A pool of realistic weekly schedules, serialized once and shared by accounts."""
+    templates = ["[]"]
+    while len(templates) < AVAILABILITY_TEMPLATES:
+        slots = []
+        for day in sorted(rng.sample(range(7), rng.randint(1, 5))):
+            start = rng.randint(7, 18)
+            end = min(22, start + rng.randint(1, 5))
+            slots.append(
+                {
+                    "day_of_week": day,
+                    "start_time": f"{start:02d}:00:00",
+                    "end_time": f"{end:02d}:00:00",
+                    "is_active": rng.random() > 0.05,
+                }
+            )
+        templates.append(json.dumps(slots))
+    return templates
+
+
+class DataGenerator:
+    """Generate and insert synthetic accounts and reports."""
+
+    def __init__(self, engine, seed: int = 2025, batch_size: int = 10_000, days: int = 365):
+        self.engine = engine
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.days = days
+        self.now = datetime.now(timezone.utc)
+        self._cities = CITIES
+        self._city_weights = [weight for _, weight, _, _ in CITIES]
+
+    def city(self) -> Tuple[str, float, float]:
+        """Pick a city and a point near its centre: (name, latitude, longitude)."""
+        name, _, latitude, longitude = self.rng.choices(self._cities, self._city_weights)[0]
+        return (
+            name,
+            round(latitude + self.rng.uniform(-LOCATION_JITTER_DEGREES, LOCATION_JITTER_DEGREES), 6),
+            round(longitude + self.rng.uniform(-LOCATION_JITTER_DEGREES, LOCATION_JITTER_DEGREES), 6),
+        )
+
+    def full_name(self) -> str:
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        if first.endswith("a") and last.endswith("ski"):
+            last = last[:-1] + "a"
+        return f"{first} {last}"
+
+    def phone(self) -> str:
+        return f"{self.rng.choice('5678')}{self.rng.randrange(10 ** 8):08d}"
+
+    def run(self, accounts: int, reports: int, password: str, log=print) -> Dict[str, float]:
+        """Insert `accounts` volunteers and `reports` reports; return timing stats."""
+        Base.metadata.create_all(bind=self.engine)
+        started = time.perf_counter()
+        with Session(bind=self.engine) as db:
+            ReportTypeService.ensure_default_types(db)
+            types = {type_id: name for type_id, name in db.query(ReportType.id, ReportType.name)}
+            first_id = (db.query(func.max(Report.id)).scalar() or 0) + 1
+
+            emails = self._insert_accounts(db, accounts, get_password_hash(password), log)
+            log(f"✓ {accounts} accounts in {time.perf_counter() - started:.1f}s")
+
+            reports_started = time.perf_counter()
+            stats = self._insert_reports(db, reports, first_id, emails, types, log)
+            log(f"✓ {reports} reports in {time.perf_counter() - reports_started:.1f}s")
+
+            self._update_volunteer_stats(db, stats)
+            rollup = ReportAnalyticsService.rebuild(db)
+            log(f"✓ {rollup['rows']} analytics rollup rows in {rollup['seconds']:.1f}s")
+            sketches = LatencyMetricsService.rebuild(db)
+            log(f"✓ {sketches['sketches']} response-time sketches in {sketches['seconds']:.1f}s")
+        elapsed = time.perf_counter() - started
+        return {
+            "accounts": accounts,
+            "reports": reports,
+            "seconds": round(elapsed, 2),
+            "rows_per_second": round((accounts + reports) / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def _insert_accounts(self, db: Session, count: int, password_hash: str, log) -> List[str]:
+        templates = availability_templates(self.rng)
+        suffix = self.rng.randrange(10 ** 6)
+        emails: List[str] = []
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for index in range(offset, min(count, offset + self.batch_size)):
+                name = self.full_name()
+                city, latitude, longitude = self.city()
+                located = self.rng.random() < 0.95
+                email = f"{ascii_fold(name).replace(' ', '.')}.{suffix}.{index}@example.pl"
+                emails.append(email)
+                batch.append(
+                    {
+                        "email": email,
+                        "full_name": name,
+                        "phone": self.phone() if self.rng.random() < 0.8 else None,
+                        "password_hash": password_hash,
+                        "is_active": self.rng.random() < 0.1,
+                        "city": city if located else None,
+                        "city_key": normalize_city(city) if located else None,
+                        "latitude": latitude if located else None,
+                        "longitude": longitude if located else None,
+                        "availability_json": self.rng.choice(templates),
+                    }
+                )
+            db.execute(insert(Account), batch)
+            db.commit()
+            log(f"  accounts: {len(emails)}/{count}")
+        return emails
+
+    def _insert_reports(
+        self,
+        db: Session,
+        count: int,
+        first_id: int,
+        emails: List[str],
+        types: Dict[int, str],
+        log,
+    ) -> Dict[str, dict]:
+        """Insert reports; return per-volunteer completion and active-report stats."""
+        type_ids = list(types)
+        city_keys = {name: normalize_city(name) for name, _, _, _ in CITIES}
+        stats: Dict[str, dict] = {}
+        free_volunteers = self.rng.sample(emails, int(len(emails) * ACTIVE_VOLUNTEER_SHARE))
+        this_year = self.now.year
+        window = timedelta(days=self.days).total_seconds()
+
+        for offset in range(0, count, self.batch_size):
+            batch = []
+            for index in range(offset, min(count, offset + self.batch_size)):
+                report_id = first_id + index
+                type_id = self.rng.choice(type_ids)
+                reported_at = self.now - timedelta(seconds=self.rng.random() * window)
+                city, latitude, longitude = self.city()
+                row = {
+                    "id": report_id,
+                    "full_name": self.full_name(),
+                    "phone": self.phone(),
+                    "age": self.rng.randint(60, 95),
+                    "address": f"ul. {self.rng.choice(STREETS)} {self.rng.randint(1, 150)}",
+                    "city": city,
+                    "city_key": city_keys[city],
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "problem": self.rng.choice(PROBLEMS.get(types[type_id], PROBLEMS["Inne"])),
+                    "contact_ok": self.rng.random() < 0.9,
+                    "is_reviewed": False,
+                    "report_type_id": type_id,
+                    "reporter_email": None,
+                    "report_details": self.rng.choice(PROBLEM_DETAILS),
+                    "reported_at": reported_at,
+                    "accepted_at": None,
+                    "completed_at": None,
+                    "completed_by_email": None,
+                }
+                roll = self.rng.random()
+                if emails and roll < COMPLETED_SHARE:
+                    accepted_at = reported_at + timedelta(minutes=self.rng.expovariate(1 / 90))
+                    completed_at = min(self.now, accepted_at + timedelta(minutes=self.rng.randint(15, 240)))
+                    volunteer = self.rng.choice(emails)
+                    row.update(
+                        is_reviewed=True,
+                        accepted_at=min(accepted_at, completed_at),
+                        completed_at=completed_at,
+                        completed_by_email=volunteer,
+                    )
+                    entry = stats.setdefault(volunteer, {"resolved": 0, "this_year": 0, "active": None})
+                    entry["resolved"] += 1
+                    entry["this_year"] += completed_at.year == this_year
+                elif free_volunteers and roll < COMPLETED_SHARE + ACCEPTED_SHARE:
+                    accepted_at = reported_at + timedelta(minutes=self.rng.expovariate(1 / 90))
+                    row.update(is_reviewed=True, accepted_at=min(accepted_at, self.now))
+                    volunteer = free_volunteers.pop()
+                    stats.setdefault(volunteer, {"resolved": 0, "this_year": 0, "active": None})
+                    stats[volunteer]["active"] = report_id
+                else:
+                    row["is_reviewed"] = self.rng.random() < REVIEWED_OPEN_SHARE
+                batch.append(row)
+            db.execute(insert(Report), batch)
+            db.commit()
+            log(f"  reports: {min(count, offset + self.batch_size)}/{count}")
+        return stats
+
+    def _update_volunteer_stats(self, db: Session, stats: Dict[str, dict]) -> None:
+        """Write resolved counters, GenPoints and active reports (bulk UPDATE by key)."""
+        rows = [
+            {
+                "email": email,
+                "resolved_cases": entry["resolved"],
+                "resolved_cases_this_year": entry["this_year"],
+                "genpoints": entry["resolved"] * 10,
+                "active_report": entry["active"],
+            }
+            for email, entry in stats.items()
+        ]
+        for offset in range(0, len(rows), self.batch_size):
+            db.execute(update(Account), rows[offset:offset + self.batch_size])
+            db.commit()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic GenLink dataset")
+    parser.add_argument("--accounts", type=int, default=1_000, help="volunteer accounts to create")
+    parser.add_argument("--reports", type=int, default=10_000, help="reports to create")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="rows per INSERT batch")
+    parser.add_argument("--days", type=int, default=365, help="spread reports over this many past days")
+    parser.add_argument("--seed", type=int, default=2025, help="random seed (same seed, same data)")
+    parser.add_argument("--password", default="Haslo12345", help="password shared by generated accounts")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="target database URL")
+    args = parser.parse_args(argv)
+
+    engine = create_engine(
+        args.database_url,
+        connect_args={"check_same_thread": False} if "sqlite" in args.database_url else {},
+    )
+    generator = DataGenerator(engine, seed=args.seed, batch_size=args.batch_size, days=args.days)
+    print(f"Generating {args.accounts} accounts and {args.reports} reports into {args.database_url}")
+    result = generator.run(args.accounts, args.reports, args.password)
+    print(f"✓ Done in {result['seconds']}s ({result['rows_per_second']} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Bulk-import volunteer accounts from a CSV or JSON file.
+
+Usage:
+  python scripts/import_volunteers.py volunteers.csv
+  python scripts/import_volunteers.py partner.json --workers 8 --database-url sqlite:///./users.db
+
+CSV files need a header row: email,password,full_name,phone,city,latitude,
+longitude,is_active,availability (only email, password and full_name are
+required; availability is a JSON list of slots). JSON files hold a list of
+objects with the same keys, or {"accounts": [...]}; the format is picked
+from the file extension unless --format is given.
+
+Passwords are hashed in a process pool, emails that already exist are
+skipped, and accounts are inserted in batches. Rejected rows are printed
+with their reason; the exit code is 1 when any row failed.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db.database import Base  # noqa: E402
+from app.services.import_service import AccountImportService  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="CSV or JSON file with volunteers")
+    parser.add_argument("--format", choices=("csv", "json"), help="Defaults to the file extension")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.ACCOUNT_IMPORT_WORKERS,
+        help="Password hashing processes (0 = one per CPU)",
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.ACCOUNT_IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if not args.path.exists():
+        print(f"File not found: {args.path}")
+        return 2
+    fmt = args.format or ("json" if args.path.suffix.lower() == ".json" else "csv")
+    try:
+        records = AccountImportService.parse(args.path.read_text(encoding="utf-8"), fmt)
+    except (UnicodeDecodeError, ValueError) as exc:
+        print(f"Cannot read {args.path}: {exc}")
+        return 2
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as db:
+        result = AccountImportService.import_accounts(
+            db, records, workers=args.workers, batch_size=args.batch_size
+        )
+
+    for error in result.errors:
+        print(f"  row {error.row} ({error.email or '-'}): {error.error}")
+    print(
+        f"Imported {result.created} of {result.total} accounts in {result.seconds:.2f}s "
+        f"({result.rows_per_second or 0:.1f}/s), {result.failed} failed"
+    )
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
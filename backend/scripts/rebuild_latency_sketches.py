@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Backfill the response-time percentile sketches from report history.
+
+Usage:
+  python scripts/rebuild_latency_sketches.py
+  python scripts/rebuild_latency_sketches.py --database-url sqlite:///./users.db
+
+Creates 'szkice_opoznien' if it is missing and replaces its contents with
+sketches built from every accepted report in 'zgloszenia' and
+'zgloszenia_archiwum' (overall, per report type and per UTC day). The API
+keeps the sketches up to date from then on; run this once after upgrading
+or after bulk-loading reports outside the API. Safe to re-run.
+
+Stop the API workers first: observations they have buffered but not yet
+flushed are already in the report tables, so their next flush would count
+them a second time.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db.models import LatencySketch  # noqa: E402
+from app.services.latency_service import LatencyMetricsService  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill response-time percentile sketches")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="target database URL")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    LatencySketch.__table__.create(bind=engine, checkfirst=True)
+    with Session(bind=engine) as db:
+        result = LatencyMetricsService.rebuild(db)
+    print(
+        f"✓ Built {result['sketches']} sketches from {result['observations']} observations "
+        f"in {result['seconds']}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
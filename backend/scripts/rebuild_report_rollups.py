@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Rebuild the report analytics rollup table from the reports themselves.
+
+Usage:
+  python scripts/rebuild_report_rollups.py
+  python scripts/rebuild_report_rollups.py --database-url sqlite:///./users.db
+
+Creates 'statystyki_dzienne' if it is missing and recomputes every row
+(per UTC day, report type and city: created, accepted and completed counts
+plus response-time sums) from 'zgloszenia' and 'zgloszenia_archiwum' in one
+transaction. The API keeps the table up to date incrementally; run this
+once after upgrading, after bulk-loading reports outside the API, or if the
+rollup is suspected to have drifted. Safe to re-run.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db.models import ReportDailyStats  # noqa: E402
+from app.services.analytics_service import ReportAnalyticsService  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the report analytics rollup")
+    parser.add_argument("--database-url", default=settings.DATABASE_URL, help="target database URL")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    ReportDailyStats.__table__.create(bind=engine, checkfirst=True)
+    with Session(bind=engine) as db:
+        result = ReportAnalyticsService.rebuild(db)
+    print(f"✓ Rebuilt {result['rows']} rollup rows in {result['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
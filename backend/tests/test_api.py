@@ -1,11 +1,22 @@
 """Comprehensive API tests for public API endpoints."""
+import asyncio
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from fastapi import WebSocketDisconnect
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core.cache import StaleWhileRevalidateCache, public_cache
+from app.core.cities import city_dictionary, normalize_city
+from app.core.recommendations import recommendation_index
+from app.core.scheduler import CronSchedule, Scheduler, scheduler
+from app.core.compression import negotiate_encoding
+from app.api.v1.endpoints.websocket.backplane import Backplane, InMemoryBackplane, RedisBackplane
+from app.api.v1.endpoints.websocket.manager import ConnectionManager
+from app.services.chat_service import chat_writer
+from app.services.latency_service import latency_recorder
 from app.main import app
 from app.db.database import Base, get_db
 from app.db import models
@@ -26,6 +37,9 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+chat_writer.session_factory = TestingSessionLocal
+scheduler.session_factory = TestingSessionLocal
+latency_recorder.session_factory = TestingSessionLocal
 client = TestClient(app)
 
 
@@ -34,6 +48,10 @@ def setup_database():
     """Reset schema and seed mandatory reference data for every test."""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    public_cache.clear()
+    recommendation_index.clear()
+    city_dictionary.clear()
+    latency_recorder.clear()
     with TestingSessionLocal() as db:
         db.add_all(
             [
@@ -135,6 +153,33 @@ def test_health_check():
     assert response.json()["status"] == "OK"
 
 
+def test_large_responses_are_compressed_small_ones_are_not():
+    headers = _auth_headers(email="gzip@example.com")
+    for _ in range(5):
+        assert _create_report(problem="Długi opis problemu z aplikacją bankową. " * 20).status_code == 201
+
+    listing = client.get("/api/v1/reports/", headers={**headers, "Accept-Encoding": "gzip"})
+    assert listing.status_code == 200
+    assert listing.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in listing.headers["vary"]
+    assert len(listing.json()) == 5
+
+    identity = client.get("/api/v1/reports/", headers={**headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    health = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in health.headers
+
+
+def test_negotiate_encoding_respects_q_values_and_server_order():
+    supported = ["br", "zstd", "gzip"]
+    assert negotiate_encoding("gzip, br", supported) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip", supported) == "gzip"
+    assert negotiate_encoding("*;q=0.1, br;q=0", supported) == "zstd"
+    assert negotiate_encoding("identity", supported) is None
+    assert negotiate_encoding("", supported) is None
+
+
 def test_register_account_success():
     response = _register_account()
     assert response.status_code == 201
@@ -427,8 +472,8 @@ def test_get_all_reports_supports_filters():
     assert all_reports.status_code == 200
     assert len(all_reports.json()) == 2  # Still only first and second
 
-    # city filter (case-insensitive substring) - only unaccepted and uncompleted
-    response = client.get("/api/v1/reports/?city=da", headers=headers)
+    # city filter (prefix of the normalized city) - only unaccepted and uncompleted
+    response = client.get("/api/v1/reports/?city=gda", headers=headers)
     assert response.status_code == 200
     assert len(response.json()) == 1
 
@@ -461,6 +506,213 @@ def test_get_all_reports_supports_filters():
     assert len(response.json()) == 1
 
 
+def test_get_all_reports_summary_view_returns_truncated_projection():
+    headers = _auth_headers(email="summary@example.com")
+    long_problem = "Problem z telefonem. " * 40
+    created = _create_report(problem=long_problem)
+    assert created.status_code == 201
+    _create_report(problem="Krótki opis problemu")
+
+    response = client.get("/api/v1/reports/?view=summary", headers=headers)
+    assert response.status_code == 200
+    items = response.json()
+    assert len(items) == 2
+    long_item = next(item for item in items if item["id"] == created.json()["id"])
+    assert long_item["problem_truncated"] is True
+    assert len(long_item["problem_preview"]) == 200
+    assert long_problem.startswith(long_item["problem_preview"])
+    assert "phone" not in long_item
+    assert "report_details" not in long_item
+    short_item = next(item for item in items if item["id"] != created.json()["id"])
+    assert short_item["problem_truncated"] is False
+    assert short_item["problem_preview"] == "Krótki opis problemu"
+
+    # Filters apply to the summary view exactly as to the full listing
+    filtered = client.get("/api/v1/reports?view=summary&search=telefonem", headers=headers)
+    assert filtered.status_code == 200
+    assert [item["id"] for item in filtered.json()] == [created.json()["id"]]
+
+    # Full details remain available per id
+    detail = client.get(f"/api/v1/reports/{created.json()['id']}", headers=headers)
+    assert detail.status_code == 200
+    assert detail.json()["problem"] == long_problem
+
+
+def test_nearby_reports_ordered_by_distance_and_follow_lifecycle():
+    headers = _auth_headers(email="nearby@example.com")
+    # Warsaw centre, Warsaw suburbs (~12 km), Kraków (~250 km), no coordinates
+    centre = _create_report(latitude=52.2297, longitude=21.0122).json()["id"]
+    suburb = _create_report(latitude=52.1650, longitude=20.8600).json()["id"]
+    _create_report(latitude=50.0647, longitude=19.9450)
+    _create_report()
+
+    response = client.get("/api/v1/reports/nearby?lat=52.23&lon=21.01&radius=20", headers=headers)
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["id"] for item in items] == [centre, suburb]
+    assert items[0]["distance_km"] < 1 < items[1]["distance_km"] < 20
+
+    small = client.get("/api/v1/reports/nearby?lat=52.23&lon=21.01&radius=5", headers=headers)
+    assert [item["id"] for item in small.json()] == [centre]
+
+    # Moved, accepted and completed reports follow the index
+    with TestingSessionLocal() as db:
+        moved_report = db.get(models.Report, suburb)
+        moved_report.latitude, moved_report.longitude = 52.2290, 21.0100
+        db.commit()
+    assert client.post(f"/api/v1/reports/{centre}/accept", headers=headers).status_code == 200
+    moved = client.get("/api/v1/reports/nearby?lat=52.23&lon=21.01&radius=5", headers=headers)
+    assert [item["id"] for item in moved.json()] == [suburb]
+    assert client.post("/api/v1/reports/active/complete", headers=headers).status_code == 200
+    assert client.get(
+        "/api/v1/reports/nearby?lat=52.23&lon=21.01&radius=5", headers=headers
+    ).json()[0]["id"] == suburb
+
+    # Without lat/lon the account location is used
+    missing = client.get("/api/v1/reports/nearby", headers=headers)
+    assert missing.status_code == 400
+    client.put("/api/v1/accounts/me", headers=headers, json={"latitude": 50.06, "longitude": 19.94})
+    own = client.get("/api/v1/reports/nearby?radius=10", headers=headers)
+    assert own.status_code == 200
+    assert len(own.json()) == 1
+    assert client.get("/api/v1/reports/nearby?lat=52.2", headers=headers).status_code == 400
+
+
+def test_recommended_reports_rank_by_city_history_and_follow_claims():
+    volunteer = _auth_headers(email="polecane@example.com")
+    client.put("/api/v1/accounts/me", headers=volunteer, json={"city": "Kraków"})
+
+    # History: one completed "Bezpieczeństwo" (type 2) report
+    done = _create_report(city="Gdańsk", report_type_id=2).json()["id"]
+    client.post(f"/api/v1/reports/{done}/accept", headers=volunteer)
+    client.post("/api/v1/reports/active/complete", headers=volunteer)
+
+    elsewhere = _create_report(city="Gdańsk", report_type_id=1, age=90).json()["id"]
+    local = _create_report(city=" kraków ", report_type_id=1, age=30).json()["id"]
+    local_familiar = _create_report(city="Kraków", report_type_id=2, age=30).json()["id"]
+
+    response = client.get("/api/v1/reports/recommended", headers=volunteer)
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["id"] for item in items] == [local_familiar, local, elsewhere]
+    assert items[0]["reasons"] == ["same_city", "familiar_type"]
+    assert "senior_reporter" in items[2]["reasons"]
+    assert items[0]["score"] > items[1]["score"] > items[2]["score"]
+
+    # Incremental updates: a claim by someone else removes the report,
+    # a newly created report appears without a reload
+    other = _auth_headers(email="inny@example.com")
+    client.post(f"/api/v1/reports/{local_familiar}/accept", headers=other)
+    fresh = _create_report(city="Kraków", report_type_id=2, age=80).json()["id"]
+    reloads = recommendation_index.stats["reloads"]
+    items = client.get("/api/v1/reports/recommended?limit=2", headers=volunteer).json()
+    assert [item["id"] for item in items] == [fresh, local]
+    assert recommendation_index.stats["reloads"] == reloads
+
+    client.post("/api/v1/reports/active/cancel", headers=other)
+    ids = [item["id"] for item in client.get("/api/v1/reports/recommended", headers=volunteer).json()]
+    assert local_familiar in ids
+
+
+def test_recommendation_reload_does_not_block_updates():
+    import threading
+    from collections import Counter
+
+    from app.core.recommendations import Candidate, RecommendationIndex, city_key
+
+    now = datetime.now(timezone.utc)
+
+    def candidate(report_id):
+        return Candidate(report_id, city_key("Kraków"), 1, now - timedelta(hours=report_id), 70)
+
+    index = RecommendationIndex(refresh_interval=0)
+    index.ensure_loaded(lambda: [candidate(1), candidate(2)])
+
+    def slow_loader():
+        # A claim and a new report arrive while the reload is reading the database
+        worker = threading.Thread(target=lambda: (index.discard(1), index.add(candidate(3))))
+        worker.start()
+        worker.join(timeout=2)
+        assert not worker.is_alive()
+        return [candidate(1), candidate(2)]
+
+    index.ensure_loaded(slow_loader)
+    ranked = index.rank("Kraków", Counter(), limit=10)
+    assert sorted(item.report_id for item in ranked) == [2, 3]
+    assert index.stats["reloads"] == 2
+
+
+def test_recommendation_fallback_keeps_reopened_reports_longest_waiting():
+    from collections import Counter
+
+    from app.core.recommendations import FALLBACK_PER_CITY, Candidate, RecommendationIndex, city_key
+
+    now = datetime.now(timezone.utc)
+
+    def candidate(report_id):
+        return Candidate(report_id, city_key("Gdańsk"), 1, now - timedelta(hours=report_id), 70)
+
+    oldest = FALLBACK_PER_CITY + 1
+    index = RecommendationIndex(refresh_interval=3600)
+    index.ensure_loaded(lambda: [candidate(report_id) for report_id in range(1, oldest + 1)])
+    # The oldest report is claimed, then released again
+    index.discard(oldest)
+    index.add(candidate(oldest))
+
+    ranked = index.rank("Kraków", Counter(), limit=100)
+    assert sorted(item.report_id for item in ranked) == list(range(2, oldest + 1))
+
+
+def test_city_filter_matches_normalized_key_and_suggest_autocompletes():
+    assert normalize_city("  KRAKÓW ") == normalize_city("krakow") == "krakow"
+    assert normalize_city("Łódź") == "lodz"
+    assert normalize_city("Zielona   Góra") == "zielona gora"
+
+    headers = _auth_headers(email="miasta@example.com")
+    krakow = _create_report(city="Kraków").json()["id"]
+    krakow_plain = _create_report(city=" krakow ").json()["id"]
+    _create_report(city="Kraśnik")
+    lodz = _create_report(city="Łódź").json()["id"]
+
+    response = client.get("/api/v1/reports/?city=KRAKOW", headers=headers)
+    assert sorted(item["id"] for item in response.json()) == [krakow, krakow_plain]
+    response = client.get("/api/v1/reports/?city=lodz&view=summary", headers=headers)
+    assert [item["id"] for item in response.json()] == [lodz]
+    assert len(client.get("/api/v1/reports/?city=kra", headers=headers).json()) == 3
+
+    suggestions = client.get("/api/v1/cities/suggest?q=KRA")
+    assert suggestions.status_code == 200
+    assert [(item["key"], item["count"]) for item in suggestions.json()] == [("krakow", 2), ("krasnik", 1)]
+    assert suggestions.json()[0]["name"] in {"Kraków", "krakow"}
+
+    # Cities written after the dictionary was built are suggested immediately
+    client.put("/api/v1/accounts/me", headers=headers, json={"city": "Łowicz"})
+    assert [item["name"] for item in client.get("/api/v1/cities/suggest?q=low").json()] == ["Łowicz"]
+    assert client.get("/api/v1/cities/suggest?q=").status_code == 422
+
+
+def test_city_dictionary_reload_does_not_block_lookups():
+    import threading
+
+    from app.core.cities import CityDictionary
+
+    dictionary = CityDictionary(refresh_interval=0)
+    dictionary.ensure_loaded(lambda: [("krakow", "Kraków", 3)])
+
+    def slow_loader():
+        # A city is written and another request autocompletes while the tables are scanned
+        seen = []
+        worker = threading.Thread(target=lambda: (dictionary.observe("Kraśnik"), seen.append(dictionary.suggest("kra"))))
+        worker.start()
+        worker.join(timeout=2)
+        assert not worker.is_alive()
+        assert [key for _, key, _ in seen[0]] == ["krakow", "krasnik"]
+        return [("krakow", "Kraków", 4)]
+
+    dictionary.ensure_loaded(slow_loader)
+    assert [(key, count) for _, key, count in dictionary.suggest("kra")] == [("krakow", 4), ("krasnik", 1)]
+
+
 def test_get_reports_stats_counts_only_pending_reports():
     headers = _auth_headers()
     first = _create_report(headers=headers)
@@ -596,6 +848,61 @@ def test_public_average_response_time_endpoint():
     second_id = second_resp.json()["id"]
 
 
+def test_public_cache_serves_stale_value_while_single_refresh_runs():
+    class _FakeClock:
+        now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    class _DeferredExecutor:
+        def __init__(self):
+            self.jobs = []
+
+        def submit(self, fn, *args):
+            self.jobs.append((fn, args))
+
+    clock = _FakeClock()
+    executor = _DeferredExecutor()
+    cache = StaleWhileRevalidateCache(ttl=5, max_stale=60, executor=executor, clock=clock)
+    calls = []
+
+    def loader():
+        calls.append(clock.now)
+        return len(calls)
+
+    assert cache.get_or_load("k", loader) == 1
+    clock.now = 3
+    assert cache.get_or_load("k", loader) == 1  # fresh hit
+    clock.now = 10
+    assert cache.get_or_load("k", loader) == 1  # stale, refresh scheduled
+    assert cache.get_or_load("k", loader) == 1  # stale, no second refresh
+    assert len(executor.jobs) == 1
+    fn, args = executor.jobs.pop()
+    fn(*args)
+    assert cache.get_or_load("k", loader) == 2
+    assert calls == [0, 10]
+
+    clock.now = 200  # beyond max_stale: synchronous reload
+    assert cache.get_or_load("k", loader) == 3
+    cache.invalidate("k")
+    assert cache.get_or_load("k", loader) == 4
+
+
+def test_public_active_volunteers_cached_until_account_changes():
+    email = "cached@example.com"
+    headers = _auth_headers(email=email)
+
+    first = client.get("/api/v1/accounts/volunteers/active")
+    assert first.status_code == 200
+    assert first.json()["volunteers"] == []
+
+    # Account writes invalidate the cached payload
+    assert client.put("/api/v1/accounts/me", headers=headers, json={"is_active": True}).status_code == 200
+    second = client.get("/api/v1/accounts/volunteers/active")
+    assert [v["email"] for v in second.json()["volunteers"]] == [email]
+
+
 def test_my_accepted_endpoint_returns_id_or_null():
     headers = _auth_headers(email="helper@example.com")
 
@@ -695,3 +1002,1037 @@ def test_update_my_account_requires_token_and_updates():
     response = client.get("/api/v1/accounts/me", headers={"Authorization": f"Bearer {token}"})
     assert response.status_code == 200
     assert response.json()["city"] == "Krakow"
+
+
+def test_websocket_chat_broadcasts_to_all_connections():
+    with TestClient(app) as ws_client:
+        with ws_client.websocket_connect("/api/v1/ws/ws/chat") as first:
+            with ws_client.websocket_connect("/api/v1/ws/ws/chat") as second:
+                first.send_text("hello")
+                assert first.receive_text() == "User: hello"
+                assert second.receive_text() == "User: hello"
+
+
+class _FakeSocket:
+    def __init__(self, stall=False):
+        self.stall = stall
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message):
+        if self.stall:
+            await asyncio.Event().wait()
+        self.sent.append(message)
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+
+
+def test_websocket_topics_deliver_report_events_only_to_subscribers():
+    with TestClient(app) as ws_client:
+        with ws_client.websocket_connect("/api/v1/ws/ws/chat") as krakow:
+            with ws_client.websocket_connect("/api/v1/ws/ws/chat") as gdansk:
+                krakow.send_json({"action": "subscribe", "topic": "city: Kraków "})
+                assert krakow.receive_json() == {"event": "subscribed", "topic": "city:krakow"}
+                gdansk.send_json({"action": "subscribe", "topic": "city:Gdansk"})
+                assert gdansk.receive_json()["event"] == "subscribed"
+                gdansk.send_json({"action": "subscribe", "topic": "report_type:2"})
+                assert gdansk.receive_json()["event"] == "subscribed"
+
+                # Anonymous clients cannot push text to a city's volunteers
+                gdansk.send_json({"action": "publish", "topic": "city:KRAKOW", "message": "Pomoc potrzebna"})
+                assert gdansk.receive_json()["event"] == "error"
+
+                report_id = ws_client.post(
+                    "/api/v1/reports/", json=_report_payload(city="KRAKÓW", report_type_id=2)
+                ).json()["id"]
+                event = krakow.receive_json()
+                assert event["topic"] == "city:krakow"
+                assert event["message"]["type"] == "report_created"
+                assert event["message"]["report_id"] == report_id
+                assert "phone" not in event["message"] and "full_name" not in event["message"]
+                assert gdansk.receive_json()["topic"] == "report_type:2"
+
+                gdansk.send_json({"action": "subscribe", "topic": "report:abc"})
+                assert gdansk.receive_json()["event"] == "error"
+
+                # Plain text still goes to everyone
+                krakow.send_text("hej")
+                assert krakow.receive_text() == "User: hej"
+                assert gdansk.receive_text() == "User: hej"
+
+
+def test_websocket_chat_unregisters_socket_after_unexpected_error(monkeypatch):
+    from app.api.v1.endpoints.websocket.manager import manager as ws_manager
+
+    async def failing_broadcast(message):
+        raise RuntimeError("backplane down")
+
+    with TestClient(app) as ws_client:
+        with pytest.raises(RuntimeError):
+            with ws_client.websocket_connect("/api/v1/ws/ws/chat") as socket:
+                monkeypatch.setattr(ws_manager, "broadcast", failing_broadcast)
+                socket.send_text("hej")
+                socket.receive_text()
+        assert ws_manager.active_connections == {}
+
+
+def test_connection_manager_topic_index_cleans_up_on_disconnect():
+    async def scenario():
+        manager = ConnectionManager(backplane=InMemoryBackplane())
+        first, second = _FakeSocket(), _FakeSocket()
+        await manager.connect(first)
+        await manager.connect(second)
+        assert manager.subscribe(first, "report:1")
+        assert manager.subscribe(second, "report:1")
+        await manager.publish("report:1", "status")
+        manager.disconnect(first)
+        manager.unsubscribe(second, "report:1")
+        await asyncio.sleep(0.01)
+        topics = dict(manager.topics)
+        await manager.stop()
+        return first, second, topics
+
+    first, second, topics = asyncio.run(scenario())
+    assert topics == {}
+    assert len(second.sent) == 1
+
+
+def test_connection_manager_reaps_idle_connections_and_enforces_caps():
+    async def scenario():
+        manager = ConnectionManager(
+            backplane=InMemoryBackplane(),
+            heartbeat_interval=20,
+            idle_timeout=60,
+            max_connections=3,
+            max_connections_per_account=2,
+        )
+        quiet, idle, busy = _FakeSocket(), _FakeSocket(), _FakeSocket()
+        assert await manager.connect(quiet, account="a@example.com")
+        assert await manager.connect(idle, account="a@example.com")
+        refused = _FakeSocket()
+        assert not await manager.connect(refused, account="a@example.com")
+        assert await manager.connect(busy)
+        assert not await manager.connect(_FakeSocket())  # global cap
+
+        now = manager.active_connections[busy].last_seen
+        manager.active_connections[quiet].last_seen = now - 30
+        manager.active_connections[idle].last_seen = now - 90
+        assert manager.reap(now=now) == 1
+        await asyncio.sleep(0.01)
+        stats = manager.stats()
+        await manager.stop()
+        return quiet, idle, busy, refused, stats
+
+    quiet, idle, busy, refused, stats = asyncio.run(scenario())
+    assert quiet.sent == ['{"event": "ping"}']
+    assert busy.sent == []
+    assert idle.closed_with == 1001
+    assert refused.closed_with == 1013
+    assert stats["connections"] == 2
+    assert stats["accounts"] == 1
+    assert stats["refused_connections"] == 2
+    assert stats["reaped_connections"] == 1
+
+
+def test_websocket_stats_endpoint_requires_auth():
+    assert client.get("/api/v1/ws/stats").status_code == 401
+    headers = _auth_headers(email="wsstats@example.com")
+    response = client.get("/api/v1/ws/stats", headers=headers)
+    assert response.status_code == 200
+    assert {"connections", "reaped_connections", "max_connections"} <= response.json().keys()
+
+
+def test_connection_manager_evicts_slow_consumer_without_blocking_others():
+    async def scenario():
+        manager = ConnectionManager(max_queue_size=4, send_timeout=5)
+        fast, slow = _FakeSocket(), _FakeSocket(stall=True)
+        await manager.connect(fast)
+        await manager.connect(slow)
+        for index in range(8):
+            await manager.broadcast(f"m{index}")
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+        return manager, fast, slow
+
+    manager, fast, slow = asyncio.run(scenario())
+    assert fast.sent == [f"m{index}" for index in range(8)]
+    assert slow not in manager.active_connections
+    assert fast in manager.active_connections
+    assert manager.evicted_connections == 1
+    assert slow.closed_with == 1013
+
+
+def _cross_worker_broadcast(make_backplane):
+    async def scenario():
+        workers = [ConnectionManager(backplane=make_backplane()) for _ in range(2)]
+        sockets = [_FakeSocket(), _FakeSocket()]
+        for worker, socket in zip(workers, sockets):
+            await worker.connect(socket)
+        await workers[0].broadcast("hello from worker 0")
+        for _ in range(50):
+            if all(socket.sent for socket in sockets):
+                break
+            await asyncio.sleep(0.01)
+        for worker in workers:
+            await worker.stop()
+        return sockets
+
+    return asyncio.run(scenario())
+
+
+def test_in_memory_backplane_reaches_every_manager():
+    shared = InMemoryBackplane()
+    sockets = _cross_worker_broadcast(lambda: shared)
+    assert [socket.sent for socket in sockets] == [["hello from worker 0"]] * 2
+
+
+def test_stopping_one_manager_keeps_the_shared_backplane_for_others():
+    class HalfBackplane(Backplane):
+        async def start(self, deliver):
+            pass
+
+    with pytest.raises(TypeError):
+        HalfBackplane()
+
+    async def scenario():
+        shared = InMemoryBackplane()
+        leaving, staying = ConnectionManager(backplane=shared), ConnectionManager(backplane=shared)
+        socket = _FakeSocket()
+        await leaving.start()
+        await staying.connect(socket)
+        await leaving.stop()
+        await staying.broadcast("still here")
+        await asyncio.sleep(0.01)
+        await staying.stop()
+        return socket
+
+    assert asyncio.run(scenario()).sent == ["still here"]
+
+
+def test_redis_backplane_reaches_sockets_on_other_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    sockets = _cross_worker_broadcast(
+        lambda: RedisBackplane(client=fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    )
+    assert [socket.sent for socket in sockets] == [["hello from worker 0"]] * 2
+
+
+def test_report_chat_persists_messages_and_serves_history():
+    headers = _auth_headers(email="chat@example.com")
+    token = headers["Authorization"].split()[1]
+    report_id = _create_report().json()["id"]
+    assert client.post(f"/api/v1/reports/{report_id}/accept", headers=headers).status_code == 200
+
+    with TestClient(app) as ws_client:
+        url = f"/api/v1/ws/reports/{report_id}/chat?token={token}"
+        with ws_client.websocket_connect(url) as room:
+            assert room.receive_json() == {"event": "history", "messages": []}
+            room.send_text("Dzień dobry, jadę do Pani")
+            delivered = room.receive_json()
+            assert delivered["topic"] == f"report:{report_id}"
+            assert delivered["message"]["content"] == "Dzień dobry, jadę do Pani"
+        # Reconnecting sees the message even before the buffer is flushed
+        with ws_client.websocket_connect(url) as room:
+            history = room.receive_json()["messages"]
+            assert [message["content"] for message in history] == ["Dzień dobry, jadę do Pani"]
+    # Leaving the client runs the lifespan shutdown, which flushes the buffer
+
+    page = client.get(f"/api/v1/reports/{report_id}/messages", headers=headers)
+    assert page.status_code == 200
+    body = page.json()
+    assert [message["sender_email"] for message in body["messages"]] == ["chat@example.com"]
+    assert body["messages"][0]["id"] is not None
+    assert body["next_cursor"] is None
+
+
+def test_anonymous_socket_cannot_join_or_write_report_rooms():
+    headers = _auth_headers(email="room@example.com")
+    token = headers["Authorization"].split()[1]
+    report_id = _create_report().json()["id"]
+    assert client.post(f"/api/v1/reports/{report_id}/accept", headers=headers).status_code == 200
+
+    with TestClient(app) as ws_client:
+        with ws_client.websocket_connect(f"/api/v1/ws/reports/{report_id}/chat?token={token}") as room:
+            room.receive_json()  # history
+            with ws_client.websocket_connect("/api/v1/ws/ws/chat") as anonymous:
+                anonymous.send_json({"action": "subscribe", "topic": f"report:{report_id}"})
+                assert anonymous.receive_json()["event"] == "error"
+                anonymous.send_json({"action": "publish", "topic": f"report:{report_id}", "message": "fake"})
+                assert anonymous.receive_json()["event"] == "error"
+
+                room.send_text("Tylko dla uczestników")
+                assert room.receive_json()["message"]["content"] == "Tylko dla uczestników"
+                # The anonymous socket got neither the room message nor anything else
+                anonymous.send_text("ping")
+                assert anonymous.receive_text() == "User: ping"
+            # The room saw no forged message before the broadcast from the anonymous socket
+            assert room.receive_text() == "User: ping"
+
+
+def test_report_chat_history_cursor_pagination():
+    headers = _auth_headers(email="pager@example.com")
+    report_id = _create_report().json()["id"]
+    assert client.post(f"/api/v1/reports/{report_id}/accept", headers=headers).status_code == 200
+    start = datetime(2025, 5, 1, 12, 0)
+    with TestingSessionLocal() as db:
+        db.add_all(
+            [
+                models.ChatMessage(
+                    report_id=report_id,
+                    sender_name="Jan",
+                    content=f"msg {index}",
+                    created_at=start + timedelta(minutes=index),
+                )
+                for index in range(5)
+            ]
+        )
+        db.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"before": cursor} if cursor else {})}
+        page = client.get(f"/api/v1/reports/{report_id}/messages", headers=headers, params=params)
+        assert page.status_code == 200
+        seen.extend(message["content"] for message in page.json()["messages"])
+        cursor = page.json()["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"msg {index}" for index in reversed(range(5))]
+
+    invalid = client.get(f"/api/v1/reports/{report_id}/messages?before=bogus", headers=headers)
+    assert invalid.status_code == 400
+
+
+def test_report_chat_rejects_missing_token():
+    report_id = _create_report().json()["id"]
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/api/v1/ws/reports/{report_id}/chat") as room:
+            room.receive_text()
+
+
+def test_report_chat_admits_only_report_participants():
+    volunteer = _auth_headers(email="helper@example.com")
+    stranger = _auth_headers(email="stranger@example.com")
+    report_id = _create_report().json()["id"]
+    assert client.post(f"/api/v1/reports/{report_id}/accept", headers=volunteer).status_code == 200
+
+    stranger_token = stranger["Authorization"].split()[1]
+    with pytest.raises(WebSocketDisconnect) as refused:
+        with client.websocket_connect(f"/api/v1/ws/reports/{report_id}/chat?token={stranger_token}") as room:
+            room.receive_text()
+    assert refused.value.code == 1008
+    assert client.get(f"/api/v1/reports/{report_id}/messages", headers=stranger).status_code == 403
+
+    # Completing keeps the volunteer a participant
+    assert client.post("/api/v1/reports/active/complete", headers=volunteer).status_code == 200
+    volunteer_token = volunteer["Authorization"].split()[1]
+    with client.websocket_connect(f"/api/v1/ws/reports/{report_id}/chat?token={volunteer_token}") as room:
+        assert room.receive_json()["event"] == "history"
+    assert client.get(f"/api/v1/reports/{report_id}/messages", headers=volunteer).status_code == 200
+
+
+def test_report_chat_releases_account_slot_after_unexpected_error(monkeypatch):
+    from app.api.v1.endpoints.websocket.manager import manager as ws_manager
+
+    headers = _auth_headers(email="crash@example.com")
+    token = headers["Authorization"].split()[1]
+    report_id = _create_report().json()["id"]
+    assert client.post(f"/api/v1/reports/{report_id}/accept", headers=headers).status_code == 200
+
+    async def failing_add(row):
+        raise RuntimeError("write failed")
+
+    monkeypatch.setattr(chat_writer, "add", failing_add)
+    with TestClient(app) as ws_client:
+        with pytest.raises(RuntimeError):
+            with ws_client.websocket_connect(f"/api/v1/ws/reports/{report_id}/chat?token={token}") as room:
+                room.receive_json()
+                room.send_text("Dzień dobry")
+                room.receive_json()
+        assert "crash@example.com" not in ws_manager.account_connections
+        assert ws_manager.active_connections == {}
+
+
+def test_shutdown_flushes_buffers_even_if_websocket_stop_fails(monkeypatch):
+    from app.api.v1.endpoints.websocket.manager import manager as ws_manager
+
+    stopped = []
+
+    async def failing_stop():
+        raise RuntimeError("backplane unreachable")
+
+    def recording(name, original):
+        async def stop():
+            stopped.append(name)
+            await original()
+        return stop
+
+    monkeypatch.setattr(ws_manager, "stop", failing_stop)
+    monkeypatch.setattr(chat_writer, "stop", recording("chat", chat_writer.stop))
+    monkeypatch.setattr(latency_recorder, "stop", recording("latency", latency_recorder.stop))
+    with TestClient(app):
+        pass
+    assert stopped == ["chat", "latency"]
+
+
+def test_chat_writer_flushes_instead_of_dropping_when_full():
+    from app.services.chat_service import ChatMessageWriter
+
+    report_id = _create_report().json()["id"]
+
+    def rows(count):
+        now = datetime.now(timezone.utc)
+        return [
+            {"report_id": report_id, "sender_name": "Jan", "content": f"m{index}", "created_at": now}
+            for index in range(count)
+        ]
+
+    async def fill(writer, count):
+        accepted = [await writer.add(row) for row in rows(count)]
+        await writer.stop()
+        return accepted
+
+    writer = ChatMessageWriter(session_factory=TestingSessionLocal, batch_size=100, max_pending=2)
+    assert asyncio.run(fill(writer, 5)) == [True] * 5
+    with TestingSessionLocal() as db:
+        assert db.query(models.ChatMessage).filter(models.ChatMessage.report_id == report_id).count() == 5
+
+    def broken_session():
+        raise RuntimeError("database unavailable")
+
+    failing = ChatMessageWriter(session_factory=broken_session, batch_size=100, max_pending=2)
+
+    async def overflow():
+        accepted = [await failing.add(row) for row in rows(3)]
+        failing._task.cancel()
+        return accepted
+
+    assert asyncio.run(overflow()) == [True, True, False]
+
+
+def test_loadtest_percentile_uses_nearest_rank():
+    from perf.loadtest import percentile
+
+    values = [float(value) for value in range(1, 101)]
+    assert [percentile(values, fraction) for fraction in (0.0, 0.5, 0.95, 0.99, 1.0)] == [1, 50, 95, 99, 100]
+    assert percentile([3.0, 7.0], 0.99) == 7.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_generate_data_seeds_consistent_lifecycles():
+    from scripts.generate_data import DataGenerator
+
+    result = DataGenerator(engine, seed=7, batch_size=50).run(
+        accounts=20, reports=300, password="Generated123", log=lambda _: None
+    )
+    assert result["reports"] == 300
+
+    with TestingSessionLocal() as db:
+        reports = db.query(models.Report).all()
+        accounts = db.query(models.Account).all()
+    assert len(reports) == 300 and len(accounts) == 20
+    completed = [report for report in reports if report.completed_at is not None]
+    assert completed and all(report.accepted_at and report.completed_by_email for report in completed)
+    assert sum(account.genpoints for account in accounts) == 10 * len(completed)
+    active_ids = {account.active_report for account in accounts if account.active_report}
+    assert all(
+        report.accepted_at and report.completed_at is None
+        for report in reports
+        if report.id in active_ids
+    )
+
+    login = _login_account(email=accounts[0].email, password="Generated123")
+    assert login.status_code == 200
+
+
+def test_scheduler_runs_due_jobs_once_across_workers_and_records_metrics(monkeypatch, tmp_path):
+    import os
+
+    from app.core import logger as activity_log
+    from app.services.maintenance_service import register_default_jobs
+
+    monkeypatch.setattr(activity_log, "LOGS_DIR", tmp_path)
+    stale_log, fresh_log = tmp_path / "01-01-2020T10-00-00.log", tmp_path / "02-01-2020T10-00-00.log"
+    stale_log.write_text("old")
+    fresh_log.write_text("new")
+    os.utime(stale_log, (0, 0))
+
+    yearly = CronSchedule("0 0 1 1 *", "Europe/Warsaw")
+    assert yearly.next_after(datetime(2025, 6, 1, tzinfo=timezone.utc)) == datetime(
+        2025, 12, 31, 23, 0, tzinfo=timezone.utc
+    )
+    weekdays = CronSchedule("*/15 9-10 * * 1-5")
+    saturday = datetime(2025, 3, 8, 12, 0, tzinfo=timezone.utc)
+    assert weekdays.next_after(saturday) == datetime(2025, 3, 10, 9, 0, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        CronSchedule("61 * * * *")
+
+    _register_account()
+    with TestingSessionLocal() as db:
+        account = db.get(models.Account, "jan.kowalski@example.com")
+        account.resolved_cases, account.resolved_cases_this_year = 7, 4
+        db.commit()
+
+    now = [datetime(2025, 12, 31, 12, 0, tzinfo=timezone.utc)]
+    workers = [
+        Scheduler(session_factory=TestingSessionLocal, clock=lambda: now[0], owner=f"worker-{index}")
+        for index in range(2)
+    ]
+    for worker in workers:
+        register_default_jobs(worker)
+
+    # First sighting only records the starting point
+    assert asyncio.run(workers[0].run_pending()) == []
+    now[0] = datetime(2026, 1, 1, 3, 30, tzinfo=timezone.utc)
+    assert asyncio.run(workers[0].run_pending()) == [
+        "reset_yearly_counters",
+        "optimize_database",
+        "prune_log_files",
+        "archive_completed_reports",
+        "purge_report_pii",
+    ]
+    assert asyncio.run(workers[1].run_pending()) == []
+
+    with TestingSessionLocal() as db:
+        account = db.get(models.Account, "jan.kowalski@example.com")
+        assert (account.resolved_cases, account.resolved_cases_this_year) == (7, 0)
+    assert not stale_log.exists() and fresh_log.exists()
+
+    stats = {job["name"]: job for job in workers[1].stats()}
+    reset = stats["reset_yearly_counters"]
+    assert reset["run_count"] == 1 and reset["failure_count"] == 0
+    assert reset["last_status"] == "ok" and reset["last_owner"] == "worker-0"
+    assert reset["last_result"] == "reset 1 accounts"
+    assert reset["next_run_at"] == datetime(2026, 12, 31, 23, 0, tzinfo=timezone.utc)
+
+    headers = _auth_headers()
+    assert client.get("/api/v1/jobs/").status_code == 401
+    response = client.get("/api/v1/jobs/", headers=headers)
+    assert response.status_code == 200
+    listed = {job["name"]: job for job in response.json()}
+    assert listed["reset_yearly_counters"]["run_count"] == 1
+    assert listed["optimize_database"]["schedule"] == "30 3 * * *"
+
+
+def test_leaderboard_ranks_cached_top_and_single_volunteer():
+    ola = _auth_headers(email="ola@example.com")
+    _auth_headers(email="piotr@example.com")
+    _register_account(email="ewa@example.com", city="Kraków")
+    _register_account(email="nowy@example.com")
+    with TestingSessionLocal() as db:
+        for email, name, points, this_year in [
+            ("ola@example.com", "Ola Nowak", 30, 1),
+            ("piotr@example.com", "Piotr Wiśniewski", 30, 3),
+            ("ewa@example.com", "Ewa Zielińska", 50, 0),
+        ]:
+            account = db.get(models.Account, email)
+            account.full_name, account.genpoints, account.resolved_cases_this_year = name, points, this_year
+        db.commit()
+
+    board = client.get("/api/v1/leaderboard/")
+    assert board.status_code == 200
+    assert [(entry["full_name"], entry["rank"]) for entry in board.json()["entries"]] == [
+        ("Ewa Zielińska", 1),
+        ("Ola Nowak", 2),
+        ("Piotr Wiśniewski", 2),
+    ]
+    # The board is public: no contact details
+    assert all("email" not in entry for entry in board.json()["entries"])
+    warsaw = client.get("/api/v1/leaderboard/?city=WARSAW&period=year&limit=1").json()
+    assert warsaw["city"] == "warsaw"
+    assert [entry["full_name"] for entry in warsaw["entries"]] == ["Piotr Wiśniewski"]
+
+    mine = client.get("/api/v1/leaderboard/me", headers=ola).json()
+    assert (mine["rank"], mine["city"], mine["city_rank"], mine["score"]) == (2, "warsaw", 1, 30)
+    assert client.get("/api/v1/leaderboard/me?period=year", headers=ola).json()["rank"] == 2
+
+    # Completing a report refreshes the cached board
+    report_id = _create_report().json()["id"]
+    assert client.post(f"/api/v1/reports/{report_id}/accept", headers=ola).status_code == 200
+    assert client.post("/api/v1/reports/active/complete", headers=ola).status_code == 200
+    entries = client.get("/api/v1/leaderboard/").json()["entries"]
+    assert [(entry["full_name"], entry["score"], entry["rank"]) for entry in entries[:2]] == [
+        ("Ewa Zielińska", 50, 1),
+        ("Ola Nowak", 40, 2),
+    ]
+    assert client.get("/api/v1/leaderboard/me").status_code == 401
+    assert client.get("/api/v1/leaderboard/?period=month").status_code == 422
+
+
+def test_dashboard_returns_panel_in_one_request_with_few_queries():
+    from sqlalchemy import event
+
+    headers = _auth_headers()
+    done = [_create_report(headers=headers).json()["id"] for _ in range(3)]
+    for report_id in done:
+        client.post(f"/api/v1/reports/{report_id}/accept", headers=headers)
+        client.post("/api/v1/reports/active/complete", headers=headers)
+    active = _create_report(headers=headers).json()["id"]
+    client.post(f"/api/v1/reports/{active}/accept", headers=headers)
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/v1/accounts/me/dashboard?completed_limit=2", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["account"]["email"] == "jan.kowalski@example.com"
+    assert body["active_report"]["id"] == active
+    assert [report["id"] for report in body["completed_reports"]] == done[::-1][:2]
+    assert body["completed_has_more"] is True
+    assert body["counters"] == {
+        "genpoints": 30,
+        "resolved_cases": 3,
+        "resolved_cases_this_year": 3,
+        "rank": 1,
+        "city_rank": 1,
+    }
+    # account + active report + completed page (live and archive) + two rank counts
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]) <= 6
+
+    assert client.get("/api/v1/accounts/me/dashboard").status_code == 401
+
+
+def test_reports_batch_keeps_request_order_and_lists_missing():
+    headers = _auth_headers()
+    first, second, third = (_create_report().json()["id"] for _ in range(3))
+
+    response = client.get(f"/api/v1/reports/batch?ids={third},999,{first},{third}", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["reports"]) == [str(third), str(first)]
+    assert body["reports"][str(first)]["id"] == first
+    assert body["missing"] == [999]
+
+    assert client.get(f"/api/v1/reports/batch?ids={second}").status_code == 401
+    assert client.get("/api/v1/reports/batch?ids=1,abc", headers=headers).status_code == 400
+    too_many = ",".join(str(index) for index in range(1, 102))
+    assert client.get(f"/api/v1/reports/batch?ids={too_many}", headers=headers).status_code == 400
+
+
+def test_archiver_moves_old_completed_reports_and_reads_stay_transparent():
+    from app.services.archive_service import ReportArchiveService
+
+    headers = _auth_headers()
+    completed = []
+    for _ in range(4):
+        report_id = _create_report().json()["id"]
+        client.post(f"/api/v1/reports/{report_id}/accept", headers=headers)
+        client.post("/api/v1/reports/active/complete", headers=headers)
+        completed.append(report_id)
+    open_id = _create_report().json()["id"]
+
+    now = datetime.now(timezone.utc)
+    with TestingSessionLocal() as db:
+        for age_days, report_id in zip((200, 150, 120), completed):
+            db.get(models.Report, report_id).completed_at = now - timedelta(days=age_days)
+        db.commit()
+        result = ReportArchiveService.archive_completed(db, older_than_days=90, batch_size=2, now=now)
+        assert (result["moved"], result["batches"]) == (3, 2)
+        assert {report.id for report in db.query(models.Report)} == {completed[3], open_id}
+        assert db.query(models.ArchivedReport).count() == 3
+        assert ReportArchiveService.archive_completed(db, older_than_days=90, now=now)["moved"] == 0
+
+    history = client.get("/api/v1/reports/my-completed-reports", headers=headers).json()
+    assert [report["id"] for report in history] == completed[::-1]
+    page = client.get("/api/v1/reports/my-completed-reports?skip=1&limit=2", headers=headers).json()
+    assert [report["id"] for report in page] == [completed[2], completed[1]]
+
+    archived = client.get(f"/api/v1/reports/{completed[0]}", headers=headers)
+    assert archived.status_code == 200 and archived.json()["completed_by_email"] == "jan.kowalski@example.com"
+    batch = client.get(f"/api/v1/reports/batch?ids={completed[0]},{open_id}", headers=headers).json()
+    assert list(batch["reports"]) == [str(completed[0]), str(open_id)]
+    assert client.get(f"/api/v1/reports/{completed[0]}/messages", headers=headers).status_code == 200
+    assert client.post(f"/api/v1/reports/{completed[0]}/accept", headers=headers).status_code == 404
+
+
+def test_pii_retention_purge_redacts_in_batches_and_resumes_from_cursor():
+    from app.services.archive_service import ReportArchiveService
+    from app.services.retention_service import REDACTED_TEXT, RetentionService
+
+    headers = _auth_headers()
+    completed = []
+    for _ in range(4):
+        report_id = _create_report(latitude=52.2, longitude=21.0).json()["id"]
+        client.post(f"/api/v1/reports/{report_id}/accept", headers=headers)
+        client.post("/api/v1/reports/active/complete", headers=headers)
+        completed.append(report_id)
+    _create_report()
+
+    now = datetime.now(timezone.utc)
+    with TestingSessionLocal() as db:
+        for age_days, report_id in zip((420, 410, 400, 30), completed):
+            db.get(models.Report, report_id).completed_at = now - timedelta(days=age_days)
+            db.add(models.ChatMessage(report_id=report_id, sender_name="Jan", content="tel 600100200", created_at=now))
+        db.commit()
+        # The oldest report lives in the archive by now
+        ReportArchiveService.archive_completed(db, older_than_days=415, now=now)
+
+        pauses = []
+        result = RetentionService.purge_pii(db, retention_days=365, batch_size=1, now=now, sleep=pauses.append)
+        assert (result["processed"], result["finished"]) == (3, True)
+        assert pauses == [0.2] * 3 and result["rows_per_second"] > 0
+
+        archived = db.get(models.ArchivedReport, completed[0])
+        redacted = db.get(models.Report, completed[1])
+        kept = db.get(models.Report, completed[3])
+        assert archived.full_name == redacted.full_name == REDACTED_TEXT
+        assert (redacted.phone, redacted.age, redacted.latitude, redacted.contact_ok) == ("000000000", 0, None, False)
+        assert kept.full_name != REDACTED_TEXT and kept.latitude == 52.2
+        assert [message.report_id for message in db.query(models.ChatMessage)] == [completed[3]]
+
+        # The cursor skips purged rows; only newly eligible reports are visited
+        assert RetentionService.purge_pii(db, retention_days=365, now=now, sleep=pauses.append)["processed"] == 0
+        later = RetentionService.purge_pii(db, retention_days=365, now=now + timedelta(days=340), sleep=pauses.append)
+        assert later["processed"] == 1
+        assert db.get(models.JobProgress, "pii_retention:zgloszenia").processed == 3
+
+        with pytest.raises(ValueError):
+            RetentionService.purge_pii(db, mode="shred")
+
+    assert client.get(f"/api/v1/reports/{completed[1]}", headers=headers).json()["full_name"] == REDACTED_TEXT
+
+
+def test_admin_report_export_streams_csv_and_ndjson_with_filters(monkeypatch):
+    import csv
+    import io
+    import json
+
+    from app.config import settings
+    from app.services.archive_service import ReportArchiveService
+
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", "Admin@Example.com")
+    headers = _auth_headers()
+    admin_headers = _auth_headers(email="admin@example.com")
+
+    completed_id = _create_report(full_name="=HYPERLINK(1)").json()["id"]
+    client.post(f"/api/v1/reports/{completed_id}/accept", headers=headers)
+    client.post("/api/v1/reports/active/complete", headers=headers)
+    accepted_id = _create_report(city="Kraków", report_type_id=2).json()["id"]
+    client.post(f"/api/v1/reports/{accepted_id}/accept", headers=headers)
+    open_id = _create_report().json()["id"]
+    _backdate_report(open_id, days=10)
+    with TestingSessionLocal() as db:
+        db.get(models.Report, completed_id).completed_at = datetime.now(timezone.utc) - timedelta(days=200)
+        db.commit()
+        ReportArchiveService.archive_completed(db, older_than_days=90)
+
+    assert client.get("/api/v1/admin/reports/export", headers=headers).status_code == 403
+    assert client.get("/api/v1/admin/reports/export").status_code == 401
+
+    response = client.get("/api/v1/admin/reports/export", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(int(row["id"]), row["status"], row["archived"]) for row in rows] == [
+        (accepted_id, "accepted", "false"),
+        (open_id, "open", "false"),
+        (completed_id, "completed", "true"),
+    ]
+    assert rows[2]["full_name"] == "'=HYPERLINK(1)"
+
+    ndjson = client.get(
+        "/api/v1/admin/reports/export?format=ndjson&status=open&city=war", headers=admin_headers
+    )
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [line["id"] for line in lines] == [open_id]
+    assert lines[0]["reported_at"].endswith("+00:00") and lines[0]["archived"] is False
+
+    date_from = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    recent = client.get(
+        "/api/v1/admin/reports/export", params={"format": "ndjson", "date_from": date_from}, headers=admin_headers
+    )
+    assert {json.loads(line)["id"] for line in recent.text.splitlines()} == {completed_id, accepted_id}
+    by_type = client.get("/api/v1/admin/reports/export?format=ndjson&report_type_id=2", headers=admin_headers)
+    assert [json.loads(line)["id"] for line in by_type.text.splitlines()] == [accepted_id]
+    assert client.get(
+        "/api/v1/admin/reports/export",
+        params={"date_from": date_from, "date_to": "2000-01-01T00:00:00"},
+        headers=admin_headers,
+    ).status_code == 400
+
+
+def test_admin_report_export_converts_offset_bounds_to_utc(monkeypatch):
+    import json
+
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", "admin@example.com")
+    admin_headers = _auth_headers(email="admin@example.com")
+    report_id = _create_report().json()["id"]
+    with TestingSessionLocal() as db:
+        db.get(models.Report, report_id).reported_at = datetime(2025, 12, 31, 23, 0, tzinfo=timezone.utc)
+        db.commit()
+
+    def exported(**params):
+        response = client.get(
+            "/api/v1/admin/reports/export", params={"format": "ndjson", **params}, headers=admin_headers
+        )
+        return [json.loads(line)["id"] for line in response.text.splitlines()]
+
+    # Midnight in UTC+2 is 22:00 UTC the day before
+    assert exported(date_from="2026-01-01T00:00:00+02:00") == [report_id]
+    assert exported(date_from="2025-12-31T22:00:00Z") == [report_id]
+    assert exported(date_from="2026-01-01T00:00:00") == []
+    assert exported(date_to="2026-01-01T01:00:00+02:00") == [report_id]
+    assert exported(date_to="2026-01-01T00:59:00+02:00") == []
+
+
+def test_report_export_does_not_block_writes_while_streaming():
+    from app.services.export_service import ReportExportService
+
+    first_id = _create_report().json()["id"]
+    second_id = _create_report().json()["id"]
+    rows = ReportExportService.iter_rows(engine, page_size=1)
+    assert next(rows)["id"] == first_id
+
+    # A separate connection commits while the export is mid-stream
+    writer = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False, "timeout": 0.5})
+    with sessionmaker(bind=writer)() as db:
+        db.add(models.ReportType(id=9, name="Nowy typ", description="Dodany w trakcie eksportu"))
+        db.commit()
+    writer.dispose()
+    third_id = _create_report().json()["id"]
+
+    assert [row["id"] for row in rows] == [second_id, third_id]
+
+
+def test_bulk_volunteer_import_reports_row_errors_and_hashes_in_parallel(monkeypatch):
+    import csv
+    import io
+    import json
+
+    from app.config import settings
+    from app.core.security import verify_password
+    from app.services.import_service import AccountImportService
+
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", "admin@example.com")
+    _register_account(email="taken@example.com")
+    admin_headers = _auth_headers(email="admin@example.com")
+
+    slots = [{"day_of_week": 0, "start_time": "08:00", "end_time": "12:00"}]
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [
+            ["email", "password", "full_name", "phone", "city", "availability"],
+            ["ola@example.com", "Haslo1234", "Ola Nowak", "600100200", "Kraków", json.dumps(slots)],
+            ["Taken@example.com", "Haslo1234", "Zajety Adres", "", "", ""],
+            ["weak@example.com", "short", "Slabe Haslo", "", "", ""],
+            ["OLA@example.com", "Haslo1234", "Ola Druga", "", "", ""],
+            ["piotr@example.com", "Haslo1234", "Piotr Wiśniewski", "", "Gdańsk", ""],
+        ]
+    )
+    csv_body = buffer.getvalue()
+    response = client.post(
+        "/api/v1/admin/accounts/import", content=csv_body, headers={**admin_headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["created"], body["failed"]) == (5, 2, 3)
+    assert [(error["row"], error["email"]) for error in body["errors"]] == [
+        (2, "taken@example.com"),
+        (3, "weak@example.com"),
+        (4, "ola@example.com"),
+    ]
+    assert "password" in body["errors"][1]["error"] and body["rows_per_second"] > 0
+
+    login = client.post("/api/v1/accounts/login", json={"email": "ola@example.com", "password": "Haslo1234"})
+    me = client.get("/api/v1/accounts/me", headers={"Authorization": f"Bearer {login.json()['access_token']}"})
+    assert me.json()["availability"][0]["start_time"] == "08:00:00"
+    with TestingSessionLocal() as db:
+        assert db.get(models.Account, "piotr@example.com").city_key == normalize_city("Gdańsk")
+
+    records = AccountImportService.parse(
+        json.dumps({"accounts": [
+            {"email": f"wolontariusz{index}@example.com", "password": f"Haslo{index}abc", "full_name": "Wolontariusz"}
+            for index in range(3)
+        ]}),
+        "json",
+    )
+    with TestingSessionLocal() as db:
+        result = AccountImportService.import_accounts(db, records, workers=2, batch_size=2)
+        assert (result.created, result.failed) == (3, 0)
+        account = db.get(models.Account, "wolontariusz2@example.com")
+        assert verify_password("Haslo2abc", account.password_hash)
+
+    assert client.post(
+        "/api/v1/admin/accounts/import", content="[]", headers=_auth_headers()
+    ).status_code == 403
+    assert client.post(
+        "/api/v1/admin/accounts/import?format=json", content="{oops", headers=admin_headers
+    ).status_code == 400
+
+
+def test_report_rollups_track_lifecycle_and_match_rebuild():
+    from app.schemas import ReportUpdate
+    from app.services.analytics_service import ReportAnalyticsService
+    from app.services.archive_service import ReportArchiveService
+    from app.services.report_service import ReportService
+
+    headers = _auth_headers()
+    completed_id = _create_report().json()["id"]
+    with TestingSessionLocal() as db:
+        db.get(models.Report, completed_id).reported_at = datetime.now(timezone.utc) - timedelta(minutes=30)
+        db.commit()
+    client.post(f"/api/v1/reports/{completed_id}/accept", headers=headers)
+    client.post("/api/v1/reports/active/complete", headers=headers)
+    moved_id = _create_report(city="Kraków").json()["id"]
+    deleted_id = _create_report(report_type_id=3).json()["id"]
+    with TestingSessionLocal() as db:
+        ReportService.update_report(db, moved_id, ReportUpdate(report_type_id=2))
+        ReportService.delete_report(db, deleted_id)
+
+    def snapshot():
+        with TestingSessionLocal() as db:
+            return sorted(
+                (row.day, row.report_type_id, row.city_key, row.created, row.accepted, row.completed,
+                 round(row.accept_seconds), round(row.complete_seconds))
+                for row in db.query(models.ReportDailyStats)
+                if row.created or row.accepted or row.completed
+            )
+
+    incremental = snapshot()
+    today = datetime.now(timezone.utc).date()
+    totals = {}
+    for row in incremental:
+        counts = totals.setdefault((row[1], row[2]), [0, 0, 0])
+        for index in range(3):
+            counts[index] += row[3 + index]
+    assert totals == {(1, "warsaw"): [1, 1, 1], (2, "krakow"): [1, 0, 0]}
+    with TestingSessionLocal() as db:
+        ReportAnalyticsService.rebuild(db)
+    assert snapshot() == incremental
+
+    response = client.get("/api/v1/reports/analytics/timeseries?date_from=" + str(today - timedelta(days=2)),
+                          headers=headers)
+    assert response.status_code == 200
+    points = response.json()["points"]
+    assert [point["period_start"] for point in points] == [str(today - timedelta(days=days)) for days in (2, 1, 0)]
+    assert sum(point["created"] for point in points) == 2
+    assert points[-1]["completed"] == 1 and points[-1]["avg_accept_minutes"] == pytest.approx(30, abs=1)
+
+    by_type = client.get("/api/v1/reports/analytics/timeseries?split_by=type&interval=month", headers=headers)
+    assert [(p["report_type_id"], p["created"]) for p in by_type.json()["points"]] == [(1, 1), (2, 1)]
+    by_city = client.get("/api/v1/reports/analytics/timeseries?city=kra&split_by=city", headers=headers)
+    assert [(p["city_key"], p["created"]) for p in by_city.json()["points"]] == [("krakow", 1)]
+    assert client.get("/api/v1/reports/analytics/timeseries", params={"date_from": "2000-01-01"},
+                      headers=headers).status_code == 400
+
+    with TestingSessionLocal() as db:
+        db.get(models.Report, completed_id).completed_at = datetime.now(timezone.utc) - timedelta(days=100)
+        db.commit()
+        ReportAnalyticsService.rebuild(db)
+        before_archive = snapshot()
+        ReportArchiveService.archive_completed(db, older_than_days=90)
+        # Archived reports still count
+        ReportAnalyticsService.rebuild(db)
+    assert snapshot() == before_archive and sum(row[5] for row in before_archive) == 1
+
+
+def test_response_time_percentiles_from_persisted_sketches():
+    import math
+    import random
+
+    from app.core.quantiles import QuantileSketch
+    from app.services.latency_service import LatencyMetricsService, LatencyRecorder
+
+    rng = random.Random(7)
+    values = [rng.lognormvariate(7, 1.5) for _ in range(20_000)]
+    sketch = QuantileSketch()
+    for value in values:
+        sketch.add(value)
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        assert sketch.quantile(q) == pytest.approx(ordered[math.ceil(q * len(ordered)) - 1], rel=0.011)
+    assert len(sketch.buckets) < 1000
+
+    headers = _auth_headers()
+    for minutes, type_id in ((10, 1), (20, 1), (600, 2)):
+        report_id = _create_report(report_type_id=type_id).json()["id"]
+        with TestingSessionLocal() as db:
+            db.get(models.Report, report_id).reported_at = datetime.now(timezone.utc) - timedelta(minutes=minutes)
+            db.commit()
+        client.post(f"/api/v1/reports/{report_id}/accept", headers=headers)
+        client.post("/api/v1/reports/active/complete", headers=headers)
+
+    # Served from this worker's buffer before the first flush
+    body = client.get("/api/v1/reports/metrics/response-time-percentiles").json()
+    assert body["count"] == 3 and body["p50_minutes"] == pytest.approx(20, rel=0.02)
+    assert body["max_minutes"] == pytest.approx(600, rel=0.01)
+
+    assert latency_recorder.flush() == 12  # 2 metrics x (all, type 1, type 2) x (all-time, today)
+    today = datetime.now(timezone.utc).date()
+    by_type = client.get(
+        "/api/v1/reports/metrics/response-time-percentiles",
+        params={"metric": "complete", "report_type_id": 1, "date_from": str(today), "date_to": str(today)},
+    ).json()
+    assert by_type["count"] == 2 and by_type["p99_minutes"] == pytest.approx(20, rel=0.02)
+
+    # A second worker merging into the same rows adds to them instead of overwriting
+    other_worker = LatencyRecorder(session_factory=TestingSessionLocal)
+    other_worker.observe("accept", 2, datetime.now(timezone.utc), datetime.now(timezone.utc) - timedelta(hours=3))
+    assert other_worker.flush() == 4
+    with TestingSessionLocal() as db:
+        overall = LatencyMetricsService.get_percentiles(db, metric="accept")
+        assert overall.count == 4
+        stored = db.query(models.LatencySketch).filter_by(metric="accept", report_type_id=0, period="all").one()
+        assert stored.version == 2
+
+        # Buffered but unflushed: the report is already in the tables the rebuild scans
+        latency_recorder.observe("accept", 1, datetime.now(timezone.utc), datetime.now(timezone.utc) - timedelta(hours=1))
+        result = LatencyMetricsService.rebuild(db)
+        assert (result["observations"], result["sketches"]) == (6, 12)
+        assert LatencyMetricsService.get_percentiles(db, metric="accept").count == 3
+        assert latency_recorder.flush() == 0
+
+    assert client.get(
+        "/api/v1/reports/metrics/response-time-percentiles",
+        params={"date_from": str(today), "date_to": str(today - timedelta(days=1))},
+    ).status_code == 400
+
+
+def test_parsed_availability_cache_serves_repeated_serializations(monkeypatch):
+    from app.core.cache import ParsedTextCache
+    from app.schemas import AccountOut
+    from app.schemas import account as account_schemas
+
+    parsed = []
+
+    def counting_parse(raw):
+        parsed.append(raw)
+        return account_schemas._parse_availability_or_empty(raw)
+
+    cache = ParsedTextCache(counting_parse, max_entries=2)
+    monkeypatch.setattr(account_schemas, "availability_cache", cache)
+
+    headers = _auth_headers()
+    slots = [{"day_of_week": day, "start_time": "00:00", "end_time": "23:59"} for day in range(7)]
+    parsed.clear()
+    client.put("/api/v1/accounts/me", json={"availability": slots}, headers=headers)
+    # The PUT response parsed the new schedule once; every later read is a lookup
+    assert len(parsed) == 1
+    hits = cache.stats["hits"]
+    for _ in range(3):
+        body = client.get("/api/v1/accounts/me", headers=headers).json()
+        assert len(body["availability"]) == 7 and body["is_active_now"] is True
+    assert len(parsed) == 1 and cache.stats["hits"] == hits + 6
+
+    assert AccountOut(
+        email="a@example.com", full_name="Ala Nowak", resolved_cases=0, resolved_cases_this_year=0,
+        genpoints=0, availability_json="{not json",
+    ).availability == []
+    for raw in ('[]', '{"slots": []}', "{not json"):
+        cache.get(raw)
+    assert len(cache) == 2 and cache.stats["evictions"] >= 1